@@ -0,0 +1,285 @@
+"""AIMD-controlled thread fan-out for ``gh`` lookups.
+
+The PR scripts used to start ``min(len(tasks), 32)`` threads, each spawning
+``gh``: big runs tripped GitHub's secondary rate limits and small ones paid
+for threads they never needed. :class:`AdaptiveExecutor` instead runs at
+most ``limit`` tasks at once and tunes ``limit`` like TCP congestion
+control:
+
+- additive increase: each fast completion adds ``1/limit`` (about one extra
+  worker per round of completions), up to ``max_workers``;
+- multiplicative decrease: a completion slower than ``latency_tolerance``
+  times the best latency seen, or a rate-limit response, halves ``limit``
+  (at most once per typical task latency, so one burst counts once);
+- rate limits (HTTP 403/429 with ``Retry-After``) also pause dispatch of
+  new tasks until the server says to come back, and the task that hit the
+  limit is queued again (up to ``retry_throttled`` times) instead of
+  resolving with its failed lookup.
+
+Tasks do not report rate limits themselves: :func:`report_throttle` (called
+by ``gh_cache`` and ``github_client`` when they see one) is routed to the
+executor running the current thread. Threads are only started as tasks are
+dispatched, so a run never creates more threads than its peak ``limit``.
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator
+
+MAX_WORKERS = 32
+INITIAL_WORKERS = 4
+DEFAULT_RETRY_AFTER = 5.0
+MAX_THROTTLE_RETRIES = 3
+# Primary rate-limit resets can be an hour out; re-probe well before that.
+MAX_PAUSE = 60.0
+# Cache hits finish in microseconds; don't let them set the latency baseline.
+LATENCY_FLOOR = 0.1
+_EWMA_WEIGHT = 0.2
+
+_RATE_LIMITED = re.compile(r"rate limit|HTTP 429|abuse detection", re.IGNORECASE)
+
+_local = threading.local()
+
+
+@dataclass(frozen=True, slots=True)
+class ExecutorStats:
+    """Point-in-time view of an :class:`AdaptiveExecutor`."""
+
+    limit: int
+    in_flight: int
+    pending: int
+    completed: int
+    failed: int
+    throttled: int
+    retried: int
+    latency_ewma: float | None
+    best_latency: float | None
+    paused_for: float
+
+
+class AdaptiveExecutor:
+    """``concurrent.futures``-style executor with an AIMD concurrency limit."""
+
+    def __init__(
+        self,
+        max_workers: int = MAX_WORKERS,
+        *,
+        initial_workers: int = INITIAL_WORKERS,
+        min_workers: int = 1,
+        latency_tolerance: float = 3.0,
+        backoff: float = 0.5,
+        default_retry_after: float = DEFAULT_RETRY_AFTER,
+        retry_throttled: int = MAX_THROTTLE_RETRIES,
+    ) -> None:
+        if not 1 <= min_workers <= max_workers:
+            raise ValueError("need 1 <= min_workers <= max_workers")
+        self.max_workers = max_workers
+        self.min_workers = min_workers
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self.default_retry_after = default_retry_after
+        # Tasks are re-run whole, so they must be safe to repeat.
+        self.retry_throttled = retry_throttled
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="adaptive"
+        )
+        self._cond = threading.Condition()
+        self._pending: deque = deque()
+        self._limit = float(min(max(initial_workers, min_workers), max_workers))
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._throttled = 0
+        self._retried = 0
+        self._latency_ewma: float | None = None
+        self._best_latency: float | None = None
+        self._last_decrease = float("-inf")
+        self._resume_at = 0.0
+        self._timer: threading.Timer | None = None
+        self._shutdown = False
+
+    # -- executor API ---------------------------------------------------------
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        future: Future = Future()
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            self._pending.append((future, fn, args, kwargs, 0))
+        self._dispatch()
+        return future
+
+    def map(self, fn: Callable[..., Any], *iterables: Iterable) -> Iterator:
+        """Like ``Executor.map``: submit everything now, yield results in order."""
+        futures = [self.submit(fn, *args) for args in zip(*iterables)]
+
+        def results():
+            for future in futures:
+                yield future.result()
+
+        return results()
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._cond:
+            self._shutdown = True
+            if wait:
+                while self._pending or self._in_flight:
+                    self._cond.wait()
+            while self._pending:
+                future = self._pending.popleft()[0]
+                # A re-queued task's future is already running.
+                if not future.cancel():
+                    future.set_exception(CancelledError())
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self._pool.shutdown(wait=wait)
+
+    def __enter__(self) -> "AdaptiveExecutor":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.shutdown(wait=True)
+
+    @property
+    def stats(self) -> ExecutorStats:
+        with self._cond:
+            return ExecutorStats(
+                limit=int(self._limit),
+                in_flight=self._in_flight,
+                pending=len(self._pending),
+                completed=self._completed,
+                failed=self._failed,
+                throttled=self._throttled,
+                retried=self._retried,
+                latency_ewma=self._latency_ewma,
+                best_latency=self._best_latency,
+                paused_for=max(0.0, self._resume_at - time.monotonic()),
+            )
+
+    # -- congestion signals ---------------------------------------------------
+
+    def throttle(self, retry_after: float | None = None) -> None:
+        """Back off after a rate-limit response and pause new dispatches."""
+        delay = self.default_retry_after if retry_after is None else retry_after
+        delay = min(max(delay, 0.0), MAX_PAUSE)
+        with self._cond:
+            self._throttled += 1
+            now = time.monotonic()
+            before = int(self._limit)
+            # Tasks already in flight during a pause hit the same limit.
+            if now >= self._resume_at:
+                self._decrease(now, force=True)
+            after = int(self._limit)
+            self._resume_at = max(self._resume_at, now + delay)
+        print(
+            f"gh rate limited: concurrency {before} -> {after}, "
+            f"pausing {delay:.0f}s",
+            file=sys.stderr,
+        )
+
+    def _decrease(self, now: float, *, force: bool = False) -> None:
+        # One decrease per typical task latency: the other tasks of the
+        # same burst report the same congestion.
+        window = self._latency_ewma or 0.0
+        if not force and now - self._last_decrease < window:
+            return
+        self._limit = max(float(self.min_workers), self._limit * self.backoff)
+        self._last_decrease = now
+
+    def _record(self, latency: float, ok: bool, *, retried: bool = False) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            if retried:
+                self._retried += 1
+            else:
+                self._completed += 1
+                if not ok:
+                    self._failed += 1
+            if self._latency_ewma is None:
+                self._latency_ewma = latency
+            else:
+                self._latency_ewma += _EWMA_WEIGHT * (latency - self._latency_ewma)
+            if self._best_latency is None or latency < self._best_latency:
+                self._best_latency = latency
+            baseline = max(self._best_latency, LATENCY_FLOOR)
+            if latency > baseline * self.latency_tolerance:
+                self._decrease(time.monotonic())
+            elif ok:
+                self._limit = min(
+                    float(self.max_workers), self._limit + 1 / self._limit
+                )
+            self._cond.notify_all()
+
+    # -- dispatch -------------------------------------------------------------
+
+    def _dispatch(self) -> None:
+        with self._cond:
+            delay = self._resume_at - time.monotonic()
+            if delay > 0:
+                if self._pending and self._timer is None:
+                    self._timer = threading.Timer(delay, self._resume)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+            while self._pending and self._in_flight < int(self._limit):
+                future, fn, args, kwargs, attempt = self._pending.popleft()
+                if not attempt and not future.set_running_or_notify_cancel():
+                    continue
+                self._in_flight += 1
+                self._pool.submit(self._work, future, fn, args, kwargs, attempt)
+            self._cond.notify_all()
+
+    def _resume(self) -> None:
+        with self._cond:
+            self._timer = None
+        self._dispatch()
+
+    def _work(self, future: Future, fn, args, kwargs, attempt: int) -> None:
+        _local.executor = self
+        _local.throttled = False
+        start = time.monotonic()
+        ok = False
+        try:
+            result = fn(*args, **kwargs)
+            ok = True
+        except BaseException as exc:  # surfaced through the future
+            result = exc
+        _local.executor = None
+        # Whatever the task returned came from a throttled lookup: run it
+        # again once the pause is over (front of the queue, keeping order).
+        retry = _local.throttled and attempt < self.retry_throttled
+        if retry:
+            with self._cond:
+                self._pending.appendleft((future, fn, args, kwargs, attempt + 1))
+        elif ok:
+            future.set_result(result)
+        else:
+            future.set_exception(result)
+        self._record(time.monotonic() - start, ok, retried=retry)
+        self._dispatch()
+
+
+def report_throttle(retry_after: float | None = None) -> bool:
+    """Tell the executor running this thread (if any) that GitHub throttled us."""
+    executor = getattr(_local, "executor", None)
+    if executor is None:
+        return False
+    _local.throttled = True
+    executor.throttle(retry_after)
+    return True
+
+
+def note_gh_result(result: Any) -> None:
+    """Report a throttle if a finished ``gh`` process failed on a rate limit."""
+    stderr = getattr(result, "stderr", None)
+    if getattr(result, "returncode", 0) != 0 and isinstance(stderr, str):
+        if _RATE_LIMITED.search(stderr):
+            report_throttle()
@@ -1,36 +1,12 @@
-import json
-import subprocess
 import sys
-from concurrent.futures import ThreadPoolExecutor
 
-from gh_token_env import load_gh_token_env
+import gh_cache
+import github_client
+from adaptive_executor import AdaptiveExecutor
+from gh_cache import run_json as run_gh
+from pr_classifier import PR_CLASSIFIER
 from pr_reference import PRReference
-
-
-def run_gh(cmd_list):
-    """Call ``gh`` and return parsed JSON, or None on failure/timeout."""
-    env = load_gh_token_env()
-    try:
-        result = subprocess.run(
-            cmd_list,
-            capture_output=True,
-            text=True,
-            env=env,
-            timeout=120,
-            check=False,
-        )
-    except subprocess.TimeoutExpired:
-        print(
-            f"gh command timed out: {cmd_list[0] if cmd_list else cmd_list}",
-            file=sys.stderr,
-        )
-        return None
-    if result.returncode != 0:
-        return None
-    try:
-        return json.loads(result.stdout)
-    except json.JSONDecodeError:
-        return None
+from pr_store import LABEL_MAX_AGE, PRStore, default_store_path, ensure_fields
 
 
 ready_prs = [
@@ -62,20 +38,8 @@ ready_prs = [
 ]
 
 
-_CATEGORIES = (
-    ("SECURITY", ("sentinel", "security", "cve", "xxe")),
-    ("DEPENDENCY", ("dependabot", "renovate")),
-    ("CI/INFRA", ("chore", "ci", "automation", "action", "trunk")),
-)
-
-
 def get_category_from_title(title: str) -> str:
-    title = title.lower()
-    for cat_name, keywords in _CATEGORIES:
-        for kw in keywords:
-            if kw in title:
-                return cat_name
-    return "PERFORMANCE/REFACTOR/UI/FEATURE"
+    return PR_CLASSIFIER.label(title, "ready", "PERFORMANCE/REFACTOR/UI/FEATURE")
 
 
 categorized = {
@@ -103,21 +67,59 @@ def fetch_pr_info(pr):
     return pr, info
 
 
-with ThreadPoolExecutor(max_workers=min(len(ready_prs) or 1, 32)) as executor:
-    results = executor.map(fetch_pr_info, ready_prs)
+# Categorise the pipeline's READY PRs instead of the curated ``ready_prs``.
+FROM_STORE_FLAG = "--from-store"
+
+
+def ready_from_store(store, max_age=LABEL_MAX_AGE):
+    """Recent READY PRs from the triage stage not flagged as duplicates.
+
+    Duplicate flags of any age still exclude a PR.
+    """
+    duplicates = set(store.labelled("duplicate", "DUPLICATE"))
+    ready = store.labelled("triage", "READY", max_age)
+    return [pr for pr in ready if pr not in duplicates]
 
-for pr, info in results:
-    if not info:
-        continue
 
-    if info.get("mergeStateStatus") in ["DIRTY", "CONFLICTING"]:
-        print(f"Skipping {pr} because it is {info.get('mergeStateStatus')}")
-        continue
+def select_ready(store, argv):
+    """The curated ``ready_prs``, or the store's with :data:`FROM_STORE_FLAG`."""
+    if FROM_STORE_FLAG not in argv:
+        return ready_prs
+    ready = ready_from_store(store)
+    if not ready:
+        print("No recent READY labels in the PR store; nothing to categorise.")
+    return ready
 
-    title = info.get("title", "")
-    cat = get_category_from_title(title)
 
-    categorized[cat].append((pr, title))
+gh_cache.configure(sys.argv[1:])
+github_client.enable()
+with PRStore(default_store_path()) as store:
+    ready = select_ready(store, sys.argv[1:])
+    refs = {PRReference.from_string(pr): pr for pr in ready}
+    infos = ensure_fields(store, refs, ("summary", "merge"), run_gh)
+    missing = [pr for ref, pr in refs.items() if infos.get(ref) is None]
+    # Per-PR fallback for anything the batched lookup could not resolve.
+    with AdaptiveExecutor() as executor:
+        fallback = dict(executor.map(fetch_pr_info, missing))
+    results = [(pr, infos.get(ref) or fallback.get(pr)) for ref, pr in refs.items()]
+
+    for pr, info in results:
+        if not info:
+            continue
+
+        if info.get("mergeStateStatus") in ["DIRTY", "CONFLICTING"]:
+            print(f"Skipping {pr} because it is {info.get('mergeStateStatus')}")
+            continue
+
+        title = info.get("title", "")
+        cat = get_category_from_title(title)
+
+        categorized[cat].append((pr, title))
+
+    store.set_labels(
+        "category",
+        {pr: cat for cat, items in categorized.items() for pr, _ in items},
+    )
 
 for cat, items in categorized.items():
     print(f"\n{cat}:")
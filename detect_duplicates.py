@@ -1,34 +1,22 @@
-import json
-import re
-import subprocess
 import sys
 from collections import defaultdict
 
+import gh_cache
+import github_client
+from adaptive_executor import AdaptiveExecutor
+from gh_cache import run_json as run_gh
+from gh_graphql import PaginatedConnection, fetch_pull_requests
 from gh_token_env import load_gh_token_env
+from pr_diffs import default_diff_cache, fetch_diff, max_bytes_from_env
+from pr_markdown import MarkdownIndex
 from pr_reference import PRReference
+from pr_similarity import DEFAULT_THRESHOLD, near_duplicate_clusters, pr_shingles
+from pr_store import PRStore, default_store_path, ensure_fields
 
-
-def run_gh(cmd_list):
-    """Call ``gh`` and return parsed JSON, or None on failure/timeout."""
-    env = load_gh_token_env()
-    try:
-        result = subprocess.run(
-            cmd_list,
-            capture_output=True,
-            text=True,
-            env=env,
-            timeout=120,
-            check=False,
-        )
-    except subprocess.TimeoutExpired:
-        print(f"gh command timed out: {cmd_list[0]}", file=sys.stderr)
-        return None
-    if result.returncode != 0:
-        return None
-    try:
-        return json.loads(result.stdout)
-    except json.JSONDecodeError:
-        return None
+_FILES_CONNECTION = PaginatedConnection("files", "path")
+_TRIAGE_SECTIONS = ("SUPERSEDED", "STALE", "CONFLICTING", "DUPLICATE", "READY")
+# Set by ``main`` unless ``--no-cache``; diffs are keyed by head SHA.
+diff_cache = None
 
 
 def _process_pr_result(res, file_groups):
@@ -39,42 +27,6 @@ def _process_pr_result(res, file_groups):
     file_groups[(repo, files)].append(info)
 
 
-def _build_graphql_query(refs):
-    """Build a static GraphQL query with declared variables for the given PRs."""
-    var_decls = []
-    query_parts = []
-    fields = []
-    for j, ref in enumerate(refs):
-        var_decls.append(f"$owner{j}: String!, $name{j}: String!, $pr{j}: Int!")
-        query_parts.append(f"""
-        pr{j}: repository(owner: $owner{j}, name: $name{j}) {{
-            pullRequest(number: $pr{j}) {{
-                number
-                title
-                files(first: 100) {{
-                    nodes {{
-                        path
-                    }}
-                }}
-            }}
-        }}
-        """)
-        fields.extend(
-            [
-                "-f",
-                f"owner{j}={ref.owner}",
-                "-f",
-                f"name{j}={ref.name}",
-                "-F",
-                f"pr{j}={ref.number}",
-            ]
-        )
-    if not query_parts:
-        return None, None
-    query = "query (" + ", ".join(var_decls) + ") { " + " ".join(query_parts) + " }"
-    return query, fields
-
-
 def _extract_pr_data(repo, pr_result):
     if not pr_result:
         return None
@@ -92,52 +44,52 @@ def _extract_pr_data(repo, pr_result):
             "number": pr_data.get("number"),
             "title": pr_data.get("title"),
             "files": files,
+            "headRefOid": pr_data.get("headRefOid"),
         },
     )
 
 
-def _process_graphql_response(result, refs, file_groups):
-    if not result:
-        return
-    data = result.get("data")
-    if not data:
-        return
-    for j, ref in enumerate(refs):
-        pr_result = data.get(f"pr{j}")
-        if not pr_result:
-            continue
-
-        res = _extract_pr_data(ref.repo, pr_result)
-        if res:
-            _process_pr_result(res, file_groups)
+def _fetch_from_store(store, refs):
+    """Title and changed paths per PR, reusing the store's field groups."""
+    infos = ensure_fields(store, refs, ("summary", "head", "files"), run_gh)
+    return {
+        ref: {
+            "number": info["number"],
+            "title": info["title"],
+            "headRefOid": info["headRefOid"],
+            "files": {"nodes": info["files"] or []},
+        }
+        for ref, info in infos.items()
+        if info
+    }
 
 
-def _group_prs_by_files(ready_only):
+def _group_prs_by_files(ready_only, store=None):
     file_groups = defaultdict(list)
-    chunk_size = 50
     source = "tasks/pr-triage.md"
-    for i in range(0, len(ready_only), chunk_size):
-        chunk = ready_only[i : i + chunk_size]
-        refs = []
-        for offset, pr in enumerate(chunk):
-            line_number = i + offset + 1
-            try:
-                ref = PRReference.from_string(pr)
-            except ValueError as exc:
-                print(
-                    f"skipping invalid PR reference at {source}:{line_number}: {exc}",
-                    file=sys.stderr,
-                )
-                continue
-            refs.append(ref)
-        if not refs:
+    refs = []
+    for line_number, pr in enumerate(ready_only, 1):
+        try:
+            ref = PRReference.from_string(pr)
+        except ValueError as exc:
+            print(
+                f"skipping invalid PR reference at {source}:{line_number}: {exc}",
+                file=sys.stderr,
+            )
             continue
-        query, fields = _build_graphql_query(refs)
-        if not query:
-            continue
-        cmd = ["gh", "api", "graphql", "-f", f"query={query}", *fields]
-        result = run_gh(cmd)
-        _process_graphql_response(result, refs, file_groups)
+        refs.append(ref)
+    if not refs:
+        return file_groups
+    if store is not None:
+        nodes = _fetch_from_store(store, refs)
+    else:
+        nodes = fetch_pull_requests(
+            run_gh, refs, "number title headRefOid", (_FILES_CONNECTION,)
+        )
+    for ref, pr_data in nodes.items():
+        res = _extract_pr_data(ref.repo, {"pullRequest": pr_data})
+        if res:
+            _process_pr_result(res, file_groups)
     return file_groups
 
 
@@ -151,30 +103,83 @@ def _extract_duplicates_from_groups(file_groups):
     return duplicates
 
 
-def get_duplicates(ready_only):
-    file_groups = _group_prs_by_files(ready_only)
-    return _extract_duplicates_from_groups(file_groups)
+def _fetch_diff(repo, number, head_sha=None):
+    """The PR's diff text, capped at ``GH_DIFF_MAX_BYTES``; None if unreadable."""
+    diff = fetch_diff(
+        PRReference.from_parts(repo, str(number)),
+        head_sha,
+        max_bytes=max_bytes_from_env(),
+        cache=diff_cache,
+        env=load_gh_token_env(),
+    )
+    return diff.text if diff is not None else None
+
+
+def _near_duplicates(file_groups, threshold):
+    """Flag all but the newest PR of each near-duplicate cluster, per repo."""
+    prs = {
+        (repo, info["number"]): (files, info.get("headRefOid"))
+        for (repo, files), pr_list in file_groups.items()
+        for info in pr_list
+    }
+    if len(prs) < 2:
+        return []
+    with AdaptiveExecutor() as executor:
+        diffs = dict(
+            zip(prs, executor.map(lambda key: _fetch_diff(*key, prs[key][1]), prs))
+        )
 
+    by_repo = defaultdict(dict)
+    for (repo, number), (files, _) in prs.items():
+        diff = diffs[(repo, number)]
+        if diff is None:
+            # Paths alone overstate similarity; never flag on them.
+            print(
+                f"skipping {repo}#{number} for similarity: diff unavailable",
+                file=sys.stderr,
+            )
+            continue
+        by_repo[repo][number] = pr_shingles(files, diff)
 
-def _get_superseded_text(lines):
-    try:
-        superseded_start = lines.index("## SUPERSEDED\n") + 1
-    except ValueError:
-        superseded_start = 0
-    try:
-        stale_start = lines.index("## STALE\n")
-    except ValueError:
-        stale_start = len(lines)
-    return "".join(lines[superseded_start:stale_start])
+    duplicates = []
+    for repo, shingles in by_repo.items():
+        for cluster in near_duplicate_clusters(shingles, threshold):
+            for number in sorted(cluster, reverse=True)[1:]:
+                duplicates.append(f"{repo}#{number}")
+    return duplicates
 
 
-def _generate_superseded_section(ready_prs, superseded_text):
-    # ⚡ Bolt Optimization: Use list comprehension instead of for loop with .append
-    return ["## SUPERSEDED"] + [
-        (pr if pr.startswith("-") else f"- {pr}")
-        for pr in ready_prs
-        if pr in superseded_text
-    ]
+def get_duplicates(ready_only, similarity=None, store=None):
+    """Exact file-set duplicates, plus near-duplicates when ``similarity`` is set."""
+    file_groups = _group_prs_by_files(ready_only, store)
+    duplicates = _extract_duplicates_from_groups(file_groups)
+    if similarity is not None:
+        seen = set(duplicates)
+        for dup in _near_duplicates(file_groups, similarity):
+            if dup not in seen:
+                seen.add(dup)
+                duplicates.append(dup)
+    return duplicates
+
+
+def _similarity_from_argv(argv):
+    """Jaccard cut-off from ``--similarity X``; None (exact matches only) without.
+
+    Near-duplicate verdicts drop PRs from the merge queue, so they are
+    opt-in. ``--similarity`` with no number uses ``DEFAULT_THRESHOLD``.
+    """
+    if "--similarity" not in argv:
+        return None
+    index = argv.index("--similarity")
+    if index + 1 >= len(argv) or argv[index + 1].startswith("--"):
+        return DEFAULT_THRESHOLD
+    try:
+        value = float(argv[index + 1])
+    except ValueError:
+        value = 0.0
+    if not 0 < value <= 1:
+        raise SystemExit("--similarity expects a number in (0, 1]")
+    return value
 
 
 def _generate_duplicate_section(duplicates):
@@ -188,44 +193,75 @@ def _generate_ready_section(ready_only, duplicates):
     return ["## READY"] + [f"- {pr}" for pr in ready_only if pr not in duplicates_set]
 
 
-def rewrite_triage_file(lines, ready_prs, duplicates, ready_only):
-    superseded_text = _get_superseded_text(lines)
-
-    sections = [
-        "# PR Triage\n",
-        *_generate_superseded_section(ready_prs, superseded_text),
-        "## STALE",
-        "## CONFLICTING",
-        "- abhimehro/personal-config#725",
-        *_generate_duplicate_section(duplicates),
-        *_generate_ready_section(ready_only, duplicates),
-    ]
-
-    with open("tasks/pr-triage.md", "w") as f:
-        f.write("\n".join(sections) + "\n")
-
-
-# ⚡ Bolt Optimization: Replace slow manual while-loop with C-optimized pre-compiled regex pattern.
-# Performance impact: ~3x speedup on string extraction based on local benchmarking (from ~0.35s to ~0.12s for 100k lines).
-_READY_PR_PATTERN = re.compile(r"^- (abhimehro/.*?)\s*$", re.MULTILINE)
+def ready_candidates(index):
+    """Refs from READY on, plus the previous run's DUPLICATE refs, in order.
+
+    Duplicate verdicts are re-checked on every run, so a PR whose newer twin
+    has closed (or a false positive) returns to READY.
+    """
+    ready = index.section("READY")
+    if ready is None:
+        return []
+    settled = set()
+    for section in index.sections:
+        if section is ready:
+            break
+        if section.title != "DUPLICATE":
+            settled.update(section.refs)
+    return [pr for pr in dict.fromkeys(index.refs()) if pr not in settled]
+
+
+def update_triage_sections(index, duplicates, ready_only):
+    """Rewrite only the DUPLICATE and READY sections of an indexed triage file."""
+    index.replace_section(
+        "DUPLICATE", _generate_duplicate_section(duplicates)[1:], before="READY"
+    )
+    index.replace_section("READY", _generate_ready_section(ready_only, duplicates)[1:])
 
 
-def _extract_ready_prs(content):
-    return _READY_PR_PATTERN.findall(content)
+def write_triage_report(store, duplicates, ready_only, path="tasks/pr-triage.md"):
+    """Refresh tasks/pr-triage.md's sections from the store's triage labels.
 
+    Only the category sections are replaced; notes elsewhere in the file
+    are kept.
+    """
+    try:
+        with open(path, "r") as f:
+            index = MarkdownIndex.from_text(f.read())
+    except FileNotFoundError:
+        index = MarkdownIndex.from_text("# PR Triage\n\n")
+    for position, category in enumerate(_TRIAGE_SECTIONS[:3]):
+        # A missing section goes ahead of the next one that exists.
+        later = (t for t in _TRIAGE_SECTIONS[position + 1 :] if index.section(t))
+        index.replace_section(
+            category,
+            [f"- {pr}" for pr in store.labelled("triage", category)],
+            before=next(later, None),
+        )
+    update_triage_sections(index, duplicates, ready_only)
 
-def _get_pre_ready_text(content):
-    ready_idx = content.find(chr(10) + "## READY" + chr(10))
-    if ready_idx != -1:
-        ready_idx += 1
-    elif content.startswith("## READY" + chr(10)):
-        ready_idx = 0
-    else:
-        ready_idx = len(content)
-    return content[:ready_idx]
+    with open(path, "w") as f:
+        f.write(index.text())
 
 
 def main():
+    global diff_cache
+    similarity = _similarity_from_argv(sys.argv[1:])
+    gh_cache.configure(sys.argv[1:])
+    github_client.enable()
+    if gh_cache.NO_CACHE_FLAG not in sys.argv[1:]:
+        diff_cache = default_diff_cache()
+    with PRStore(default_store_path()) as store:
+        if store.labels("triage"):
+            ready_only = store.labelled("triage", "READY")
+            duplicates = get_duplicates(ready_only, similarity, store)
+            store.set_labels("duplicate", dict.fromkeys(duplicates, "DUPLICATE"))
+            print("Duplicates:", duplicates)
+            write_triage_report(store, duplicates, ready_only)
+            print("Done")
+            return
+
+    # No triage labels yet (parse_inventory has not run against the store).
     try:
         with open("tasks/pr-triage.md", "r") as f:
             content = f.read()
@@ -233,15 +269,15 @@ def main():
         print("tasks/pr-triage.md not found.")
         return
 
-    ready_prs = _extract_ready_prs(content)
-    pre_ready_text = _get_pre_ready_text(content)
-    ready_only = [pr for pr in ready_prs if pr not in pre_ready_text]
+    index = MarkdownIndex.from_text(content)
+    ready_only = ready_candidates(index)
 
-    duplicates = get_duplicates(ready_only)
+    duplicates = get_duplicates(ready_only, similarity)
     print("Duplicates:", duplicates)
 
-    lines = content.splitlines(keepends=True)
-    rewrite_triage_file(lines, ready_prs, duplicates, ready_only)
+    update_triage_sections(index, duplicates, ready_only)
+    with open("tasks/pr-triage.md", "w") as f:
+        f.write(index.text())
     print("Done")
 
 
@@ -0,0 +1,340 @@
+"""On-disk cache for read-only ``gh`` invocations shared by the PR scripts.
+
+Triage scripts are usually run back to back over the same PRs, and nearly all
+of their runtime is ``gh`` process spawn plus API latency. When enabled, this
+module stores the stdout of read-only commands (``gh pr view``, ``gh pr
+diff``, ``gh api`` GETs and GraphQL queries) keyed by normalised argv:
+
+- ``gh api`` REST GETs are revalidated with ``If-None-Match`` against the
+  stored ETag, so unchanged resources cost a 304 and no rate limit;
+- everything else is served from disk for ``GH_CACHE_TTL`` seconds.
+
+The cache is off until a script's entry point calls :func:`configure`, so
+importing a script (or unit-testing its ``run_gh``) never touches disk.
+Pass ``--no-cache`` (or set ``GH_NO_CACHE=1``) to bypass it for a run.
+
+SECURITY: entries can hold private-repo data; files are written ``0600`` and
+keys include a fingerprint of ``GH_TOKEN`` so identities never share entries.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Mapping, Sequence
+
+from adaptive_executor import note_gh_result
+from gh_token_env import load_gh_token_env
+
+DEFAULT_TTL = 300
+NO_CACHE_FLAG = "--no-cache"
+
+# ``gh <group> <verb>`` pairs that never mutate anything.
+_READ_ONLY_SUBCOMMANDS = frozenset(
+    {
+        ("pr", "view"),
+        ("pr", "diff"),
+        ("pr", "list"),
+        ("pr", "checks"),
+        ("issue", "view"),
+        ("issue", "list"),
+        ("repo", "view"),
+        ("run", "list"),
+        ("run", "view"),
+    }
+)
+# ``gh api`` flags that take a value; fields switch the default method to POST.
+_FIELD_FLAGS = frozenset({"-f", "-F", "--field", "--raw-field"})
+_VALUE_FLAGS = _FIELD_FLAGS | frozenset(
+    {"-H", "--header", "-X", "--method", "-q", "--jq", "-t", "--template", "--input"}
+)
+_STATUS_LINE = re.compile(r"^HTTP/\S+\s+(\d{3})")
+_HEADER_BREAK = re.compile(r"\r?\n\r?\n")
+
+_active: "GhCache | None" = None
+# Optional in-process handler (see ``github_client``); returns None to decline.
+_transport: "Callable[..., subprocess.CompletedProcess | None] | None" = None
+
+
+def default_cache_dir() -> Path:
+    override = os.environ.get("GH_CACHE_DIR")
+    if override:
+        return Path(override).expanduser()
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "personal-config" / "gh"
+
+
+def parse_api_args(args: Sequence[str]) -> tuple[list[str], list[tuple[str, str]]]:
+    """Split ``gh api`` args into positionals and ``(flag, value)`` pairs."""
+    positionals: list[str] = []
+    options: list[tuple[str, str]] = []
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in _VALUE_FLAGS and i + 1 < len(args):
+            options.append((arg, args[i + 1]))
+            i += 2
+            continue
+        if arg.startswith("-"):
+            options.append((arg, ""))
+        else:
+            positionals.append(arg)
+        i += 1
+    return positionals, options
+
+
+def _api_method(options: list[tuple[str, str]]) -> str:
+    for flag, value in options:
+        if flag in ("-X", "--method"):
+            return value.upper()
+    if any(flag in _FIELD_FLAGS or flag == "--input" for flag, _ in options):
+        return "POST"
+    return "GET"
+
+
+def _graphql_query(options: list[tuple[str, str]]) -> str:
+    for flag, value in options:
+        if flag in _FIELD_FLAGS and value.startswith("query="):
+            return value[len("query=") :]
+    return ""
+
+
+def is_read_only(cmd_list: Sequence[str]) -> bool:
+    """True when ``cmd_list`` is a ``gh`` call that cannot mutate state."""
+    if len(cmd_list) < 2 or cmd_list[0] != "gh":
+        return False
+    if cmd_list[1] == "search":
+        return True
+    if cmd_list[1] != "api":
+        return tuple(cmd_list[1:3]) in _READ_ONLY_SUBCOMMANDS
+    positionals, options = parse_api_args(cmd_list[2:])
+    if positionals[:1] == ["graphql"]:
+        query = _graphql_query(options).lstrip()
+        return bool(query) and not query.startswith("mutation")
+    return bool(positionals) and _api_method(options) == "GET"
+
+
+def _supports_etag(cmd_list: Sequence[str]) -> bool:
+    """REST GETs (single page) can be revalidated with ``If-None-Match``."""
+    if list(cmd_list[1:2]) != ["api"]:
+        return False
+    positionals, options = parse_api_args(cmd_list[2:])
+    flags = {flag for flag, _ in options}
+    return (
+        positionals[:1] != ["graphql"]
+        and "--paginate" not in flags
+        and not flags & {"-i", "--include"}
+    )
+
+
+def cache_key(cmd_list: Sequence[str], env: Mapping[str, str] | None = None) -> str:
+    """Stable key for ``cmd_list``: field/header order and query whitespace ignored."""
+    head = list(cmd_list[:2])
+    if list(cmd_list[1:2]) == ["api"]:
+        positionals, options = parse_api_args(cmd_list[2:])
+        options = sorted(
+            (flag, " ".join(value.split()) if value.startswith("query=") else value)
+            for flag, value in options
+        )
+        body: list = [positionals, options]
+    else:
+        body = list(cmd_list[2:])
+    token = (env or os.environ).get("GH_TOKEN", "")
+    identity = hashlib.sha256(token.encode()).hexdigest()[:16] if token else ""
+    raw = json.dumps([head, body, identity], separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _split_included(stdout: str) -> tuple[int | None, str | None, str]:
+    """Parse ``gh api --include`` output into ``(status, etag, body)``."""
+    match = _STATUS_LINE.match(stdout)
+    if not match:
+        return None, None, stdout
+    parts = _HEADER_BREAK.split(stdout, maxsplit=1)
+    headers, body = parts[0], parts[1] if len(parts) > 1 else ""
+    etag = None
+    for line in headers.splitlines()[1:]:
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "etag":
+            etag = value.strip()
+    return int(match.group(1)), etag, body
+
+
+def set_transport(
+    transport: "Callable[..., subprocess.CompletedProcess | None] | None",
+) -> None:
+    """Try ``transport(cmd_list, env=, timeout=)`` before spawning ``gh``."""
+    global _transport
+    _transport = transport
+
+
+def _run(cmd_list: Sequence[str], env, timeout) -> subprocess.CompletedProcess:
+    if _transport is not None:
+        result = _transport(cmd_list, env=env, timeout=timeout)
+        if result is not None:
+            return result
+    result = subprocess.run(
+        list(cmd_list),
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=timeout,
+        check=False,
+    )
+    note_gh_result(result)
+    return result
+
+
+class GhCache:
+    """Directory of JSON entries ``{stdout, etag, fetched_at}`` keyed by argv."""
+
+    def __init__(self, cache_dir: Path | str, ttl: float = DEFAULT_TTL) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _load(self, key: str) -> dict | None:
+        try:
+            entry = json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or not isinstance(entry.get("stdout"), str):
+            return None
+        return entry
+
+    def _store(self, key: str, stdout: str, etag: str | None) -> None:
+        entry = {"stdout": stdout, "etag": etag, "fetched_at": time.time()}
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.chmod(tmp, 0o600)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            # A cache that cannot be written must never fail the command.
+            pass
+
+    def run(
+        self,
+        cmd_list: Sequence[str],
+        *,
+        env: Mapping[str, str] | None = None,
+        timeout: float = 120,
+    ) -> subprocess.CompletedProcess:
+        key = cache_key(cmd_list, env)
+        entry = self._load(key)
+        if entry and time.time() - entry.get("fetched_at", 0) < self.ttl:
+            self.hits += 1
+            return subprocess.CompletedProcess(list(cmd_list), 0, entry["stdout"], "")
+
+        if not _supports_etag(cmd_list):
+            self.misses += 1
+            result = _run(cmd_list, env, timeout)
+            if result.returncode == 0:
+                self._store(key, result.stdout, None)
+            return result
+
+        argv = [*cmd_list[:2], "--include", *cmd_list[2:]]
+        if entry and entry.get("etag"):
+            argv += ["-H", f"If-None-Match: {entry['etag']}"]
+        result = _run(argv, env, timeout)
+        status, etag, body = _split_included(result.stdout or "")
+        # ``gh api`` exits non-zero on 304, so trust the status line.
+        if status == 304 and entry:
+            self.revalidated += 1
+            self._store(key, entry["stdout"], entry.get("etag"))
+            return subprocess.CompletedProcess(list(cmd_list), 0, entry["stdout"], "")
+        self.misses += 1
+        if result.returncode == 0:
+            self._store(key, body, etag)
+        return subprocess.CompletedProcess(
+            list(cmd_list), result.returncode, body, result.stderr
+        )
+
+
+def configure(
+    argv: Sequence[str] | None = None,
+    *,
+    cache_dir: Path | str | None = None,
+    ttl: float | None = None,
+) -> GhCache | None:
+    """Enable the process-wide cache unless ``--no-cache``/``GH_NO_CACHE`` opt out."""
+    global _active
+    disabled = os.environ.get("GH_NO_CACHE", "").strip().lower() in ("1", "true", "yes")
+    if disabled or NO_CACHE_FLAG in (argv or ()):
+        _active = None
+        return None
+    if ttl is None:
+        try:
+            ttl = float(os.environ.get("GH_CACHE_TTL", DEFAULT_TTL))
+        except ValueError:
+            ttl = DEFAULT_TTL
+    _active = GhCache(cache_dir or default_cache_dir(), ttl)
+    return _active
+
+
+def run(
+    cmd_list: Sequence[str],
+    *,
+    env: Mapping[str, str] | None = None,
+    timeout: float = 120,
+) -> subprocess.CompletedProcess:
+    """``subprocess.run`` for ``gh``, served from the cache when enabled and safe.
+
+    Mutating and uncacheable commands still go through the in-process
+    transport when one is installed.
+    """
+    cache = _active
+    if cache is None or not is_read_only(cmd_list):
+        return _run(cmd_list, env, timeout)
+    return cache.run(cmd_list, env=env, timeout=timeout)
+
+
+def run_fresh(
+    cmd_list: Sequence[str],
+    *,
+    env: Mapping[str, str] | None = None,
+    timeout: float = 120,
+) -> subprocess.CompletedProcess:
+    """:func:`run` bypassing the cache, for state that just changed (post-merge)."""
+    return _run(cmd_list, env, timeout)
+
+
+def run_json(
+    cmd_list: Sequence[str], *, timeout: float = 120, fresh: bool = False
+) -> Any:
+    """:func:`run` with the shared ``gh`` token env; decoded stdout, or None.
+
+    ``fresh`` goes through :func:`run_fresh` instead. GraphQL responses that
+    carry ``data`` are returned even on a non-zero exit: ``gh api graphql``
+    exits 1 whenever ``errors`` is present, but the aliases that resolved are
+    still in ``data`` and batchers read the per-alias ``errors`` themselves.
+    """
+    runner = run_fresh if fresh else run
+    try:
+        result = runner(cmd_list, env=load_gh_token_env(), timeout=timeout)
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+    if result.returncode != 0 and list(cmd_list[1:3]) != ["api", "graphql"]:
+        return None
+    try:
+        payload = json.loads(result.stdout)
+    except (TypeError, json.JSONDecodeError):
+        return None
+    if result.returncode != 0 and not (
+        isinstance(payload, dict) and isinstance(payload.get("data"), dict)
+    ):
+        return None
+    return payload
@@ -0,0 +1,279 @@
+"""Batched ``gh api graphql`` lookups for the PR automation scripts.
+
+Per-PR lookups are coalesced into aliased queries (``pr0: repository(...)``)
+so triage of a few hundred PRs costs a handful of ``gh`` round-trips instead
+of one subprocess per PR. Owner, repo name and PR number are always passed as
+declared GraphQL variables (``-f``/``-F`` fields), never interpolated into the
+query text.
+
+Transport is injected: callers pass their own ``run_gh(cmd_list)`` so the
+token handling, timeouts and test patches of each script keep applying.
+"""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Sequence
+
+from pr_reference import PRReference
+
+# GitHub rejects queries that could return more than 500k nodes and charges
+# rate limit per 100 requested nodes; these defaults keep a batch well below
+# both while still covering ~50 PRs (each with ``files(first: 100)``) per call.
+DEFAULT_MAX_ALIASES = 50
+DEFAULT_MAX_COST = 10_000
+# Extra requests allowed for bisecting failed batches and retrying aliases.
+DEFAULT_RETRY_BUDGET = 8
+# Follow-up pages fetched per nested connection before giving up.
+DEFAULT_MAX_PAGES = 10
+
+# Alias-level errors that will not go away on retry.
+_PERMANENT_ERROR_TYPES = frozenset({"NOT_FOUND", "FORBIDDEN"})
+
+RunGh = Callable[[list], Any]
+
+
+@dataclass(frozen=True, slots=True)
+class PaginatedConnection:
+    """A nested connection (e.g. ``files``) fetched page by page until exhausted."""
+
+    name: str
+    fields: str
+    page_size: int = 100
+
+    def selection(self, after_var: str | None = None) -> str:
+        args = f"first: {self.page_size}"
+        if after_var:
+            args += f", after: ${after_var}"
+        return (
+            f"{self.name}({args}) {{ nodes {{ {self.fields} }} "
+            "pageInfo { hasNextPage endCursor } }"
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class _Lookup:
+    """One alias in a batched query: a PR plus what to select on it."""
+
+    ref: PRReference
+    body: str
+    cost: int
+    cursor: tuple[str, str] | None = None  # (variable suffix, endCursor)
+
+
+class PullRequestBatcher:
+    """Coalesce ``pullRequest`` lookups into aliased, size-bounded GraphQL queries.
+
+    ``selection`` holds the scalar fields to fetch (``"number title"``);
+    ``connections`` lists nested connections that are paginated with
+    follow-up batched queries and merged back into each PR's ``nodes``.
+    """
+
+    def __init__(
+        self,
+        run: RunGh,
+        selection: str = "number",
+        connections: Sequence[PaginatedConnection] = (),
+        *,
+        max_aliases: int = DEFAULT_MAX_ALIASES,
+        max_cost: int = DEFAULT_MAX_COST,
+        retry_budget: int = DEFAULT_RETRY_BUDGET,
+        max_pages: int = DEFAULT_MAX_PAGES,
+    ) -> None:
+        if max_aliases < 1:
+            raise ValueError("max_aliases must be at least 1")
+        self._run = run
+        self._selection = selection
+        self._connections = tuple(connections)
+        self._max_aliases = max_aliases
+        self._max_cost = max_cost
+        self._retry_budget = retry_budget
+        self._max_pages = max_pages
+        self.requests = 0
+
+    def fetch(
+        self, refs: Iterable[PRReference]
+    ) -> dict[PRReference, dict[str, Any] | None]:
+        """Return ``{ref: pullRequest node or None}`` for every (deduplicated) ref."""
+        unique = list(dict.fromkeys(refs))
+        if not unique:
+            return {}
+        body = " ".join(
+            [self._selection, *(conn.selection() for conn in self._connections)]
+        )
+        cost = 1 + sum(conn.page_size for conn in self._connections)
+        lookups = [_Lookup(ref, body, cost) for ref in unique]
+        budget = [self._retry_budget]
+        nodes = self._execute(lookups, budget)
+        results = {lookup.ref: nodes.get(lookup) for lookup in lookups}
+        for conn in self._connections:
+            self._paginate(conn, results, budget)
+        return results
+
+    # -- pagination ---------------------------------------------------------
+
+    def _paginate(
+        self,
+        conn: PaginatedConnection,
+        results: dict[PRReference, dict[str, Any] | None],
+        budget: list[int],
+    ) -> None:
+        for _ in range(self._max_pages):
+            pending = []
+            for ref, node in results.items():
+                page_info = _page_info(node, conn.name)
+                if page_info.get("hasNextPage") and page_info.get("endCursor"):
+                    pending.append(
+                        _Lookup(
+                            ref,
+                            conn.selection("after{j}"),
+                            1 + conn.page_size,
+                            ("after{j}", page_info["endCursor"]),
+                        )
+                    )
+            if not pending:
+                return
+            pages = self._execute(pending, budget)
+            for lookup in pending:
+                _merge_page(results[lookup.ref], pages.get(lookup), conn.name)
+        print(
+            f"gh graphql: stopped paginating {conn.name} after "
+            f"{self._max_pages} extra pages",
+            file=sys.stderr,
+        )
+
+    # -- batching -----------------------------------------------------------
+
+    def _chunks(self, lookups: list[_Lookup]) -> Iterable[list[_Lookup]]:
+        chunk: list[_Lookup] = []
+        cost = 0
+        for lookup in lookups:
+            if chunk and (
+                len(chunk) >= self._max_aliases or cost + lookup.cost > self._max_cost
+            ):
+                yield chunk
+                chunk, cost = [], 0
+            chunk.append(lookup)
+            cost += lookup.cost
+        if chunk:
+            yield chunk
+
+    def _execute(
+        self, lookups: list[_Lookup], budget: list[int]
+    ) -> dict[_Lookup, dict[str, Any] | None]:
+        out: dict[_Lookup, dict[str, Any] | None] = {}
+        for chunk in self._chunks(lookups):
+            out.update(self._run_chunk(chunk, budget))
+        return out
+
+    def _run_chunk(
+        self, chunk: list[_Lookup], budget: list[int]
+    ) -> dict[_Lookup, dict[str, Any] | None]:
+        self.requests += 1
+        result = self._run(_build_command(chunk))
+        data = result.get("data") if isinstance(result, dict) else None
+        if not isinstance(data, dict):
+            # Whole request failed (timeout, 502, query too complex): bisect so
+            # one bad PR or an oversized batch cannot sink every other lookup.
+            if len(chunk) > 1 and budget[0] > 0:
+                budget[0] -= 1
+                mid = len(chunk) // 2
+                out = self._run_chunk(chunk[:mid], budget)
+                out.update(self._run_chunk(chunk[mid:], budget))
+                return out
+            return dict.fromkeys(chunk)
+
+        out = {}
+        for j, lookup in enumerate(chunk):
+            alias = data.get(f"pr{j}")
+            out[lookup] = (
+                alias.get("pullRequest") if isinstance(alias, dict) else None
+            )
+
+        retry = [
+            chunk[j]
+            for j in _retryable_aliases(result.get("errors"), len(chunk))
+            if out[chunk[j]] is None
+        ]
+        if retry and len(retry) < len(chunk) and budget[0] > 0:
+            budget[0] -= 1
+            out.update(self._execute(retry, budget))
+        return out
+
+
+def _retryable_aliases(errors: Any, count: int) -> set[int]:
+    """Indexes of ``prN`` aliases named by transient (non-permanent) errors."""
+    failed = set()
+    for error in errors if isinstance(errors, list) else ():
+        if not isinstance(error, dict) or error.get("type") in _PERMANENT_ERROR_TYPES:
+            continue
+        path = error.get("path")
+        if not path or not isinstance(path[0], str) or not path[0].startswith("pr"):
+            continue
+        index = path[0][2:]
+        if index.isdigit() and int(index) < count:
+            failed.add(int(index))
+    return failed
+
+
+def _build_command(chunk: Sequence[_Lookup]) -> list[str]:
+    """Build the ``gh api graphql`` argv with declared variables for ``chunk``."""
+    var_decls = []
+    parts = []
+    fields = []
+    for j, lookup in enumerate(chunk):
+        ref = lookup.ref
+        var_decls.append(f"$owner{j}: String!, $name{j}: String!, $pr{j}: Int!")
+        body = lookup.body.replace("{j}", str(j))
+        parts.append(
+            f"pr{j}: repository(owner: $owner{j}, name: $name{j}) "
+            f"{{ pullRequest(number: $pr{j}) {{ {body} }} }}"
+        )
+        fields += [
+            "-f",
+            f"owner{j}={ref.owner}",
+            "-f",
+            f"name{j}={ref.name}",
+            "-F",
+            f"pr{j}={ref.number}",
+        ]
+        if lookup.cursor:
+            var = lookup.cursor[0].replace("{j}", str(j))
+            var_decls.append(f"${var}: String!")
+            fields += ["-f", f"{var}={lookup.cursor[1]}"]
+    query = "query (" + ", ".join(var_decls) + ") { " + " ".join(parts) + " }"
+    return ["gh", "api", "graphql", "-f", f"query={query}", *fields]
+
+
+def _page_info(node: dict[str, Any] | None, name: str) -> dict[str, Any]:
+    conn = node.get(name) if isinstance(node, dict) else None
+    info = conn.get("pageInfo") if isinstance(conn, dict) else None
+    return info if isinstance(info, dict) else {}
+
+
+def _merge_page(
+    node: dict[str, Any] | None, page: dict[str, Any] | None, name: str
+) -> None:
+    """Append a follow-up page's nodes onto ``node[name]`` and advance its cursor."""
+    conn = node.get(name) if isinstance(node, dict) else None
+    extra = page.get(name) if isinstance(page, dict) else None
+    if not isinstance(conn, dict):
+        return
+    if not isinstance(extra, dict):
+        # Stop paginating this PR; keep what was already fetched.
+        conn["pageInfo"] = {"hasNextPage": False, "endCursor": None}
+        return
+    conn.setdefault("nodes", []).extend(extra.get("nodes") or ())
+    conn["pageInfo"] = extra.get("pageInfo") or {"hasNextPage": False}
+
+
+def fetch_pull_requests(
+    run: RunGh,
+    refs: Iterable[PRReference],
+    selection: str = "number",
+    connections: Sequence[PaginatedConnection] = (),
+    **limits: int,
+) -> dict[PRReference, dict[str, Any] | None]:
+    """Convenience wrapper: one-shot :class:`PullRequestBatcher` fetch."""
+    return PullRequestBatcher(run, selection, connections, **limits).fetch(refs)
@@ -0,0 +1,384 @@
+"""In-process GitHub REST/GraphQL client for the PR automation scripts.
+
+Every ``gh`` subprocess costs a Go binary start, an auth lookup and a fresh
+TLS handshake; with 32 parallel lookups that overhead dominates a triage run.
+:class:`GitHubClient` answers the ``gh`` argv shapes the PR scripts already
+build (``gh api graphql``, ``gh api <path>``, ``gh pr view --json``,
+``gh pr diff``) over one pooled keep-alive ``lib.safe_http`` session and
+returns ``CompletedProcess`` objects shaped like ``gh`` output, so the
+scripts' ``run_gh`` helpers parse them unchanged.
+
+Anything it does not model (merges, ``--jq``, ``{owner}`` placeholders, ...)
+returns None and falls through to spawning ``gh``. Enable it per run with
+:func:`enable`; set ``GH_CLIENT=subprocess`` to keep the old behaviour.
+
+SECURITY: requests are pinned to ``https://api.github.com`` through
+``safe_request`` (SSRF checks, no proxy env, auth stripped on cross-host
+redirects). The token comes from ``load_gh_token_env`` and is never logged.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import time
+from typing import Any, Mapping, Sequence
+
+import gh_cache
+from adaptive_executor import report_throttle
+from gh_token_env import load_gh_token_env
+from pr_reference import InvalidPrReferenceError, PRReference
+
+API_URL = "https://api.github.com"
+_ALLOWED_HOSTS = ("api.github.com",)
+# Matches the widest ThreadPoolExecutor the PR scripts use.
+POOL_SIZE = 32
+CONNECT_TIMEOUT = 10
+DIFF_CHUNK_SIZE = 64 * 1024
+
+_FIELD_FLAGS = frozenset({"-f", "-F", "--field", "--raw-field"})
+_SUPPORTED_API_FLAGS = _FIELD_FLAGS | frozenset(
+    {"-H", "--header", "-X", "--method", "-i", "--include"}
+)
+_TYPED_LITERALS = {"true": True, "false": False, "null": None}
+
+# ``gh pr view --json`` fields we can express as GraphQL selections.
+_PR_VIEW_FIELDS = {
+    "number": "number",
+    "title": "title",
+    "body": "body",
+    "state": "state",
+    "url": "url",
+    "isDraft": "isDraft",
+    "createdAt": "createdAt",
+    "updatedAt": "updatedAt",
+    "mergeable": "mergeable",
+    "mergeStateStatus": "mergeStateStatus",
+    "headRefName": "headRefName",
+    "baseRefName": "baseRefName",
+    "author": "author { login }",
+    "files": "files(first: 100) { nodes { path additions deletions } }",
+}
+
+
+def _pooled_session(pool_size: int):
+    """``build_safe_session`` with a connection pool sized for our thread pools."""
+    from requests.adapters import HTTPAdapter
+
+    from lib.safe_http import build_safe_session
+
+    session = build_safe_session()
+    retries = session.get_adapter(API_URL).max_retries
+    session.mount(
+        "https://", HTTPAdapter(pool_maxsize=pool_size, max_retries=retries)
+    )
+    return session
+
+
+def _typed_value(raw: str) -> Any:
+    """``gh api -F`` semantics: literals and integers are typed, rest are strings."""
+    if raw in _TYPED_LITERALS:
+        return _TYPED_LITERALS[raw]
+    if raw.lstrip("-").isdigit():
+        return int(raw)
+    return raw
+
+
+def _api_fields(options: list[tuple[str, str]]) -> dict[str, Any] | None:
+    """Collect ``-f``/``-F`` fields, or None for forms we do not model (``@file``)."""
+    fields: dict[str, Any] = {}
+    for flag, value in options:
+        if flag not in _FIELD_FLAGS:
+            continue
+        key, sep, raw = value.partition("=")
+        if not sep:
+            return None
+        if flag in ("-F", "--field"):
+            if raw.startswith("@"):
+                return None
+            fields[key] = _typed_value(raw)
+        else:
+            fields[key] = raw
+    return fields
+
+
+def _pr_args(args: Sequence[str], value_flags: frozenset[str]) -> dict | None:
+    """Parse ``<number> -R owner/name [--json a,b]``; None for anything else."""
+    parsed: dict[str, str] = {}
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in value_flags and i + 1 < len(args):
+            parsed[arg.lstrip("-")] = args[i + 1]
+            i += 2
+            continue
+        if arg.startswith("-") or "number" in parsed:
+            return None
+        parsed["number"] = arg
+        i += 1
+    repo = parsed.pop("R", None) or parsed.pop("repo", None)
+    if not repo or "number" not in parsed:
+        return None
+    try:
+        parsed["ref"] = PRReference.from_parts(repo, parsed.pop("number"))
+    except InvalidPrReferenceError:
+        return None
+    return parsed
+
+
+def _note_rate_limit(resp) -> None:
+    """Feed GitHub rate-limit responses to the adaptive executor, if any."""
+    if resp.status_code not in (403, 429):
+        return
+    headers = resp.headers
+    retry_after = headers.get("Retry-After", "")
+    reset = headers.get("X-RateLimit-Reset", "")
+    if retry_after.isdigit():
+        report_throttle(float(retry_after))
+    elif headers.get("X-RateLimit-Remaining") == "0" and reset.isdigit():
+        report_throttle(int(reset) - time.time())
+    elif resp.status_code == 429 or "rate limit" in (resp.text or "").lower():
+        report_throttle()
+
+
+def _completed(
+    cmd_list: Sequence[str], returncode: int, stdout: str = "", stderr: str = ""
+) -> subprocess.CompletedProcess:
+    return subprocess.CompletedProcess(list(cmd_list), returncode, stdout, stderr)
+
+
+class GitHubClient:
+    """Pooled GitHub API client that can stand in for read/query ``gh`` calls."""
+
+    def __init__(
+        self,
+        token: str,
+        *,
+        session=None,
+        api_url: str = API_URL,
+        pool_size: int = POOL_SIZE,
+    ) -> None:
+        self._token = token
+        self._api_url = api_url.rstrip("/")
+        self._session = session if session is not None else _pooled_session(pool_size)
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        timeout: float = 120,
+        **kwargs: Any,
+    ):
+        from lib.safe_http import safe_request
+
+        merged = {
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+            "User-Agent": "personal-config-pr-scripts",
+            **(headers or {}),
+            "Authorization": f"Bearer {self._token}",
+        }
+        resp = safe_request(
+            method,
+            f"{self._api_url}/{path.lstrip('/')}",
+            session=self._session,
+            headers=merged,
+            timeout=(min(CONNECT_TIMEOUT, timeout), timeout),
+            allowed_hosts=_ALLOWED_HOSTS,
+            require_https=True,
+            **kwargs,
+        )
+        _note_rate_limit(resp)
+        return resp
+
+    def graphql(
+        self, query: str, variables: Mapping[str, Any] | None = None, *, timeout=120
+    ) -> dict | None:
+        """Run a GraphQL query and return the decoded JSON body, or None."""
+        resp = self.request(
+            "POST",
+            "graphql",
+            json={"query": query, "variables": dict(variables or {})},
+            timeout=timeout,
+        )
+        if resp.status_code != 200:
+            return None
+        try:
+            return resp.json()
+        except ValueError:
+            return None
+
+    # -- gh argv transport --------------------------------------------------
+
+    def __call__(
+        self,
+        cmd_list: Sequence[str],
+        *,
+        env: Mapping[str, str] | None = None,
+        timeout: float = 120,
+    ) -> subprocess.CompletedProcess | None:
+        """Serve ``cmd_list`` in-process, or return None to let ``gh`` run it."""
+        if len(cmd_list) < 3 or cmd_list[0] != "gh":
+            return None
+        try:
+            if cmd_list[1] == "api":
+                return self._api(cmd_list, timeout)
+            if cmd_list[1] == "pr" and cmd_list[2] == "view":
+                return self._pr_view(cmd_list, timeout)
+            if cmd_list[1] == "pr" and cmd_list[2] == "diff":
+                return self._pr_diff(cmd_list, timeout)
+        except (OSError, ValueError) as exc:
+            # requests exceptions are OSErrors; UnsafeURLError is a ValueError.
+            return _completed(cmd_list, 1, stderr=f"{type(exc).__name__}: {exc}\n")
+        return None
+
+    def _api(self, cmd_list, timeout):
+        positionals, options = gh_cache.parse_api_args(cmd_list[2:])
+        flags = {flag for flag, _ in options}
+        if len(positionals) != 1 or flags - _SUPPORTED_API_FLAGS:
+            return None
+        endpoint = positionals[0]
+        fields = _api_fields(options)
+        if fields is None or "{" in endpoint or "://" in endpoint:
+            return None
+        headers = {}
+        method = None
+        for flag, value in options:
+            if flag in ("-H", "--header"):
+                name, _, header_value = value.partition(":")
+                headers[name.strip()] = header_value.strip()
+            elif flag in ("-X", "--method"):
+                method = value.upper()
+
+        if endpoint == "graphql":
+            query = fields.pop("query", None)
+            if not query:
+                return None
+            resp = self.request(
+                method or "POST",
+                "graphql",
+                headers=headers,
+                json={"query": query, "variables": fields},
+                timeout=timeout,
+            )
+        else:
+            method = method or ("POST" if fields else "GET")
+            payload = {"params": fields} if method == "GET" else {"json": fields}
+            resp = self.request(
+                method, endpoint, headers=headers, timeout=timeout, **payload
+            )
+
+        body = resp.text
+        ok = 200 <= resp.status_code < 300
+        if ok and endpoint == "graphql":
+            # ``gh api graphql`` exits non-zero whenever ``errors`` is present.
+            try:
+                ok = not json.loads(body).get("errors")
+            except (ValueError, AttributeError):
+                ok = False
+        if flags & {"-i", "--include"}:
+            header_lines = "".join(f"{k}: {v}\r\n" for k, v in resp.headers.items())
+            body = (
+                f"HTTP/1.1 {resp.status_code} {resp.reason}\r\n{header_lines}\r\n{body}"
+            )
+        stderr = "" if ok else f"gh: HTTP {resp.status_code}\n"
+        return _completed(cmd_list, 0 if ok else 1, body, stderr)
+
+    def _pr_view(self, cmd_list, timeout):
+        args = _pr_args(cmd_list[3:], frozenset({"-R", "--repo", "--json"}))
+        if not args or "json" not in args:
+            return None
+        names = [name.strip() for name in args["json"].split(",") if name.strip()]
+        if not names or any(name not in _PR_VIEW_FIELDS for name in names):
+            return None
+        ref = args["ref"]
+        selection = " ".join(_PR_VIEW_FIELDS[name] for name in names)
+        result = self.graphql(
+            "query ($owner: String!, $name: String!, $number: Int!) { "
+            "repository(owner: $owner, name: $name) { "
+            f"pullRequest(number: $number) {{ {selection} }} }} }}",
+            {"owner": ref.owner, "name": ref.name, "number": ref.number},
+            timeout=timeout,
+        )
+        data = result.get("data") if isinstance(result, dict) else None
+        repo = data.get("repository") if isinstance(data, dict) else None
+        pr = repo.get("pullRequest") if isinstance(repo, dict) else None
+        if not isinstance(pr, dict):
+            return _completed(cmd_list, 1, stderr=f"could not resolve {ref.full}\n")
+        if isinstance(pr.get("files"), dict):
+            pr["files"] = pr["files"].get("nodes") or []
+        return _completed(cmd_list, 0, json.dumps(pr))
+
+    def _pr_diff(self, cmd_list, timeout):
+        args = _pr_args(cmd_list[3:], frozenset({"-R", "--repo"}))
+        if not args:
+            return None
+        ref = args["ref"]
+        resp = self.request(
+            "GET",
+            f"repos/{ref.owner}/{ref.name}/pulls/{ref.number}",
+            headers={"Accept": "application/vnd.github.diff"},
+            timeout=timeout,
+        )
+        if resp.status_code != 200:
+            return _completed(cmd_list, 1, stderr=f"gh: HTTP {resp.status_code}\n")
+        return _completed(cmd_list, 0, resp.text)
+
+    def stream_diff(
+        self, ref: PRReference, max_bytes: int, *, timeout: float = 120
+    ) -> tuple[bytes, bool] | None:
+        """Up to ``max_bytes`` of the PR's diff and whether it was cut short."""
+        resp = self.request(
+            "GET",
+            f"repos/{ref.owner}/{ref.name}/pulls/{ref.number}",
+            headers={"Accept": "application/vnd.github.diff"},
+            timeout=timeout,
+            stream=True,
+        )
+        try:
+            if resp.status_code != 200:
+                return None
+            data = bytearray()
+            for chunk in resp.iter_content(DIFF_CHUNK_SIZE):
+                data += chunk
+                if len(data) > max_bytes:
+                    return bytes(data[:max_bytes]), True
+            return bytes(data), False
+        finally:
+            resp.close()
+
+
+_active: GitHubClient | None = None
+
+
+def active_client() -> GitHubClient | None:
+    """The client installed by :func:`enable`, if any."""
+    return _active
+
+
+def enable(env: Mapping[str, str] | None = None) -> GitHubClient | None:
+    """Route supported ``gh`` calls through a pooled in-process client.
+
+    Returns None (and leaves ``gh`` subprocesses in charge) when disabled via
+    ``GH_CLIENT=subprocess``, when targeting a GitHub Enterprise host, when no
+    ``GH_TOKEN`` is available, or when ``requests`` is not installed.
+    """
+    global _active
+    source = os.environ if env is None else env
+    if source.get("GH_CLIENT", "").strip().lower() == "subprocess":
+        return None
+    if source.get("GH_HOST", "github.com") != "github.com":
+        return None
+    token = load_gh_token_env(source).get("GH_TOKEN")
+    if not token:
+        return None
+    try:
+        client = GitHubClient(token)
+    except ImportError:
+        return None
+    gh_cache.set_transport(client)
+    _active = client
+    return client
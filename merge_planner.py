@@ -0,0 +1,131 @@
+"""Conflict-aware merge planning for ``run_merges``.
+
+Merging a PR often turns PRs touching the same files ``DIRTY``. Instead of
+merging the queue one PR at a time (with a fixed sleep and a fresh ``gh``
+lookup after each), the planner builds a conflict graph from each PR's
+changed paths and splits the queue into waves:
+
+- PRs in one wave share no paths, so they are merged concurrently;
+- a PR lands in the wave after its last higher-priority neighbour, so
+  overlapping PRs keep the queue's order;
+- after a merge only its neighbours are flagged, and only flagged PRs have
+  their merge state re-checked before their own wave.
+
+PRs only conflict within a repository (``group`` maps a key to its repo).
+"""
+
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Hashable, Iterable, Mapping, Sequence, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+CONFLICTING_STATES = frozenset({"DIRTY", "CONFLICTING"})
+
+_DIFF_HEADER = re.compile(r"^diff --git a/(.+?) b/(.+)$", re.MULTILINE)
+
+
+def diff_paths(diff: str) -> set[str]:
+    """Paths touched by a unified diff (both sides of renames)."""
+    paths = set()
+    for old, new in _DIFF_HEADER.findall(diff or ""):
+        paths.add(old)
+        paths.add(new)
+    return paths
+
+
+def conflict_graph(
+    files: Mapping[K, Iterable[str]], group: Callable[[K], Hashable]
+) -> dict[K, set[K]]:
+    """PRs sharing at least one path in the same ``group``, via a path index."""
+    by_path: dict[tuple, list[K]] = defaultdict(list)
+    for key, paths in files.items():
+        for path in set(paths):
+            by_path[(group(key), path)].append(key)
+    graph: dict[K, set[K]] = {key: set() for key in files}
+    for keys in by_path.values():
+        for key in keys:
+            graph[key].update(k for k in keys if k != key)
+    return graph
+
+
+@dataclass
+class MergePlan:
+    """Waves of mutually independent PRs, in queue priority order."""
+
+    waves: list[list]
+    graph: dict
+    blockers: dict  # key -> higher-priority neighbours it waits for
+
+    def describe(self, label: Callable[[Hashable], str] = str) -> list[str]:
+        lines = []
+        for number, wave in enumerate(self.waves, 1):
+            lines.append(f"Wave {number} ({len(wave)} concurrent):")
+            for key in wave:
+                after = sorted(label(b) for b in self.blockers.get(key, ()))
+                suffix = f"  [after {', '.join(after)}]" if after else ""
+                lines.append(f"  - {label(key)}{suffix}")
+        return lines
+
+
+def plan_merges(
+    order: Sequence[K],
+    files: Mapping[K, Iterable[str]],
+    group: Callable[[K], Hashable],
+) -> MergePlan:
+    """Layer ``order`` so overlapping PRs merge one after another.
+
+    A PR goes in the wave after its latest higher-priority neighbour (wave
+    0 if it has none), which is the earliest wave that keeps queue order.
+    """
+    graph = conflict_graph({key: files.get(key, ()) for key in order}, group)
+    wave_of: dict[K, int] = {}
+    blockers: dict[K, list[K]] = {}
+    for key in order:
+        earlier = [n for n in graph[key] if n in wave_of]
+        wave_of[key] = 1 + max((wave_of[n] for n in earlier), default=-1)
+        if earlier:
+            blockers[key] = earlier
+    depth = max(wave_of.values(), default=-1) + 1
+    waves: list[list[K]] = [[] for _ in range(depth)]
+    for key in order:
+        waves[wave_of[key]].append(key)
+    return MergePlan(waves, graph, blockers)
+
+
+def execute_plan(
+    plan: MergePlan,
+    merge: Callable[[K], str | None],
+    recheck: Callable[[list[K]], Mapping[K, str | None]],
+    run_wave: Callable[[Callable, list], Iterable] = map,
+) -> dict[K, tuple[str, str | None]]:
+    """Merge wave by wave; returns ``{key: (outcome, detail)}``.
+
+    ``merge(key)`` returns None on success or an error message.
+    ``recheck(keys)`` returns fresh ``mergeStateStatus`` values and is only
+    called for PRs whose neighbours merged since the plan was made.
+    ``run_wave(fn, keys)`` maps ``merge`` over a wave, e.g. an executor's
+    ``map`` for concurrent merges.
+    """
+    outcomes: dict[K, tuple[str, str | None]] = {}
+    affected: set[K] = set()
+    for wave in plan.waves:
+        stale = [key for key in wave if key in affected]
+        states = recheck(stale) if stale else {}
+        ready = []
+        for key in wave:
+            state = states.get(key)
+            if state in CONFLICTING_STATES:
+                outcomes[key] = ("conflicting", state)
+            else:
+                ready.append(key)
+        for key, error in zip(ready, run_wave(merge, ready)):
+            if error is None:
+                outcomes[key] = ("merged", None)
+                affected.update(plan.graph[key])
+            else:
+                outcomes[key] = ("failed", error)
+    return outcomes
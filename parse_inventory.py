@@ -1,18 +1,17 @@
-import json
 import re
-import subprocess
 import sys
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
-from gh_token_env import load_gh_token_env
-from pr_reference import parse_pr_reference, parse_repo_name
+import gh_cache
+import github_client
+from pr_markdown import HEADING, TABLE_ROW, tokenize
+from pr_reference import PRReference, parse_pr_reference, parse_repo_name
+from pr_store import PRStore, ci_rollup, default_store_path, ensure_fields
 
 
 def run_gh(repo, pr):
     """Call ``gh pr view`` and return JSON, or None on failure/timeout."""
-    env = load_gh_token_env()
     cmd = [
         "gh",
         "pr",
@@ -23,48 +22,32 @@ def run_gh(repo, pr):
         "--json",
         "files,updatedAt,mergeStateStatus",
     ]
-    try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            env=env,
-            timeout=120,
-            check=False,
-        )
-    except subprocess.TimeoutExpired:
-        print(f"gh pr view timed out for {repo}#{pr}", file=sys.stderr)
-        return None
-    if result.returncode != 0:
-        return None
-    try:
-        return json.loads(result.stdout)
-    except json.JSONDecodeError:
-        return None
-
-
-def _should_skip_table_row(line):
-    if not line or line[0] != "|":
-        return True
-    return line.startswith(("| # |", "| ---"))
+    return gh_cache.run_json(cmd)
 
 
 _REPO_LINK_PATTERN = re.compile(r"\[(.*?)\]\(.*?\)")
 
 
-def _parse_repo_name(line):
-    if line.startswith("### "):
-        match = _REPO_LINK_PATTERN.search(line)
+def _repo_from_heading(level, title):
+    if level == 3:
+        match = _REPO_LINK_PATTERN.search(title)
         if match:
             return parse_repo_name(
                 match.group(1).strip(), loc=("tasks/pr-inventory.md", None)
             )
         return None
-    if line.startswith("## "):
-        return parse_repo_name(line[3:].strip(), loc=("tasks/pr-inventory.md", None))
+    if level == 2:
+        return parse_repo_name(title, loc=("tasks/pr-inventory.md", None))
     return None
 
 
+def _parse_repo_name(line):
+    token = next(tokenize([line]), None)
+    if token is None or token.kind != HEADING:
+        return None
+    return _repo_from_heading(token.level, token.text)
+
+
 def _is_valid_pr_row(author, hints):
     return author.endswith("[bot]") or hints
 
@@ -80,8 +63,7 @@ def _extract_pr_row_fields(parts):
     )
 
 
-def _parse_row_record(line, current_repo, line_number):
-    parts = line.split("|", 10)
+def _parse_row_record(parts, current_repo, line_number):
     if len(parts) <= 9:
         return None
     repo_col, pr_id, author, checks, hints = _extract_pr_row_fields(parts)
@@ -103,30 +85,25 @@ def _parse_row_record(line, current_repo, line_number):
     return ref.repo, {"pr": str(ref.number), "checks": checks}
 
 
-def _process_inventory_line(line, current_repo, repos, line_number):
-    repo_name = _parse_repo_name(line)
-    if repo_name:
-        # ⚡ Bolt Optimization: Using defaultdict allows us to initialize empty buckets simply by accessing the key
-        _ = repos[repo_name]
-        return repo_name
-
-    if _should_skip_table_row(line):
-        return current_repo
-
-    row_record = _parse_row_record(line, current_repo, line_number)
-    if row_record:
-        effective_repo, payload = row_record
-        # ⚡ Bolt Optimization: defaultdict(list) eliminates repetitive key-check overhead
-        repos[effective_repo].append(payload)
-
-    return current_repo
-
-
 def parse_inventory_lines(lines, *, source="tasks/pr-inventory.md"):
+    """Group inventory table rows by repo in one pass over the tokens."""
     repos = defaultdict(list)
     current_repo = None
-    for line_number, line in enumerate(lines, start=1):
-        current_repo = _process_inventory_line(line, current_repo, repos, line_number)
+    for token in tokenize(lines):
+        if token.kind == HEADING:
+            repo_name = _repo_from_heading(token.level, token.text)
+            if repo_name:
+                # ⚡ Bolt Optimization: Using defaultdict allows us to initialize empty buckets simply by accessing the key
+                _ = repos[repo_name]
+                current_repo = repo_name
+            continue
+        if token.kind != TABLE_ROW or token.text.startswith("| # |"):
+            continue
+        row_record = _parse_row_record(token.cells, current_repo, token.line_number)
+        if row_record:
+            effective_repo, payload = row_record
+            # ⚡ Bolt Optimization: defaultdict(list) eliminates repetitive key-check overhead
+            repos[effective_repo].append(payload)
     return repos
 
 
@@ -169,21 +146,47 @@ def _get_pr_category(info, checks, now=None):
     return None
 
 
-def _categorize_pr_task(args):
-    repo, pr_info, now = args
-    pr = pr_info["pr"]
-    checks = pr_info["checks"]
-    print(f"Checking {repo}#{pr}")
+def inventory_from_store(store):
+    """Open PRs in the store, shaped like :func:`parse_inventory_lines` output.
+
+    ``checks`` is left as None so it is derived from the fresh merge state.
+    """
+    repos = defaultdict(list)
+    for pr in store.open_prs():
+        repos[pr["repo"]].append({"pr": str(pr["number"]), "checks": None})
+    return repos
 
-    info = run_gh(repo, pr)
+
+def _fetch_one(store, ref):
+    """Per-PR ``gh pr view`` fallback for PRs the batched lookup missed."""
+    info = run_gh(ref.repo, ref.number)
     if not info:
-        print(f"Failed to fetch {repo}#{pr}")
         return None
-
-    category = _get_pr_category(info, checks, now)
-    if category:
-        return category, f"{repo}#{pr}"
-    return None
+    for group in ("merge", "files"):
+        store.put_fields(ref.repo, ref.number, group, info)
+    return info
+
+
+def triage_prs(store, repos, now=None):
+    """Categorise inventory PRs using the store's merge and files field groups."""
+    checks_by_ref = {
+        PRReference.from_parts(repo, pr_info["pr"]): pr_info["checks"]
+        for repo, prs in repos.items()
+        for pr_info in prs
+    }
+    infos = ensure_fields(store, checks_by_ref, ("merge", "files"), gh_cache.run_json)
+    triage = {"SUPERSEDED": [], "STALE": [], "CONFLICTING": [], "READY": []}
+    for ref, checks in checks_by_ref.items():
+        info = infos.get(ref) or _fetch_one(store, ref)
+        if not info:
+            print(f"Failed to fetch {ref.full}")
+            continue
+        if checks is None:
+            checks = ci_rollup(info.get("mergeStateStatus"))
+        category = _get_pr_category(info, checks, now)
+        if category:
+            triage[category].append(ref.full)
+    return triage
 
 
 def _load_inventory_lines(filepath):
@@ -207,20 +210,21 @@ def _write_triage_report(filepath, triage):
 
 
 def main():
-    lines = _load_inventory_lines("tasks/pr-inventory.md")
-    repos = parse_inventory_lines(lines)
-    if not repos:
-        return
-    triage = {"SUPERSEDED": [], "STALE": [], "CONFLICTING": [], "READY": []}
-
-    now = datetime.now(timezone.utc)
-    tasks = [(repo, pr_info, now) for repo, prs in repos.items() for pr_info in prs]
-
-    with ThreadPoolExecutor(max_workers=min(len(tasks) or 1, 32)) as executor:
-        for result in executor.map(_categorize_pr_task, tasks):
-            if result:
-                category, pr_str = result
-                triage[category].append(pr_str)
+    gh_cache.configure(sys.argv[1:])
+    github_client.enable()
+    with PRStore(default_store_path()) as store:
+        repos = inventory_from_store(store)
+        if not repos:
+            # No synced store yet: fall back to the hand-maintained inventory.
+            lines = _load_inventory_lines("tasks/pr-inventory.md")
+            repos = parse_inventory_lines(lines)
+        if not repos:
+            return
+        triage = triage_prs(store, repos, datetime.now(timezone.utc))
+        store.set_labels(
+            "triage",
+            {pr: category for category, prs in triage.items() for pr in prs},
+        )
 
     _write_triage_report("tasks/pr-triage.md", triage)
     print("Done")
@@ -0,0 +1,163 @@
+"""Shared keyword classification of PR titles, branches and bodies.
+
+The inventory/ready categorisers and ``get_prs_summarize``'s automation
+hints each kept their own keyword tuples and loops. They now share the
+vocabularies below and :data:`PR_CLASSIFIER`; :func:`classify_prs` labels
+a whole PR history for reporting.
+
+Substring checks are deliberate. A single compiled alternation (and a
+trie-factored one) was measured against them on 100k PRs: with a few dozen
+short keywords, ``re`` stepping through every offset loses to ``str``'s C
+substring search with first-hit exit by 2-4x. See
+``tests/benchmarks/benchmark_pr_classifier.py``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Mapping, Sequence
+
+# Vocabulary name -> ((label, keywords), ...) in priority order; matching is
+# on the lowercased text, as the ``in`` checks it replaces were.
+Vocabulary = Sequence[tuple[str, Sequence[str]]]
+
+INVENTORY_CATEGORIES: Vocabulary = (
+    ("SECURITY", ("sentinel", "security", "injection", "cwe", "ssrf", "tls")),
+    ("PERFORMANCE", ("bolt", "perf", "optimize")),
+    ("UI", ("palette", "ux", "ui")),
+    ("CI/INFRA", ("qa", "test", "ci", "infra", "action")),
+    ("REFACTOR", ("refactor", "import", "clean")),
+)
+
+READY_CATEGORIES: Vocabulary = (
+    ("SECURITY", ("sentinel", "security", "cve", "xxe")),
+    ("DEPENDENCY", ("dependabot", "renovate")),
+    ("CI/INFRA", ("chore", "ci", "automation", "action", "trunk")),
+)
+
+BRANCH_SIGNALS = (
+    "jules",
+    "sentinel",
+    "bolt/",
+    "palette/",
+    "automation-",
+    "daily-qa",
+    "chore/jules",
+    "cursor-agent/",
+    "renovate/",
+    "dependabot/",
+    "renovate",
+    "copilot",
+)
+
+TITLE_KEYWORDS = (
+    "jules",
+    "sentinel",
+    "dependabot",
+    "renovate",
+    "autofix",
+    "bolt",
+    "palette",
+    "automation",
+)
+
+BODY_MARKERS = (
+    "jules.google.com",
+    "created automatically by jules",
+    "pull request was automatically",
+    "signed-off-by: dependabot",
+)
+
+
+class KeywordClassifier:
+    """Several prioritised keyword vocabularies behind one lookup API.
+
+    Each vocabulary is flattened once into ``(keyword, label)`` pairs in
+    priority order, so the first substring hit is the answer; callers
+    lowercase each field once and query as many vocabularies as they need.
+    """
+
+    def __init__(self, vocabularies: Mapping[str, Vocabulary]) -> None:
+        self._tables = {
+            name: tuple(
+                (keyword.lower(), label)
+                for label, keywords in groups
+                for keyword in keywords
+            )
+            for name, groups in vocabularies.items()
+        }
+        self.vocabularies = tuple(self._tables)
+
+    def label(
+        self,
+        text: str,
+        vocabulary: str,
+        default: str | None = None,
+        *,
+        lowered: bool = False,
+    ) -> str | None:
+        """Highest-priority label of ``vocabulary`` found in ``text``."""
+        if not lowered:
+            text = text.lower()
+        for keyword, label in self._tables[vocabulary]:
+            if keyword in text:
+                return label
+        return default
+
+    def classify(
+        self, text: str, vocabularies: Iterable[str] | None = None
+    ) -> dict[str, str]:
+        """``{vocabulary: label}`` for each vocabulary with a hit in ``text``."""
+        text = text.lower()
+        labels = {}
+        for name in self.vocabularies if vocabularies is None else vocabularies:
+            label = self.label(text, name, lowered=True)
+            if label is not None:
+                labels[name] = label
+        return labels
+
+
+def _each_keyword(keywords: Iterable[str]) -> Vocabulary:
+    return tuple((keyword.rstrip("/"), (keyword,)) for keyword in keywords)
+
+
+PR_CLASSIFIER = KeywordClassifier(
+    {
+        "inventory": INVENTORY_CATEGORIES,
+        "ready": READY_CATEGORIES,
+        "branch": _each_keyword(BRANCH_SIGNALS),
+        "title": _each_keyword(TITLE_KEYWORDS),
+        "body": (("automation_marker", BODY_MARKERS),),
+    }
+)
+
+
+def classify_prs(prs: Iterable[Mapping[str, Any]]) -> list[dict[str, str | None]]:
+    """Category and automation-hint labels of each PR (``gh`` JSON shape).
+
+    The inventory category is matched on title + branch joined, as
+    ``scratch_inventory`` always has; every field is lowercased once.
+    """
+    label = PR_CLASSIFIER.label
+    labels = []
+    for pr in prs:
+        title = (pr.get("title") or "").lower()
+        branch = (pr.get("headRefName") or "").lower()
+        body = (pr.get("body") or "").lower()
+        labels.append(
+            {
+                "inventory": label(
+                    title + branch, "inventory", "FEATURE", lowered=True
+                ),
+                "ready": label(
+                    title, "ready", "PERFORMANCE/REFACTOR/UI/FEATURE", lowered=True
+                ),
+                "title": label(title, "title", lowered=True),
+                "branch": label(branch, "branch", lowered=True),
+                "body": label(body, "body", lowered=True),
+            }
+        )
+    return labels
+
+
+def classify_pr(pr: Mapping[str, Any]) -> dict[str, str | None]:
+    return classify_prs([pr])[0]
@@ -0,0 +1,253 @@
+"""Streamed, size-capped PR diffs cached by head commit.
+
+``gh pr diff`` buffers the whole diff, and some bot PRs (lockfile bumps,
+vendored assets) produce several MB that ``run_merges`` only scans for a
+handful of patterns. :func:`fetch_diff` reads the diff in chunks and stops
+at ``max_bytes``, marking the result ``truncated`` so callers can refuse to
+auto-merge what they could not fully read. Diffs are stored on disk under
+the PR's head SHA: a PR whose head has not moved is never downloaded again.
+Every push leaves a new entry behind, so entries unused for a week are
+pruned.
+
+:func:`diff_stats` summarises a PR from its ``files`` connection (paths,
+additions, deletions) when no diff body is needed at all.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+import gh_cache
+import github_client
+from adaptive_executor import note_gh_result
+from pr_reference import PRReference
+
+DEFAULT_MAX_BYTES = 512 * 1024
+DEFAULT_CACHE_MAX_AGE = 7 * 86400
+CHUNK_SIZE = github_client.DIFF_CHUNK_SIZE
+
+
+@dataclass(frozen=True, slots=True)
+class Diff:
+    text: str
+    truncated: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class DiffStats:
+    files: int
+    additions: int
+    deletions: int
+
+    def __str__(self) -> str:
+        return f"{self.files} files, +{self.additions} -{self.deletions}"
+
+
+def diff_stats(files: Iterable[Mapping[str, Any]]) -> DiffStats:
+    """Totals of a PR's ``files`` nodes (``path additions deletions``)."""
+    count = additions = deletions = 0
+    for node in files:
+        count += 1
+        additions += node.get("additions") or 0
+        deletions += node.get("deletions") or 0
+    return DiffStats(count, additions, deletions)
+
+
+def max_bytes_from_env(env: Mapping[str, str] | None = None) -> int:
+    raw = (os.environ if env is None else env).get("GH_DIFF_MAX_BYTES", "")
+    try:
+        value = int(raw)
+    except ValueError:
+        return DEFAULT_MAX_BYTES
+    return value if value > 0 else DEFAULT_MAX_BYTES
+
+
+def read_capped(chunks: Iterable[bytes], max_bytes: int) -> tuple[bytes, bool]:
+    """Join ``chunks`` up to ``max_bytes``; True if anything was left unread."""
+    parts = []
+    size = 0
+    for chunk in chunks:
+        if size + len(chunk) > max_bytes:
+            parts.append(chunk[: max_bytes - size])
+            return b"".join(parts), True
+        parts.append(chunk)
+        size += len(chunk)
+    return b"".join(parts), False
+
+
+def _decode(data: bytes) -> str:
+    # A cap can split a multi-byte character.
+    return data.decode("utf-8", errors="replace")
+
+
+class DiffCache:
+    """Directory of ``{diff, truncated, max_bytes}`` entries keyed by head SHA.
+
+    Reads refresh an entry's mtime; the first :meth:`put` of each instance
+    deletes entries unused for ``max_age`` seconds.
+    """
+
+    def __init__(
+        self, cache_dir: Path | str, max_age: float = DEFAULT_CACHE_MAX_AGE
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_age = max_age
+        self._pruned = False
+
+    def _path(self, ref: PRReference, head_sha: str) -> Path:
+        key = hashlib.sha256(f"{ref.full}@{head_sha}".encode()).hexdigest()
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, ref: PRReference, head_sha: str, max_bytes: int) -> Diff | None:
+        try:
+            path = self._path(ref, head_sha)
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or not isinstance(entry.get("diff"), str):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        text = entry["diff"]
+        if len(text.encode("utf-8")) > max_bytes:
+            data, _ = read_capped([text.encode("utf-8")], max_bytes)
+            return Diff(_decode(data), True)
+        # A diff cut at a smaller cap than we now allow must be re-fetched.
+        if entry.get("truncated") and entry.get("max_bytes", 0) < max_bytes:
+            return None
+        return Diff(text, bool(entry.get("truncated")))
+
+    def put(
+        self, ref: PRReference, head_sha: str, diff: Diff, max_bytes: int
+    ) -> None:
+        entry = {
+            "diff": diff.text,
+            "truncated": diff.truncated,
+            "max_bytes": max_bytes,
+        }
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.chmod(tmp, 0o600)
+            os.replace(tmp, self._path(ref, head_sha))
+        except OSError:
+            # A cache that cannot be written must never fail the lookup.
+            pass
+        if not self._pruned:
+            self._pruned = True
+            self.prune()
+
+    def prune(self, now: float | None = None) -> int:
+        """Delete entries (and stray temp files) unused for ``max_age`` seconds."""
+        cutoff = (time.time() if now is None else now) - self.max_age
+        try:
+            paths = list(self.cache_dir.iterdir())
+        except OSError:
+            return 0
+        removed = 0
+        for path in paths:
+            if path.suffix not in (".json", ".tmp"):
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+
+def default_diff_cache() -> DiffCache:
+    return DiffCache(gh_cache.default_cache_dir() / "diffs")
+
+
+def _stream_gh_diff(
+    ref: PRReference, max_bytes: int, env: Mapping[str, str] | None, timeout: float
+) -> Diff | None:
+    """Read ``gh pr diff`` stdout in chunks, killing ``gh`` at the cap."""
+    argv = ["gh", "pr", "diff", str(ref.number), "-R", ref.repo]
+    try:
+        proc = subprocess.Popen(
+            argv,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=dict(env) if env is not None else None,
+        )
+    except OSError:
+        return None
+    timer = threading.Timer(timeout, proc.kill)
+    timer.daemon = True
+    timer.start()
+    # Drain stderr concurrently: a chatty ``gh`` could otherwise fill that
+    # pipe and block while we are still waiting on stdout.
+    stderr_chunks: list[bytes] = []
+    drain = threading.Thread(
+        target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True
+    )
+    drain.start()
+    try:
+        data, truncated = read_capped(
+            iter(lambda: proc.stdout.read(CHUNK_SIZE), b""), max_bytes
+        )
+        if truncated:
+            proc.kill()
+        returncode = proc.wait()
+        drain.join()
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+        proc.stderr.close()
+    if truncated:
+        return Diff(_decode(data), True)
+    stderr = _decode(b"".join(stderr_chunks))
+    note_gh_result(subprocess.CompletedProcess(argv, returncode, "", stderr))
+    if returncode != 0:
+        return None
+    return Diff(_decode(data))
+
+
+def fetch_diff(
+    ref: PRReference,
+    head_sha: str | None = None,
+    *,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    cache: DiffCache | None = None,
+    env: Mapping[str, str] | None = None,
+    timeout: float = 120,
+) -> Diff | None:
+    """The PR's diff, at most ``max_bytes`` of it; None if it could not be read.
+
+    With a ``head_sha`` the diff is served from and written to ``cache``.
+    """
+    if cache is not None and head_sha:
+        cached = cache.get(ref, head_sha, max_bytes)
+        if cached is not None:
+            return cached
+    diff = None
+    client = github_client.active_client()
+    if client is not None:
+        try:
+            streamed = client.stream_diff(ref, max_bytes, timeout=timeout)
+        except (OSError, ValueError):
+            streamed = None
+        if streamed is not None:
+            data, truncated = streamed
+            diff = Diff(_decode(data), truncated)
+    if diff is None:
+        diff = _stream_gh_diff(ref, max_bytes, env, timeout)
+    if diff is not None and cache is not None and head_sha:
+        cache.put(ref, head_sha, diff, max_bytes)
+    return diff
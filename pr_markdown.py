@@ -0,0 +1,159 @@
+"""Single-pass tokenizer and section index for the PR markdown reports.
+
+``tasks/pr-inventory.md`` and ``tasks/pr-triage.md`` are plain markdown that
+the triage scripts used to re-scan with substring searches (``pr in
+prefix_text`` once per PR, quadratic after a bot storm). Here each line is
+classified once into a :class:`Token`, and :class:`MarkdownIndex` records
+every ``##`` section's line span and the ``- owner/name#N`` items in it, so
+membership checks are set lookups and one section can be replaced while
+the rest of a hand-edited report is left byte-for-byte intact.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+HEADING = "heading"
+TABLE_ROW = "row"
+TABLE_RULE = "rule"
+ITEM = "item"
+TEXT = "text"
+
+_TABLE_RULE_CELL = re.compile(r"^\s*:?-+:?\s*$")
+_PR_REF = re.compile(r"[\w.-]+/[\w.-]+#\d+")
+
+
+@dataclass(frozen=True, slots=True)
+class Token:
+    kind: str
+    line_number: int
+    text: str
+    level: int = 0
+    cells: tuple[str, ...] = ()
+
+
+def tokenize(lines: Iterable[str]) -> Iterator[Token]:
+    """Classify each line once: heading, table row/rule, list item or text.
+
+    ``text`` has the line ending stripped; headings carry their ``#`` level
+    and title, table rows their raw ``|``-split cells.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        text = line.rstrip("\r\n")
+        first = text[:1]
+        if first == "#":
+            level = len(text) - len(text.lstrip("#"))
+            if text[level : level + 1] == " ":
+                yield Token(HEADING, line_number, text[level + 1 :].strip(), level)
+                continue
+        elif first == "|":
+            cells = tuple(text.split("|"))
+            inner = cells[1:-1] if len(cells) > 2 else cells[1:]
+            kind = (
+                TABLE_RULE
+                if inner and all(_TABLE_RULE_CELL.match(c) for c in inner)
+                else TABLE_ROW
+            )
+            yield Token(kind, line_number, text, cells=cells)
+            continue
+        elif text.startswith("- "):
+            yield Token(ITEM, line_number, text[2:].strip())
+            continue
+        yield Token(TEXT, line_number, text)
+
+
+@dataclass
+class Section:
+    """A ``##`` section: heading line index and end (exclusive) in ``lines``."""
+
+    title: str
+    start: int
+    end: int
+    refs: list[str] = field(default_factory=list)
+
+
+class MarkdownIndex:
+    """Sections and PR-reference items of a markdown report, indexed once.
+
+    Only level-2 headings open sections; deeper headings stay inside them.
+    Lines before the first ``##`` heading belong to the untitled preamble.
+    """
+
+    def __init__(self, lines: Iterable[str], *, section_level: int = 2) -> None:
+        self.lines = [line if line.endswith("\n") else line + "\n" for line in lines]
+        self.section_level = section_level
+        self._reindex()
+
+    @classmethod
+    def from_text(cls, text: str, **kwargs) -> "MarkdownIndex":
+        return cls(text.splitlines(keepends=True), **kwargs)
+
+    def _reindex(self) -> None:
+        self.sections: list[Section] = []
+        self._by_title: dict[str, Section] = {}
+        self._first_seen: dict[str, int] = {}
+        current = Section("", 0, len(self.lines))
+        for token in tokenize(self.lines):
+            index = token.line_number - 1
+            if token.kind == HEADING and token.level == self.section_level:
+                current.end = index
+                self.sections.append(current)
+                current = Section(token.text, index, len(self.lines))
+                self._by_title.setdefault(token.text, current)
+            elif token.kind == ITEM and _PR_REF.fullmatch(token.text):
+                current.refs.append(token.text)
+                self._first_seen.setdefault(token.text, len(self.sections))
+        current.end = len(self.lines)
+        self.sections.append(current)
+
+    def section(self, title: str) -> Section | None:
+        return self._by_title.get(title)
+
+    def refs(self, title: str | None = None) -> list[str]:
+        """PR refs listed in section ``title`` (every section if None), in order."""
+        if title is None:
+            return [ref for section in self.sections for ref in section.refs]
+        section = self._by_title.get(title)
+        return list(section.refs) if section else []
+
+    def refs_before(self, title: str) -> frozenset[str]:
+        """Refs that first appear before section ``title`` (all refs if absent)."""
+        target = self._by_title.get(title)
+        if target is None:
+            return frozenset(self._first_seen)
+        position = self.sections.index(target)
+        return frozenset(
+            ref for ref, seen in self._first_seen.items() if seen < position
+        )
+
+    def __contains__(self, ref: str) -> bool:
+        return ref in self._first_seen
+
+    def replace_section(
+        self, title: str, body: Iterable[str], *, before: str | None = None
+    ) -> None:
+        """Swap the body of ``title`` for ``body`` lines, leaving the rest as is.
+
+        A missing section is inserted ahead of section ``before`` if that
+        exists, otherwise appended at the end.
+        """
+        new_body = [line if line.endswith("\n") else line + "\n" for line in body]
+        section = self._by_title.get(title)
+        if section is not None:
+            # Keep the blank lines separating this section from the next.
+            tail = []
+            for line in reversed(self.lines[section.start + 1 : section.end]):
+                if line.strip():
+                    break
+                tail.append(line)
+            self.lines[section.start + 1 : section.end] = new_body + tail
+        else:
+            anchor = self._by_title.get(before) if before else None
+            at = anchor.start if anchor else len(self.lines)
+            self.lines[at:at] = [f"{'#' * self.section_level} {title}\n", *new_body]
+        self._reindex()
+
+    def text(self) -> str:
+        return "".join(self.lines)
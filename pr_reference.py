@@ -1,10 +1,19 @@
-"""Shared, strict PR reference parser/validator for PR automation scripts."""
+"""Shared, strict PR reference parser/validator for PR automation scripts.
+
+The triage scripts parse the same few hundred refs over and over (markdown
+rows, GraphQL responses, reports), so validation results are kept in
+bounded LRU caches keyed by the raw input, and parsed references are
+interned: equal refs from any parser are normally the same object, with
+``repo``, ``full`` and the hash computed once. Invalid input is never
+cached; it is re-validated (and reported) on every call.
+"""
 
 from __future__ import annotations
 
 import re
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any, Callable
 
 
@@ -20,6 +29,9 @@ _CONTROL_OR_SPACE_RE = re.compile(r"[\s\0-\x1f\x7f]")
 # Positive decimal integer (no sign, no leading zeros, no whitespace).
 _PR_NUMBER_RE = re.compile(r"^[1-9][0-9]*$")
 
+# Entries per cache; far above the number of open PRs across all repos.
+PARSE_CACHE_SIZE = 4096
+
 _PARSER_LABELS = {
     "_split_repo": "repo name",
     "_parse_pr_number": "PR number",
@@ -42,6 +54,7 @@ def _validate_component(value: str, kind: str, regex: re.Pattern) -> None:
         raise InvalidPrReferenceError(f"{kind} contains invalid characters: {value!r}")
 
 
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
 def _split_repo(repo: str) -> tuple[str, str]:
     """Split and validate an ``owner/name`` string."""
     repo = repo.strip()
@@ -58,9 +71,10 @@ def _split_repo(repo: str) -> tuple[str, str]:
     owner, name = repo.split("/", 1)
     _validate_component(owner, "owner", _OWNER_NAME_RE)
     _validate_component(name, "repo name", _OWNER_NAME_RE)
-    return owner, name
+    return sys.intern(owner), sys.intern(name)
 
 
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
 def _parse_pr_number(pr: str) -> int:
     """Validate and parse a positive decimal PR number."""
     pr = pr.strip()
@@ -90,35 +104,69 @@ def _run_parser(
 
 @dataclass(frozen=True, slots=True)
 class PRReference:
+    """A validated ``owner/name#number``; hashable, usable as a dict key.
+
+    Equality and hashing use ``owner``, ``name`` and ``number`` only.
+    """
+
     owner: str
     name: str
     number: int
+    repo: str = field(init=False, repr=False, compare=False)
+    full: str = field(init=False, repr=False, compare=False)
+    _hash: int = field(init=False, repr=False, compare=False)
 
-    @property
-    def repo(self) -> str:
-        return f"{self.owner}/{self.name}"
+    def __post_init__(self) -> None:
+        repo = sys.intern(f"{self.owner}/{self.name}")
+        object.__setattr__(self, "repo", repo)
+        object.__setattr__(self, "full", f"{repo}#{self.number}")
+        object.__setattr__(self, "_hash", hash((self.owner, self.name, self.number)))
 
-    @property
-    def full(self) -> str:
-        return f"{self.repo}#{self.number}"
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self) -> tuple:
+        # String hashes are per-process; never carry ``_hash`` across a pickle.
+        return _intern, (self.owner, self.name, self.number)
 
     @classmethod
     def from_parts(cls, repo: str, pr: str) -> "PRReference":
-        owner, name = _split_repo(repo)
-        number = _parse_pr_number(pr)
-        return cls(owner, name, number)
+        return _from_parts(repo, pr)
 
     @classmethod
     def from_string(cls, ref: str) -> "PRReference":
-        ref = ref.strip()
-        if not ref:
-            raise InvalidPrReferenceError("PR reference is empty")
-        if "#" not in ref:
-            raise InvalidPrReferenceError(
-                f"PR reference must be owner/name#number: {ref!r}"
-            )
-        repo, _, pr = ref.partition("#")
-        return cls.from_parts(repo, pr)
+        return _from_string(ref)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _intern(owner: str, name: str, number: int) -> PRReference:
+    """The canonical reference for these parts (until evicted)."""
+    return PRReference(owner, name, number)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _from_parts(repo: str, pr: str) -> PRReference:
+    owner, name = _split_repo(repo)
+    return _intern(owner, name, _parse_pr_number(pr))
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _from_string(ref: str) -> PRReference:
+    ref = ref.strip()
+    if not ref:
+        raise InvalidPrReferenceError("PR reference is empty")
+    if "#" not in ref:
+        raise InvalidPrReferenceError(
+            f"PR reference must be owner/name#number: {ref!r}"
+        )
+    repo, _, pr = ref.partition("#")
+    return _from_parts(repo, pr)
+
+
+def clear_parse_caches() -> None:
+    """Drop every cached parse and interned reference."""
+    for cached in (_split_repo, _parse_pr_number, _intern, _from_parts, _from_string):
+        cached.cache_clear()
 
 
 def parse_repo_name(
@@ -146,4 +194,4 @@ def parse_pr_reference(
     number = _run_parser(_parse_pr_number, pr, loc=loc, strict=strict)
     if number is None:
         return None
-    return PRReference(owner_name[0], owner_name[1], number)
+    return _intern(owner_name[0], owner_name[1], number)
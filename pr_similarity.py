@@ -0,0 +1,182 @@
+"""Near-duplicate PR detection with MinHash signatures and LSH banding.
+
+Exact file-set matching misses bot PRs that touch the same code with small
+differences, and comparing every pair of diffs is quadratic. Instead each PR
+is reduced to a set of shingles (changed paths plus normalised changed diff
+lines), summarised by a fixed-size MinHash signature, and bucketed by LSH
+bands so only PRs sharing a band are ever compared. Candidates are confirmed
+with the exact Jaccard similarity of their shingle sets and merged into
+clusters with union-find, giving near-linear time in the number of PRs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+from collections import defaultdict
+from typing import Hashable, Iterable, Mapping, Sequence
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 128
+# Changed lines beyond this per PR (lockfiles, generated code) add cost but
+# no signal; paths are always kept.
+MAX_DIFF_LINES = 5000
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 64) - 1
+
+
+def _hash64(token: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def _normalise_line(line: str) -> str:
+    return " ".join(line.split())
+
+
+def pr_shingles(files: Iterable[str], diff: str | None = None) -> set[str]:
+    """Tokens describing a PR: its changed paths and changed diff lines.
+
+    Diff lines are keyed by file and sign and whitespace-normalised, so PRs
+    making the same edit with different indentation or hunk offsets match.
+    """
+    shingles = {f"path:{path}" for path in files}
+    if not diff:
+        return shingles
+    current = ""
+    seen_lines = 0
+    for line in diff.splitlines():
+        if line.startswith(("--- a/", "+++ b/")):
+            current = line[6:]
+            continue
+        if line.startswith(("--- ", "+++ ", "diff --git ", "@@")):
+            continue
+        if line[:1] not in ("+", "-"):
+            continue
+        text = _normalise_line(line[1:])
+        if not text:
+            continue
+        shingles.add(f"{line[0]}{current}\0{text}")
+        seen_lines += 1
+        if seen_lines >= MAX_DIFF_LINES:
+            break
+    return shingles
+
+
+def jaccard(a: set, b: set) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """MinHash over 64-bit token hashes with ``(a*x + b) mod p`` permutations."""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = 1) -> None:
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, shingles: Iterable[str]) -> tuple[int, ...]:
+        hashes = [_hash64(token) for token in set(shingles)]
+        if not hashes:
+            return (_MAX_HASH,) * self.num_perm
+        p = _MERSENNE_PRIME
+        return tuple(min([(a * x + b) % p for x in hashes]) for a, b in self._perms)
+
+
+def _collision_probability(similarity: float, bands: int, rows: int) -> float:
+    return 1 - (1 - similarity**rows) ** bands
+
+
+def _integrate(fn, lo: float, hi: float, steps: int = 100) -> float:
+    width = (hi - lo) / steps
+    return sum(fn(lo + (i + 0.5) * width) for i in range(steps)) * width
+
+
+def lsh_params(
+    num_perm: int, threshold: float, fn_weight: float = 0.7
+) -> tuple[int, int]:
+    """Pick ``(bands, rows)`` minimising weighted false positive/negative mass.
+
+    Candidates are re-checked with exact Jaccard, so a false positive only
+    costs a set comparison; false negatives are weighted more heavily.
+    """
+    best, best_error = (num_perm, 1), float("inf")
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        false_pos = _integrate(
+            lambda s: _collision_probability(s, bands, rows), 0.0, threshold
+        )
+        false_neg = _integrate(
+            lambda s: 1 - _collision_probability(s, bands, rows), threshold, 1.0
+        )
+        error = (1 - fn_weight) * false_pos + fn_weight * false_neg
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class LSHIndex:
+    """Band MinHash signatures into buckets; colliding keys are candidates."""
+
+    def __init__(self, bands: int, rows: int) -> None:
+        self.bands = bands
+        self.rows = rows
+        self._buckets: dict[tuple, list[Hashable]] = defaultdict(list)
+
+    def add(self, key: Hashable, signature: Sequence[int]) -> None:
+        for band in range(self.bands):
+            start = band * self.rows
+            self._buckets[(band, *signature[start : start + self.rows])].append(key)
+
+    def candidate_pairs(self) -> set[tuple[Hashable, Hashable]]:
+        pairs = set()
+        for keys in self._buckets.values():
+            if len(keys) < 2:
+                continue
+            for i, left in enumerate(keys):
+                for right in keys[i + 1 :]:
+                    pairs.add((left, right))
+        return pairs
+
+
+def _find(parent: dict, key):
+    while parent[key] != key:
+        parent[key] = parent[parent[key]]
+        key = parent[key]
+    return key
+
+
+def near_duplicate_clusters(
+    items: Mapping[Hashable, set[str]],
+    threshold: float = DEFAULT_THRESHOLD,
+    num_perm: int = DEFAULT_NUM_PERM,
+) -> list[list[Hashable]]:
+    """Group keys whose shingle sets have Jaccard similarity >= ``threshold``.
+
+    Returns clusters of two or more keys, each sorted, in sorted order.
+    """
+    if not 0 < threshold <= 1:
+        raise ValueError("threshold must be in (0, 1]")
+    hasher = MinHasher(num_perm)
+    index = LSHIndex(*lsh_params(num_perm, threshold))
+    for key, shingles in items.items():
+        index.add(key, hasher.signature(shingles))
+
+    parent = {key: key for key in items}
+    for left, right in index.candidate_pairs():
+        if jaccard(items[left], items[right]) >= threshold:
+            parent[_find(parent, left)] = _find(parent, right)
+
+    clusters: dict[Hashable, list[Hashable]] = defaultdict(list)
+    for key in items:
+        clusters[_find(parent, key)].append(key)
+    return sorted(sorted(c) for c in clusters.values() if len(c) > 1)
@@ -0,0 +1,553 @@
+"""Persistent local PR store with per-repo ``updatedAt`` watermarks.
+
+``scratch_inventory`` used to re-download every open PR (capped at 100 per
+repo) on each run. The store keeps the last known state of every PR in a
+small SQLite file and remembers, per repo, the newest ``updatedAt`` it has
+seen. A sync then asks GitHub only for PRs updated since that watermark
+(newest first, stopping at the first older PR) and merges them in; closed
+and merged PRs arrive the same way and simply drop out of :meth:`open_prs`.
+
+The first sync for a repo (or one after ``reset``) paginates every open PR,
+so nothing is silently truncated.
+
+The store is also the hand-off between triage stages. Fields beyond the
+sync listing are kept per :class:`FieldGroup` with their own freshness
+(``merge`` state goes stale in minutes, ``files`` only when the PR changes);
+:func:`ensure_fields` fetches just the stale groups in one batched query.
+Each stage records its verdicts as labels (``triage``, ``duplicate``,
+``category``, ``merge``) that the next stage reads back, so no stage
+re-parses another's markdown report. Readers that act on a verdict pass
+``max_age`` (usually :data:`LABEL_MAX_AGE`) so a stage that has not run
+for a while cannot feed stale decisions downstream.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping
+
+from adaptive_executor import AdaptiveExecutor
+from gh_graphql import PaginatedConnection, fetch_pull_requests
+from pr_reference import PRReference, parse_repo_name
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pull_requests (
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (repo, number)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    repo TEXT PRIMARY KEY,
+    watermark TEXT,
+    synced_at TEXT
+);
+CREATE TABLE IF NOT EXISTS pr_fields (
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    field_group TEXT NOT NULL,
+    data TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    pr_updated_at TEXT,
+    PRIMARY KEY (repo, number, field_group)
+);
+CREATE TABLE IF NOT EXISTS labels (
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    label TEXT NOT NULL,
+    decided_at TEXT NOT NULL,
+    PRIMARY KEY (repo, number, stage)
+);
+CREATE INDEX IF NOT EXISTS pull_requests_by_state ON pull_requests (state, repo);
+CREATE INDEX IF NOT EXISTS labels_by_stage ON labels (stage, label);
+"""
+
+PAGE_SIZE = 100
+# Safety valve: 50 pages is 5000 PRs updated since the last run.
+MAX_PAGES = 50
+# Stage verdicts older than this describe PRs that have likely moved on.
+LABEL_MAX_AGE = 12 * 3600
+
+
+@dataclass(frozen=True, slots=True)
+class FieldGroup:
+    """PR fields fetched and expired together.
+
+    ``keys`` are the top-level keys stored for the group. Entries expire
+    after ``max_age`` seconds; ``follows_updates`` groups also expire as soon
+    as a sync sees a newer ``updatedAt`` for the PR.
+    """
+
+    name: str
+    keys: tuple[str, ...]
+    selection: str = ""
+    connections: tuple[PaginatedConnection, ...] = ()
+    max_age: float = 3600
+    follows_updates: bool = False
+
+
+FIELD_GROUPS = {
+    group.name: group
+    for group in (
+        FieldGroup(
+            "summary",
+            ("number", "title", "author", "headRefName", "state", "createdAt"),
+            "number title author { login } headRefName state createdAt",
+            follows_updates=True,
+        ),
+        # Base-branch moves change this without touching the PR's updatedAt.
+        FieldGroup("merge", ("mergeStateStatus",), "mergeStateStatus", max_age=300),
+        # Pushes bump updatedAt, so the head commit follows updates.
+        FieldGroup(
+            "head", ("headRefOid",), "headRefOid", max_age=86400, follows_updates=True
+        ),
+        FieldGroup(
+            "files",
+            ("files",),
+            connections=(PaginatedConnection("files", "path additions deletions"),),
+            max_age=86400,
+            follows_updates=True,
+        ),
+        FieldGroup(
+            "reviews",
+            ("reviewDecision", "reviews", "latestReviews", "comments"),
+            "reviewDecision",
+            (
+                PaginatedConnection("reviews", "author { login } state body"),
+                PaginatedConnection("latestReviews", "author { login } state body"),
+                PaginatedConnection("comments", "author { login } body"),
+            ),
+            follows_updates=True,
+        ),
+        # Only what get_prs_summarize prints: counts, the first latest reviews
+        # and the newest comments, so one aliased query covers a whole repo.
+        # The trimmed connections are aliased so they never share a key (or
+        # a GraphQL response field) with the full lists of ``reviews``.
+        FieldGroup(
+            "review_context",
+            ("reviewDecision", "reviewTotal", "latestReviewSample", "recentComments"),
+            "reviewDecision reviewTotal: reviews { totalCount } "
+            "latestReviewSample: latestReviews(first: 3) "
+            "{ totalCount nodes { author { login } state body } } "
+            "recentComments: comments(last: 2) "
+            "{ totalCount nodes { author { login } body } }",
+            follows_updates=True,
+        ),
+    )
+}
+
+_PR_FIELDS = " ".join(
+    (FIELD_GROUPS["summary"].selection, FIELD_GROUPS["merge"].selection, "updatedAt")
+)
+
+
+def _pulls_query(open_only: bool) -> str:
+    # ``states`` is fixed query text (not input): the first sync only needs
+    # open PRs, incremental syncs need every state so closures are observed.
+    states = ", states: [OPEN]" if open_only else ""
+    return (
+        "query ($owner: String!, $name: String!, $after: String) { "
+        "repository(owner: $owner, name: $name) { "
+        f"pullRequests(first: {PAGE_SIZE}, after: $after{states}, "
+        "orderBy: {field: UPDATED_AT, direction: DESC}) { "
+        f"nodes {{ {_PR_FIELDS} }} pageInfo {{ hasNextPage endCursor }} }} }} }}"
+    )
+
+
+def default_store_path() -> Path:
+    override = os.environ.get("PR_STORE_PATH")
+    if override:
+        return Path(override).expanduser()
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "personal-config" / "pr-store.sqlite3"
+
+
+def ci_rollup(merge_state_status: str | None) -> str:
+    """Inventory CI code: C(lean), U(nstable), D(irty) or ?."""
+    if merge_state_status in ("CLEAN", "HAS_HOOKS"):
+        return "C"
+    if merge_state_status == "UNSTABLE":
+        return "U"
+    if merge_state_status == "DIRTY":
+        return "D"
+    return "?"
+
+
+class PRStore:
+    """SQLite-backed PR records keyed by ``(owner/name, number)``.
+
+    Use from a single thread; fetch in parallel, then merge from the caller.
+    """
+
+    def __init__(self, path: Path | str = ":memory:") -> None:
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path))
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "PRStore":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def watermark(self, repo: str) -> str | None:
+        row = self._conn.execute(
+            "SELECT watermark FROM sync_state WHERE repo = ?", (repo,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def merge(self, repo: str, prs: Iterable[dict[str, Any]]) -> int:
+        """Upsert ``prs`` (newer ``updatedAt`` wins) and advance the watermark."""
+        rows = self._upsert(repo, prs)
+        watermark = max((row[3] for row in rows), default=None)
+        now = datetime.now(timezone.utc).isoformat()
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO sync_state (repo, watermark, synced_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (repo) DO UPDATE SET synced_at = excluded.synced_at, "
+                "watermark = MAX(COALESCE(sync_state.watermark, ''), "
+                "COALESCE(excluded.watermark, ''))",
+                (repo, watermark, now),
+            )
+        return len(rows)
+
+    def record(self, repo: str, prs: Iterable[dict[str, Any]]) -> int:
+        """Upsert ``prs`` from a partial listing without moving the watermark."""
+        return len(self._upsert(repo, prs))
+
+    def _upsert(self, repo: str, prs: Iterable[dict[str, Any]]) -> list[tuple]:
+        prs = list(prs)
+        rows = [
+            (
+                repo,
+                pr["number"],
+                pr.get("state") or "OPEN",
+                pr["updatedAt"],
+                json.dumps(pr),
+            )
+            for pr in prs
+        ]
+        # Listings carry whole field groups; record them so later stages
+        # do not fetch them again.
+        now = time.time()
+        field_rows = [
+            (
+                repo,
+                pr["number"],
+                group.name,
+                _group_data(group, pr),
+                now,
+                pr["updatedAt"],
+            )
+            for pr in prs
+            for group in FIELD_GROUPS.values()
+            if all(key in pr for key in group.keys)
+        ]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO pull_requests (repo, number, state, updated_at, data) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (repo, number) DO UPDATE SET "
+                "state = excluded.state, updated_at = excluded.updated_at, "
+                "data = excluded.data "
+                "WHERE excluded.updated_at >= pull_requests.updated_at",
+                rows,
+            )
+            self._put_field_rows(field_rows)
+        return rows
+
+    def reset(self, repo: str) -> None:
+        """Forget ``repo`` so the next sync re-fetches every open PR."""
+        with self._conn:
+            self._conn.execute("DELETE FROM pull_requests WHERE repo = ?", (repo,))
+            self._conn.execute("DELETE FROM sync_state WHERE repo = ?", (repo,))
+            self._conn.execute("DELETE FROM pr_fields WHERE repo = ?", (repo,))
+
+    def open_prs(self, repos: Iterable[str] | None = None) -> list[dict[str, Any]]:
+        """Open PR records (as fetched), each tagged with its full ``repo``."""
+        query = "SELECT repo, data FROM pull_requests WHERE state = 'OPEN'"
+        params: tuple = ()
+        if repos is not None:
+            repos = tuple(repos)
+            query += f" AND repo IN ({', '.join('?' * len(repos))})"
+            params = repos
+        out = []
+        for repo, data in self._conn.execute(query + " ORDER BY repo, number", params):
+            pr = json.loads(data)
+            pr["repo"] = repo
+            out.append(pr)
+        return out
+
+    # -- field groups -------------------------------------------------------
+
+    def fields(
+        self, repo: str, number: int, group: str, max_age: float | None = None
+    ) -> dict[str, Any] | None:
+        """Fresh stored fields of ``group`` (plus ``updatedAt``), or None."""
+        spec = FIELD_GROUPS[group]
+        row = self._conn.execute(
+            "SELECT f.data, f.fetched_at, f.pr_updated_at, p.updated_at "
+            "FROM pr_fields f LEFT JOIN pull_requests p "
+            "ON p.repo = f.repo AND p.number = f.number "
+            "WHERE f.repo = ? AND f.number = ? AND f.field_group = ?",
+            (repo, number, group),
+        ).fetchone()
+        if row is None:
+            return None
+        data, fetched_at, pr_updated_at, latest = row
+        if time.time() - fetched_at > (spec.max_age if max_age is None else max_age):
+            return None
+        if spec.follows_updates and latest and latest > (pr_updated_at or ""):
+            return None
+        out = json.loads(data)
+        out["updatedAt"] = pr_updated_at
+        return out
+
+    def put_fields(
+        self,
+        repo: str,
+        number: int,
+        group: str,
+        data: Mapping[str, Any],
+        pr_updated_at: str | None = None,
+    ) -> None:
+        """Store ``group``'s keys from ``data`` as fetched now."""
+        row = (
+            repo,
+            number,
+            group,
+            _group_data(FIELD_GROUPS[group], data),
+            time.time(),
+            pr_updated_at or data.get("updatedAt"),
+        )
+        with self._conn:
+            self._put_field_rows([row])
+
+    def _put_field_rows(self, rows: list[tuple]) -> None:
+        self._conn.executemany(
+            "INSERT INTO pr_fields "
+            "(repo, number, field_group, data, fetched_at, pr_updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (repo, number, field_group) DO UPDATE SET "
+            "data = excluded.data, fetched_at = excluded.fetched_at, "
+            "pr_updated_at = excluded.pr_updated_at "
+            "WHERE COALESCE(excluded.pr_updated_at, '') "
+            ">= COALESCE(pr_fields.pr_updated_at, '')",
+            rows,
+        )
+
+    # -- stage labels -------------------------------------------------------
+
+    def set_labels(self, stage: str, labels: Mapping[str, str]) -> None:
+        """Replace ``stage``'s verdicts with ``{"owner/name#N": label}``."""
+        now = datetime.now(timezone.utc).isoformat()
+        rows = []
+        for pr, label in labels.items():
+            ref = PRReference.from_string(pr)
+            rows.append((ref.repo, ref.number, stage, label, now))
+        with self._conn:
+            self._conn.execute("DELETE FROM labels WHERE stage = ?", (stage,))
+            self._conn.executemany(
+                "INSERT INTO labels (repo, number, stage, label, decided_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def labels(self, stage: str, max_age: float | None = None) -> dict[str, str]:
+        """``{"owner/name#N": label}`` for ``stage``, newest PR first per repo.
+
+        ``max_age`` (seconds) drops verdicts decided longer ago than that.
+        """
+        return {
+            f"{repo}#{number}": label
+            for repo, number, label in self._conn.execute(
+                "SELECT repo, number, label FROM labels "
+                "WHERE stage = ? AND decided_at >= ? ORDER BY repo, number DESC",
+                (stage, _decided_after(max_age)),
+            )
+        }
+
+    def labelled(
+        self, stage: str, label: str, max_age: float | None = None
+    ) -> list[str]:
+        """PRs ``stage`` labelled ``label``, newest first per repo."""
+        return [
+            f"{repo}#{number}"
+            for repo, number in self._conn.execute(
+                "SELECT repo, number FROM labels "
+                "WHERE stage = ? AND label = ? AND decided_at >= ? "
+                "ORDER BY repo, number DESC",
+                (stage, label, _decided_after(max_age)),
+            )
+        ]
+
+
+def _decided_after(max_age: float | None) -> str:
+    """ISO cutoff comparable with ``labels.decided_at`` ("" keeps everything)."""
+    if max_age is None:
+        return ""
+    cutoff = datetime.now(timezone.utc).timestamp() - max_age
+    return datetime.fromtimestamp(cutoff, timezone.utc).isoformat()
+
+
+def _group_data(group: FieldGroup, data: Mapping[str, Any]) -> str:
+    return json.dumps({key: data.get(key) for key in group.keys})
+
+
+def _flatten_connections(node: dict[str, Any]) -> dict[str, Any]:
+    """``{"files": {"nodes": [...]}}`` -> ``{"files": [...]}``, as ``gh --json``.
+
+    Connections that also select ``totalCount`` are kept whole: their
+    ``nodes`` are only a slice and the count is what callers report.
+    """
+    return {
+        key: (
+            value["nodes"]
+            if isinstance(value, dict)
+            and "nodes" in value
+            and "totalCount" not in value
+            else value
+        )
+        for key, value in node.items()
+    }
+
+
+def ensure_fields(
+    store: PRStore,
+    refs: Iterable[PRReference],
+    groups: Iterable[str],
+    run: Callable[[list], Any],
+    *,
+    max_age: float | None = None,
+) -> dict[PRReference, dict[str, Any] | None]:
+    """The ``groups`` fields of each PR, fetching only stale groups.
+
+    PRs missing the same groups share one batched GraphQL lookup; results
+    are written back to ``store``. A PR maps to None if any group could not
+    be fetched.
+    """
+    groups = tuple(groups)
+    cached: dict[PRReference, dict[str, dict | None]] = {}
+    stale_refs: dict[tuple[str, ...], list[PRReference]] = defaultdict(list)
+    for ref in dict.fromkeys(refs):
+        cached[ref] = {
+            group: store.fields(ref.repo, ref.number, group, max_age)
+            for group in groups
+        }
+        stale = tuple(group for group, data in cached[ref].items() if data is None)
+        if stale:
+            stale_refs[stale].append(ref)
+
+    for stale, batch in stale_refs.items():
+        specs = [FIELD_GROUPS[group] for group in stale]
+        selection = " ".join(
+            ["updatedAt", *(spec.selection for spec in specs if spec.selection)]
+        )
+        connections = tuple(conn for spec in specs for conn in spec.connections)
+        nodes = fetch_pull_requests(run, batch, selection, connections)
+        for ref in batch:
+            node = nodes.get(ref)
+            if not isinstance(node, dict):
+                continue
+            node = _flatten_connections(node)
+            for spec in specs:
+                store.put_fields(ref.repo, ref.number, spec.name, node)
+                cached[ref][spec.name] = {
+                    **{key: node.get(key) for key in spec.keys},
+                    "updatedAt": node.get("updatedAt"),
+                }
+
+    out: dict[PRReference, dict[str, Any] | None] = {}
+    for ref, by_group in cached.items():
+        if any(data is None for data in by_group.values()):
+            out[ref] = None
+            continue
+        merged: dict[str, Any] = {}
+        for data in by_group.values():
+            merged.update(data)
+        merged["updatedAt"] = max(
+            (data["updatedAt"] or "" for data in by_group.values()), default=None
+        )
+        out[ref] = merged
+    return out
+
+
+def sync_repos(
+    store: PRStore, repos: Iterable[str], run: Callable[[list], Any]
+) -> list[dict[str, Any]]:
+    """Merge PRs updated since each repo's watermark into ``store``.
+
+    Fetches run in parallel; merges happen here because the store is
+    single-threaded. Returns the open PRs across ``repos``.
+    """
+    repos = list(repos)
+    watermarks = {repo: store.watermark(repo) for repo in repos}
+
+    def fetch(repo):
+        return repo, fetch_updated_prs(run, repo, watermarks[repo])
+
+    with AdaptiveExecutor() as executor:
+        for repo, prs in executor.map(fetch, repos):
+            if prs is None:
+                print(f"sync failed for {repo}; using stored PRs", file=sys.stderr)
+                continue
+            store.merge(repo, prs)
+    return store.open_prs(repos)
+
+
+def fetch_updated_prs(
+    run: Callable[[list], Any], repo: str, since: str | None
+) -> list[dict[str, Any]] | None:
+    """PRs in ``repo`` updated at or after ``since`` (all open PRs if None).
+
+    Pages newest-first and stops at the first PR older than ``since``.
+    Returns None if any page fails, so the caller keeps its old watermark.
+    """
+    if parse_repo_name(repo) is None:
+        return None
+    owner, name = repo.split("/", 1)
+    query = _pulls_query(open_only=not since)
+    prs: list[dict[str, Any]] = []
+    cursor = None
+    for _ in range(MAX_PAGES):
+        cmd = ["gh", "api", "graphql", "-f", f"query={query}"]
+        cmd += ["-f", f"owner={owner}", "-f", f"name={name}"]
+        if cursor:
+            cmd += ["-f", f"after={cursor}"]
+        result = run(cmd)
+        data = result.get("data") if isinstance(result, dict) else None
+        repository = data.get("repository") if isinstance(data, dict) else None
+        if not isinstance(repository, dict):
+            return None
+        conn = repository.get("pullRequests") or {}
+        for node in conn.get("nodes") or ():
+            if since and node.get("updatedAt", "") < since:
+                return prs
+            if not node.get("author"):
+                node["author"] = {"login": "ghost"}
+            prs.append(node)
+        page_info = conn.get("pageInfo") or {}
+        if not page_info.get("hasNextPage"):
+            return prs
+        cursor = page_info.get("endCursor")
+    # Stopping early would advance the watermark past PRs never fetched.
+    print(
+        f"pr store: {repo} has more than {MAX_PAGES} pages of updates; not merging",
+        file=sys.stderr,
+    )
+    return None
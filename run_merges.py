@@ -2,96 +2,75 @@ import json
 import subprocess
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor
 
+import gh_cache
+import github_client
+from adaptive_executor import AdaptiveExecutor
+from gh_cache import run_json as run_gh
+from gh_graphql import fetch_pull_requests
 from gh_token_env import load_gh_token_env
+from merge_planner import CONFLICTING_STATES, diff_paths, execute_plan, plan_merges
+from pr_diffs import (
+    Diff,
+    default_diff_cache,
+    diff_stats,
+    fetch_diff,
+    max_bytes_from_env,
+)
 from pr_reference import PRReference
+from pr_store import LABEL_MAX_AGE, PRStore, default_store_path, ensure_fields
 
 
-def run_gh(cmd_list):
-    """Call ``gh`` and return parsed JSON, or a string, or None on failure/timeout."""
-    env = load_gh_token_env()
-    try:
-        result = subprocess.run(
-            cmd_list,
-            capture_output=True,
-            text=True,
-            env=env,
-            timeout=120,
-            check=False,
-        )
-    except (subprocess.TimeoutExpired, OSError) as e:
-        print(
-            f"gh command failed or timed out ({type(e).__name__}): {cmd_list[0] if cmd_list else cmd_list}",
-            file=sys.stderr,
-        )
-        return None
-    if result.returncode != 0:
-        return None
-    try:
-        return json.loads(result.stdout)
-    except json.JSONDecodeError:
-        return result.stdout
+# Set by ``__main__`` unless ``--no-cache``; diffs are keyed by head SHA.
+diff_cache = None
 
 
-def get_diff(repo, pr):
-    """Fetch the textual diff for a PR."""
-    res = run_gh(["gh", "pr", "diff", str(pr), "-R", str(repo)])
-    return res if isinstance(res, str) else ""
+def get_diff(repo, pr, head_sha=None):
+    """Fetch a PR's diff, capped at ``GH_DIFF_MAX_BYTES`` (None on failure)."""
+    return fetch_diff(
+        PRReference.from_parts(repo, pr),
+        head_sha,
+        max_bytes=max_bytes_from_env(),
+        cache=diff_cache,
+        env=load_gh_token_env(),
+    )
 
 
-def _fetch_pr_diff_only(item, info):
+def _fetch_pr_diff_only(item, info, fetch_diffs=True):
     repo, pr, title = item
     ref = PRReference.from_parts(repo, pr)
-    diff = ""
-    if info and info.get("mergeStateStatus") not in ["DIRTY", "CONFLICTING"]:
-        diff = get_diff(ref.repo, str(ref.number))
+    diff = Diff("")
+    if (
+        fetch_diffs
+        and info
+        and info.get("mergeStateStatus") not in CONFLICTING_STATES
+    ):
+        diff = get_diff(ref.repo, str(ref.number), info.get("headRefOid"))
     return ref.repo, str(ref.number), title, info, diff
 
 
-def _build_graphql_query(queue_items):
-    parts = []
-    for i, item in enumerate(queue_items):
-        owner, name = item[0].split("/")
-        parts.append(
-            f'pr{i}: repository(owner: "{owner}", name: "{name}") {{ pullRequest(number: {item[1]}) {{ mergeStateStatus }} }}'
-        )
-    return "query { " + " ".join(parts) + " }"
-
-
-def _parse_graphql_response(res, queue_items):
-    # ⚡ Bolt Optimization:
-    # Check for data presence and use dict.fromkeys() to avoid redundant nested .get()
-    # loops and object allocations on cold/missing paths without increasing complexity.
-    # Impact: Reduces parse overhead by ~60% on missing paths in batch E2E PR tasks.
-    data = res.get("data") if isinstance(res, dict) else None
-    if not isinstance(data, dict):
-        return dict.fromkeys(queue_items)
-
-    info_map = {}
-    for i, item in enumerate(queue_items):
-        pr_node = data.get(f"pr{i}")
-        info_map[item] = (
-            pr_node.get("pullRequest") if isinstance(pr_node, dict) else None
-        )
-    return info_map
-
-
-def _fetch_all_pr_info_graphql(queue_items):
+def _fetch_all_pr_info_graphql(queue_items, store=None):
     if not queue_items:
         return {}
-    query = _build_graphql_query(queue_items)
-    res = run_gh(["gh", "api", "graphql", "-f", f"query={query}"])
-    return _parse_graphql_response(res, queue_items)
+    refs = {item: PRReference.from_parts(item[0], item[1]) for item in queue_items}
+    if store is not None:
+        nodes = ensure_fields(
+            store, refs.values(), ("merge", "head", "files"), run_gh
+        )
+    else:
+        nodes = fetch_pull_requests(run_gh, refs.values(), "mergeStateStatus")
+    return {item: nodes.get(ref) for item, ref in refs.items()}
 
 
-def _fetch_all_pr_data_parallel(queue_items):
-    info_map = _fetch_all_pr_info_graphql(queue_items)
-    with ThreadPoolExecutor(max_workers=min(len(queue_items) or 1, 32)) as executor:
+def _fetch_all_pr_data_parallel(queue_items, store=None, fetch_diffs=True):
+    info_map = _fetch_all_pr_info_graphql(queue_items, store)
+    with AdaptiveExecutor() as executor:
         futures = []
         for item in queue_items:
             futures.append(
-                executor.submit(_fetch_pr_diff_only, item, info_map.get(item))
+                executor.submit(
+                    _fetch_pr_diff_only, item, info_map.get(item), fetch_diffs
+                )
             )
         return [f.result() for f in futures]
 
@@ -201,55 +180,89 @@ queue = [
 
 results = {"merged": [], "escalated": [], "conflicting": []}
 
-if __name__ == "__main__":
-    for repo, pr, title, info, diff in _fetch_all_pr_data_parallel(queue):
-        print(f"\nProcessing {repo}#{pr}: {title}")
+# categorize_ready's categories, merged in this order.
+_MERGE_ORDER = (
+    "SECURITY",
+    "DEPENDENCY",
+    "CI/INFRA",
+    "PERFORMANCE/REFACTOR/UI/FEATURE",
+)
 
-        if not info:
-            print("Failed to get info")
-            continue
 
-        status = info.get("mergeStateStatus")
-        if status in ["DIRTY", "CONFLICTING"]:
-            print(f"Status is {status}, moving to conflicting.")
-            results["conflicting"].append((repo, pr, title))
-            continue
+def queue_from_store(store, max_age=LABEL_MAX_AGE):
+    """``(repo, pr, title)`` items from the store's recent category labels."""
+    labels = store.labels("category", max_age)
+    order = {category: i for i, category in enumerate(_MERGE_ORDER)}
+    prs = sorted(labels, key=lambda pr: order.get(labels[pr], len(order)))
+    refs = [PRReference.from_string(pr) for pr in prs]
+    infos = ensure_fields(store, refs, ("summary",), run_gh)
+    return [
+        (ref.repo, str(ref.number), (infos.get(ref) or {}).get("title") or "")
+        for ref in refs
+    ]
 
-        diff_lower = diff.lower()
-
-        # Gate 2: Security check
-        escalate = False
-        reasons = []
-
-        for dangerous in ("eval(", "exec(", "dangerouslysetinnerhtml"):
-            if dangerous in diff_lower:
-                escalate = True
-                reasons.append("Dangerous evaluation function detected.")
-                break
-        if "pull_request_target" in diff_lower and "checkout" in diff_lower:
-            escalate = True
-            reasons.append("Dangerous GitHub Actions workflow detected.")
-        if ".gitignore" in diff_lower and "+" in diff_lower and "!" in diff_lower:
-            pass
-        if ".env.example" in diff_lower and "- " in diff_lower:
-            escalate = True
-            reasons.append("Weakened .env.example.")
-
-        title_lower = title.lower()
-        for sensitive in ("auth", "payment", "migration", "sql"):
-            if sensitive in title_lower:
-                escalate = True
-                reasons.append("Touches sensitive domain (auth/payments/db).")
-                break
-
-        if escalate:
-            print(f"ESCALATING {repo}#{pr}: {', '.join(reasons)}")
-            results["escalated"].append((repo, pr, title, reasons))
-            continue
 
-        print("Gate 2 passed. Merging...")
-        ref = PRReference.from_parts(repo, pr)
-        env = load_gh_token_env()
+def select_queue(store, argv):
+    """The curated ``queue``, or the store's with :data:`FROM_STORE_FLAG`."""
+    if FROM_STORE_FLAG not in argv:
+        return queue
+    items = queue_from_store(store)
+    if not items:
+        print("No recent category labels in the PR store; nothing to merge.")
+    return items
+
+
+DRY_RUN_FLAG = "--dry-run"
+# Merge the PRs the pipeline categorised instead of the curated ``queue``.
+FROM_STORE_FLAG = "--from-store"
+DIFF_STATS_FLAG = "--diff-stats"
+# GitHub recomputes mergeability lazily after a merge and reports UNKNOWN
+# until it has; poll those a few times instead of sleeping after every merge.
+_RECHECK_ATTEMPTS = 3
+_RECHECK_DELAY = 3
+
+
+def _gate_reasons(title, diff):
+    """Gate 2: reasons to escalate instead of merging (empty if safe).
+
+    ``diff`` is None when it could not be fetched; that always escalates.
+    """
+    reasons = []
+    if diff is None:
+        reasons.append("Diff could not be fetched; not reviewed.")
+        diff = Diff("")
+    diff_lower = diff.text.lower()
+    if diff.truncated:
+        reasons.append("Diff exceeds the size cap; not fully reviewed.")
+    for dangerous in ("eval(", "exec(", "dangerouslysetinnerhtml"):
+        if dangerous in diff_lower:
+            reasons.append("Dangerous evaluation function detected.")
+            break
+    if "pull_request_target" in diff_lower and "checkout" in diff_lower:
+        reasons.append("Dangerous GitHub Actions workflow detected.")
+    if ".env.example" in diff_lower and "- " in diff_lower:
+        reasons.append("Weakened .env.example.")
+    title_lower = title.lower()
+    for sensitive in ("auth", "payment", "migration", "sql"):
+        if sensitive in title_lower:
+            reasons.append("Touches sensitive domain (auth/payments/db).")
+            break
+    return reasons
+
+
+def _changed_files(info, diff):
+    """Paths a PR touches: the store's ``files`` group, else the diff headers."""
+    files = (info or {}).get("files")
+    if files:
+        return {f["path"] for f in files if isinstance(f, dict) and f.get("path")}
+    return diff_paths(diff.text)
+
+
+def _merge(key):
+    """Squash-merge ``(repo, pr)``; None on success, else the error text."""
+    ref = PRReference.from_parts(*key)
+    env = load_gh_token_env()
+    try:
         res = subprocess.run(
             [
                 "gh",
@@ -267,19 +280,133 @@ if __name__ == "__main__":
             timeout=120,
             check=False,
         )
-        if res.returncode == 0:
-            print(f"Successfully merged {repo}#{pr}")
-            results["merged"].append((repo, pr, title))
+    except (subprocess.TimeoutExpired, OSError) as e:
+        return f"gh pr merge failed ({type(e).__name__})"
+    if res.returncode == 0:
+        print(f"Successfully merged {ref}")
+        return None
+    return res.stderr.strip() or res.stdout.strip() or "unknown error"
+
+
+def _merge_states(keys, store=None):
+    """Fresh ``mergeStateStatus`` for ``(repo, pr)`` keys, waiting out UNKNOWN."""
+    def run(cmd_list):
+        return run_gh(cmd_list, fresh=True)
+
+    states = {}
+    pending = list(keys)
+    for attempt in range(_RECHECK_ATTEMPTS):
+        if attempt:
+            time.sleep(_RECHECK_DELAY)
+        refs = {key: PRReference.from_parts(*key) for key in pending}
+        if store is not None:
+            nodes = ensure_fields(store, refs.values(), ("merge",), run, max_age=0)
         else:
-            error_text = res.stderr.strip() or res.stdout.strip() or "unknown error"
-            print(f"Merge failed: {error_text}")
+            nodes = fetch_pull_requests(run, refs.values(), "mergeStateStatus")
+        for key, ref in refs.items():
+            states[key] = (nodes.get(ref) or {}).get("mergeStateStatus")
+        pending = [key for key in pending if states[key] in (None, "UNKNOWN")]
+        if not pending:
+            break
+    return states
+
+
+def plan_queue(rows):
+    """Gate the fetched queue rows and plan merges for the PRs that pass.
+
+    Fills ``results`` with the conflicting/escalated PRs and returns the
+    :class:`MergePlan` and ``{(repo, pr): title}`` of the rest.
+    """
+    titles = {}
+    files = {}
+    for repo, pr, title, info, diff in rows:
+        print(f"\nProcessing {repo}#{pr}: {title}")
+
+        if not info:
+            print("Failed to get info")
+            continue
+
+        status = info.get("mergeStateStatus")
+        if status in CONFLICTING_STATES:
+            print(f"Status is {status}, moving to conflicting.")
+            results["conflicting"].append((repo, pr, title))
+            continue
+
+        reasons = _gate_reasons(title, diff)
+        if reasons:
+            print(f"ESCALATING {repo}#{pr}: {', '.join(reasons)}")
+            results["escalated"].append((repo, pr, title, reasons))
+            continue
+
+        print("Gate 2 passed.")
+        titles[(repo, pr)] = title
+        files[(repo, pr)] = _changed_files(info, diff)
+    plan = plan_merges(list(titles), files, group=lambda key: key[0])
+    return plan, titles
+
+
+def print_diff_stats(rows):
+    """One ``repo#pr: N files, +A -D`` line per PR, from its ``files`` field."""
+    for repo, pr, title, info, _ in rows:
+        files = (info or {}).get("files")
+        stats = diff_stats(files) if files is not None else "stats unavailable"
+        print(f"{repo}#{pr}: {stats}  {title}")
+
+
+def merge_planned(plan, titles, store=None):
+    """Run ``plan``: one wave at a time, each wave's merges concurrently."""
+    with AdaptiveExecutor() as executor:
+        outcomes = execute_plan(
+            plan,
+            _merge,
+            lambda keys: _merge_states(keys, store),
+            run_wave=executor.map,
+        )
+    for key in titles:
+        repo, pr = key
+        outcome, detail = outcomes[key]
+        if outcome == "merged":
+            results["merged"].append((repo, pr, titles[key]))
+        elif outcome == "conflicting":
+            print(f"{repo}#{pr} is now {detail}, moving to conflicting.")
+            results["conflicting"].append((repo, pr, titles[key]))
+        else:
+            print(f"Merge of {repo}#{pr} failed: {detail}")
             results["escalated"].append(
-                (repo, pr, title, ["Merge command failed", error_text])
+                (repo, pr, titles[key], ["Merge command failed", detail])
             )
-            continue
 
-        print("Waiting 5 seconds for GitHub to update state...")
-        time.sleep(5)
+
+if __name__ == "__main__":
+    gh_cache.configure(sys.argv[1:])
+    github_client.enable()
+    # Without diff bodies Gate 2 cannot run, so stats mode only reports.
+    stats_only = DIFF_STATS_FLAG in sys.argv[1:]
+    dry_run = DRY_RUN_FLAG in sys.argv[1:]
+    if gh_cache.NO_CACHE_FLAG not in sys.argv[1:]:
+        diff_cache = default_diff_cache()
+    with PRStore(default_store_path()) as store:
+        queue = select_queue(store, sys.argv[1:])
+        rows = _fetch_all_pr_data_parallel(queue, store, fetch_diffs=not stats_only)
+        if stats_only:
+            print_diff_stats(rows)
+            sys.exit(0)
+        plan, titles = plan_queue(rows)
+        print("\n--- MERGE PLAN ---")
+        for line in plan.describe(lambda key: f"{key[0]}#{key[1]}"):
+            print(line)
+        if dry_run:
+            sys.exit(0)
+        merge_planned(plan, titles, store)
+
+        store.set_labels(
+            "merge",
+            {
+                f"{repo}#{pr}": outcome
+                for outcome, items in results.items()
+                for repo, pr, *_ in items
+            },
+        )
 
     print("\n--- DONE ---")
     with open("tasks/pr-merge-results.json", "w") as f:
@@ -1,53 +1,37 @@
 import datetime
 import json
 import subprocess
-from concurrent.futures import ThreadPoolExecutor
+import sys
 
+import gh_cache
+import github_client
 from gh_token_env import load_gh_token_env
+from pr_classifier import PR_CLASSIFIER
+from pr_store import PRStore, ci_rollup, default_store_path, sync_repos
 from spreadsheet_safety import escape_spreadsheet_formula
 
 
-def _fetch_repo_prs(repo):
-    repo_prs = []
+def run_gh(cmd_list):
+    """Call ``gh`` and return parsed JSON, or None on failure/timeout."""
     env = load_gh_token_env()
     try:
-        res = subprocess.run(
-            [
-                "gh",
-                "pr",
-                "list",
-                "--repo",
-                repo,
-                "--state",
-                "open",
-                "--limit",
-                "100",
-                "--json",
-                "number,title,author,headRefName,mergeStateStatus,state,createdAt",
-            ],
-            capture_output=True,
-            text=True,
-            env=env,
-            timeout=120,
-        )
+        result = gh_cache.run(cmd_list, env=env, timeout=120)
     except subprocess.TimeoutExpired:
-        return []
-    if res.returncode == 0:
-        prs = json.loads(res.stdout)
-        for pr in prs:
-            # ⚡ Bolt Optimization: Use rpartition() over split() to avoid intermediate list allocation overhead
-            pr["repo"] = repo.rpartition("/")[2]
-            repo_prs.append(pr)
-    return repo_prs
-
-
-def fetch_prs(repos):
-    all_prs = []
-    # ⚡ Bolt Optimization: Parallelize N+1 read-only API calls using map() to significantly speed up PR fetching
-    # ⚡ Bolt Optimization: Dynamic thread concurrency to eliminate batching latency
-    with ThreadPoolExecutor(max_workers=min(len(repos) or 1, 32)) as executor:
-        for repo_prs in executor.map(_fetch_repo_prs, repos):
-            all_prs.extend(repo_prs)
+        print(f"gh command timed out: {cmd_list[0]}", file=sys.stderr)
+        return None
+    if result.returncode != 0:
+        return None
+    try:
+        return json.loads(result.stdout)
+    except json.JSONDecodeError:
+        return None
+
+
+def sync_inventory(repos, store):
+    """Sync ``store`` and return the open PRs across ``repos`` (short repo names)."""
+    all_prs = sync_repos(store, repos, run_gh)
+    for pr in all_prs:
+        pr["repo"] = pr["repo"].rpartition("/")[2]
     return all_prs
 
 
@@ -71,15 +55,7 @@ def generate_markdown(all_prs):
     for pr in sorted(all_prs, key=lambda x: (x["repo"], -x["number"])):
         cat = get_category(pr["title"], pr["headRefName"])
 
-        ci = "C"
-        if pr["mergeStateStatus"] not in ("CLEAN", "HAS_HOOKS"):
-            if pr["mergeStateStatus"] == "UNSTABLE":
-                ci = "U"
-            elif pr["mergeStateStatus"] == "DIRTY":
-                ci = "D"
-            else:
-                ci = "?"
-
+        ci = ci_rollup(pr["mergeStateStatus"])
         conflicts = "yes" if pr["mergeStateStatus"] == "DIRTY" else "none"
         # ⚡ Bolt Optimization: Hoisted datetime.date.today().isoformat() out of loop to avoid redundant string parsing overhead
         date_str = pr.get("createdAt", today_iso)[:10]
@@ -105,7 +81,14 @@ def main():
         "abhimehro/series_correction_project_updated",
     ]
 
-    all_prs = fetch_prs(repos)
+    argv = sys.argv[1:]
+    gh_cache.configure(argv)
+    github_client.enable()
+    with PRStore(default_store_path()) as store:
+        if "--full" in argv:
+            for repo in repos:
+                store.reset(repo)
+        all_prs = sync_inventory(repos, store)
     out_md = generate_markdown(all_prs)
 
     with open("tasks/pr-inventory.md", "w") as f:
@@ -113,26 +96,8 @@ def main():
     print(f"Generated inventory for {len(all_prs)} PRs.")
 
 
-_CATEGORIES = (
-    ("SECURITY", ("sentinel", "security", "injection", "cwe", "ssrf", "tls")),
-    ("PERFORMANCE", ("bolt", "perf", "optimize")),
-    ("UI", ("palette", "ux", "ui")),
-    ("CI/INFRA", ("qa", "test", "ci", "infra", "action")),
-    ("REFACTOR", ("refactor", "import", "clean")),
-)
-
-
 def get_category(title, branch):
-    l = (title + branch).lower()
-
-    # ⚡ Bolt Optimization: Iterate over a predefined tuple of categories to avoid
-    # iterator allocation overhead while keeping cyclomatic complexity low (CodeScene Code Health)
-    for cat, keywords in _CATEGORIES:
-        for k in keywords:
-            if k in l:
-                return cat
-
-    return "FEATURE"
+    return PR_CLASSIFIER.label(title + branch, "inventory", "FEATURE")
 
 
 if __name__ == "__main__":
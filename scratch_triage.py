@@ -1,9 +1,13 @@
 import datetime
-import json
 import subprocess
-from concurrent.futures import ThreadPoolExecutor
+import sys
 
+import gh_cache
+import github_client
+from adaptive_executor import AdaptiveExecutor, note_gh_result
 from gh_token_env import load_gh_token_env
+from pr_reference import PRReference
+from pr_store import PRStore, default_store_path, ensure_fields, sync_repos
 
 repos = [
     "abhimehro/personal-config",
@@ -19,6 +23,7 @@ def run_cmd(cmd):
     env = load_gh_token_env()
     try:
         res = subprocess.run(cmd, capture_output=True, text=True, env=env, timeout=120)
+        note_gh_result(res)
         return res.returncode == 0, res.stdout, res.stderr
     except subprocess.TimeoutExpired:
         return False, "", "Timeout expired"
@@ -109,33 +114,25 @@ def group_prs(all_prs, triage_md):
         )
 
 
-def _fetch_repo_prs(repo):
-    repo_prs = []
-    success, stdout, _ = run_cmd(
-        [
-            "gh",
-            "pr",
-            "list",
-            "--repo",
-            repo,
-            "--state",
-            "open",
-            "--limit",
-            "100",
-            "--json",
-            "number,title,author,headRefName,mergeStateStatus,state,createdAt",
-        ]
-    )
-    if success:
-        prs = json.loads(stdout)
-        for pr in prs:
-            # ⚡ Bolt Optimization: Use rpartition() over split() to avoid intermediate list allocation overhead
-            pr["repo"] = repo.rpartition("/")[2]
-            pr["full_repo"] = repo
-            # ⚡ Bolt Optimization: Hoist title lowering out of filtering loops to prevent redundant C-level string allocations
-            pr["title_lower"] = pr["title"].lower()
-            repo_prs.append(pr)
-    return repo_prs
+def _run_json_fresh(cmd_list):
+    return gh_cache.run_json(cmd_list, fresh=True)
+
+
+def load_open_prs(store):
+    """Open PRs across ``repos`` after a store sync, with fresh merge state."""
+    all_prs = sync_repos(store, repos, gh_cache.run_json)
+    refs = [PRReference.from_parts(pr["repo"], str(pr["number"])) for pr in all_prs]
+    # Merge state must be current before anything is merged with --admin: the
+    # synced listing may be a cached response, so re-query it uncached.
+    merge_state = ensure_fields(store, refs, ("merge",), _run_json_fresh, max_age=0)
+    for pr, ref in zip(all_prs, refs):
+        pr["full_repo"] = ref.repo
+        pr["repo"] = ref.name
+        # ⚡ Bolt Optimization: Hoist title lowering out of filtering loops to prevent redundant C-level string allocations
+        pr["title_lower"] = pr["title"].lower()
+        if merge_state.get(ref):
+            pr["mergeStateStatus"] = merge_state[ref]["mergeStateStatus"]
+    return all_prs
 
 
 def _process_pr(pr):
@@ -181,12 +178,10 @@ def _process_pr(pr):
 
 
 if __name__ == "__main__":
-    all_prs = []
-    # ⚡ Bolt Optimization: Parallelize N+1 read-only API calls using map() to significantly speed up PR fetching
-    # ⚡ Bolt Optimization: Dynamic thread concurrency to eliminate batching latency
-    with ThreadPoolExecutor(max_workers=min(len(repos) or 1, 32)) as executor:
-        for repo_prs in executor.map(_fetch_repo_prs, repos):
-            all_prs.extend(repo_prs)
+    gh_cache.configure(sys.argv[1:])
+    github_client.enable()
+    with PRStore(default_store_path()) as store:
+        all_prs = load_open_prs(store)
 
     merged = []
     closed = []
@@ -206,8 +201,8 @@ if __name__ == "__main__":
     group_prs(all_prs, triage_md)
 
     # Process Actions
-    # ⚡ Bolt Optimization: Dynamic thread concurrency to eliminate batching latency
-    with ThreadPoolExecutor(max_workers=min(len(all_prs) or 1, 32)) as executor:
+    # Merges and closes are what trip secondary rate limits; let AIMD pace them.
+    with AdaptiveExecutor() as executor:
         for pr, action in executor.map(
             _process_pr, sorted(all_prs, key=lambda x: (x["repo"], -x["number"]))
         ):
@@ -218,6 +213,20 @@ if __name__ == "__main__":
             elif action == "escalated":
                 escalated.append(pr)
 
+    with PRStore(default_store_path()) as store:
+        store.set_labels(
+            "merge",
+            {
+                f"{p['full_repo']}#{p['number']}": outcome
+                for outcome, prs in (
+                    ("closed", closed),
+                    ("merged", merged),
+                    ("escalated", escalated),
+                )
+                for p in prs
+            },
+        )
+
     triage_md.extend(
         [
             "\n## Escalate / defer (no autonomous merge)\n",
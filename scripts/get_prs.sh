@@ -48,8 +48,8 @@ Usage: get_prs.sh [options]
   --config PATH   Load repo list from tasks/pr-review-agent.config.yaml-style file
   --repo O/R      Add a repository (repeatable; overrides default when set)
   --limit N       Max open PRs per repo (default: 100)
-  --details       Fetch reviews + issue comments per PR (slower; one gh pr view
-                  per PR — watch rate limits on repos with many open PRs)
+  --details       Fetch review + issue comment context (batched GraphQL: counts,
+                  first 3 latest reviews, last 2 comments per PR)
   --bots-only     Legacy mode: only list PRs where GitHub author matches bot_authors
                   (same idea as the original script; misses Jules-on-human-account PRs)
   --compare-bots  After the full open-PR inventory, append the legacy bots-only tables
@@ -57,6 +57,7 @@ Usage: get_prs.sh [options]
 
 Environment:
   GH_REPO         If set, only query this single repo (same as one --repo).
+  GH_DETAILS_MODE per-pr: fetch --details with one gh pr view per PR instead.
 
 Output:
   Markdown-friendly tables per repo. Check rollup is summarized from
@@ -5,14 +5,19 @@ Invoked as: python3 get_prs_summarize.py <true|false> <path-to-json>
 The second argument is include_details ("true" / "false").
 """
 
-import concurrent.futures
 import json
 import os
 import subprocess
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import gh_cache
+from adaptive_executor import AdaptiveExecutor, note_gh_result
+from gh_graphql import fetch_pull_requests
 from gh_token_env import load_gh_token_env
+from pr_classifier import PR_CLASSIFIER
+from pr_reference import PRReference
+from pr_store import FIELD_GROUPS, PRStore, default_store_path, ensure_fields
 from spreadsheet_safety import escape_spreadsheet_formula
 
 FAIL_CONCLUSIONS = frozenset(
@@ -48,40 +53,6 @@ def check_summary(rollup: list | None) -> str:
     return "COMPLETED_OK"
 
 
-BRANCH_SIGNALS = (
-    "jules",
-    "sentinel",
-    "bolt/",
-    "palette/",
-    "automation-",
-    "daily-qa",
-    "chore/jules",
-    "cursor-agent/",
-    "renovate/",
-    "dependabot/",
-    "renovate",
-    "copilot",
-)
-
-TITLE_KW = (
-    "jules",
-    "sentinel",
-    "dependabot",
-    "renovate",
-    "autofix",
-    "bolt",
-    "palette",
-    "automation",
-)
-
-BODY_MARKERS = (
-    "jules.google.com",
-    "created automatically by jules",
-    "pull request was automatically",
-    "signed-off-by: dependabot",
-)
-
-
 def automation_hints(pr: dict) -> str:
     hints: list[str] = []
     hints.extend(_get_author_hints(pr.get("author")))
@@ -107,33 +78,18 @@ def _get_author_hints(author: dict | None) -> list[str]:
 
 
 def _get_branch_hints(branch: str | None) -> list[str]:
-    if not branch:
-        return []
-    branch_lower = branch.lower()
-    for sig in BRANCH_SIGNALS:
-        if sig in branch_lower:
-            return [f"branch:{sig.rstrip('/')}"]
-    return []
+    label = PR_CLASSIFIER.label(branch or "", "branch")
+    return [f"branch:{label}"] if label else []
 
 
 def _get_title_hints(title: str | None) -> list[str]:
-    if not title:
-        return []
-    title_lower = title.lower()
-    for kw in TITLE_KW:
-        if kw in title_lower:
-            return [f"title:{kw}"]
-    return []
+    label = PR_CLASSIFIER.label(title or "", "title")
+    return [f"title:{label}"] if label else []
 
 
 def _get_body_hints(body: str | None) -> list[str]:
-    if not body:
-        return []
-    body_lower = body.lower()
-    for m in BODY_MARKERS:
-        if m in body_lower:
-            return ["body:automation_marker"]
-    return []
+    label = PR_CLASSIFIER.label(body or "", "body")
+    return [f"body:{label}"] if label else []
 
 
 def esc_cell(s: str, maxlen: int = 48) -> str:
@@ -143,16 +99,25 @@ def esc_cell(s: str, maxlen: int = 48) -> str:
     return s
 
 
+def _connection(data: dict, key: str) -> tuple[list, int]:
+    """``(nodes, total)`` of a ``gh --json`` list or a GraphQL connection."""
+    value = data.get(key) or ()
+    if isinstance(value, dict):
+        nodes = value.get("nodes") or []
+        return nodes, value.get("totalCount", len(nodes))
+    return list(value), len(value)
+
+
 def _format_details(data: dict) -> str:
     lines: list[str] = []
-    reviews = data.get("reviews") or ()
-    latest = data.get("latestReviews") or ()
-    comments = data.get("comments") or ()
+    _, review_count = _connection(data, "reviews")
+    latest, latest_count = _connection(data, "latestReviews")
+    comments, comment_count = _connection(data, "comments")
     rd = data.get("reviewDecision") or ""
     if rd:
         lines.append(f"- reviewDecision: `{rd}`")
-    lines.append(f"- review threads: {len(reviews)} raw / {len(latest)} latest")
-    lines.append(f"- issue comments: {len(comments)}")
+    lines.append(f"- review threads: {review_count} raw / {latest_count} latest")
+    lines.append(f"- issue comments: {comment_count}")
     for r in latest[:3]:
         author = r.get("author")
         who = (author.get("login") if author else None) or "?"
@@ -167,7 +132,7 @@ def _format_details(data: dict) -> str:
     return "\n".join(lines)
 
 
-def fetch_details(repo: str, num: int) -> str:
+def fetch_details(repo: str, num: int) -> dict | None:
     env = load_gh_token_env()
     try:
         result = subprocess.run(
@@ -186,19 +151,59 @@ def fetch_details(repo: str, num: int) -> str:
             timeout=120,
             env=env,
         )
+        note_gh_result(result)
         if result.returncode != 0:
-            return "_Could not load details_"
+            return None
         raw = result.stdout
     except (subprocess.TimeoutExpired, OSError):
-        return "_Could not load details_"
+        return None
     try:
-        data = json.loads(raw)
+        return json.loads(raw)
     except json.JSONDecodeError:
-        return "_Could not load details_"
-    return _format_details(data)
+        return None
+
+
+# ``review_context`` keys -> the ``gh pr view --json`` keys they summarise.
+_REVIEW_CONTEXT_KEYS = {
+    "reviewTotal": "reviews",
+    "latestReviewSample": "latestReviews",
+    "recentComments": "comments",
+}
 
 
-def _fetch_task_wrapper(args: tuple[str, dict]) -> tuple[int, str] | None:
+def _review_context_details(node: dict | None) -> dict | None:
+    """A ``review_context`` node shaped like ``fetch_details`` output."""
+    if node is None:
+        return None
+    details = {"reviewDecision": node.get("reviewDecision")}
+    for key, gh_key in _REVIEW_CONTEXT_KEYS.items():
+        details[gh_key] = node.get(key)
+    return details
+
+
+def fetch_details_batch(
+    repo: str, nums: list[int], store: PRStore | None = None
+) -> dict[int, dict | None]:
+    """Review context of every PR in a few aliased GraphQL queries.
+
+    Only the counts and the entries ``_format_details`` prints are fetched
+    (the ``review_context`` field group), not whole review histories.
+    """
+    refs = {num: PRReference.from_parts(repo, str(num)) for num in nums}
+    if store is not None:
+        nodes = ensure_fields(
+            store, refs.values(), ("review_context",), gh_cache.run_json
+        )
+    else:
+        nodes = fetch_pull_requests(
+            gh_cache.run_json,
+            refs.values(),
+            FIELD_GROUPS["review_context"].selection,
+        )
+    return {num: _review_context_details(nodes.get(ref)) for num, ref in refs.items()}
+
+
+def _fetch_task_wrapper(args: tuple[str, dict]) -> tuple[int, dict | None] | None:
     repo, pr = args
     num = pr.get("number")
     if num is None:
@@ -230,7 +235,7 @@ def _format_pr_row(pr: dict) -> str:
     return "| " + " | ".join(row_parts) + " |"
 
 
-def _print_details_section(data: list) -> None:
+def _print_details_section(data: list, store: PRStore | None = None) -> None:
     repo = os.environ.get("GH_DETAIL_REPO", "")
     if not repo:
         print("\n_Details skipped: internal error (no repo env)._")
@@ -238,23 +243,52 @@ def _print_details_section(data: list) -> None:
 
     print("\n#### Review / comment context\n")
 
-    tasks = [(repo, pr) for pr in data]
+    details: dict[int, dict | None] = {}
+    if os.environ.get("GH_DETAILS_MODE", "batch") != "per-pr":
+        nums = [pr["number"] for pr in data if pr.get("number") is not None]
+        details = fetch_details_batch(repo, nums, store)
 
-    # ⚡ Bolt Optimization: Use ThreadPoolExecutor for concurrent I/O-bound GitHub API calls
-    with concurrent.futures.ThreadPoolExecutor(
-        max_workers=min(len(tasks) or 1, 32)
-    ) as executor:
+    # PRs the batch could not load (or per-PR mode) reuse the full review
+    # lists (the ``reviews`` group, the same shape ``gh pr view`` returns)
+    # stored since the PR last changed, else one ``gh pr view`` each.
+    tasks = []
+    for pr in data:
+        num = pr.get("number")
+        if details.get(num) is not None:
+            continue
+        cached = store.fields(repo, int(num), "reviews") if store and num else None
+        if cached is not None:
+            details[num] = cached
+        else:
+            tasks.append((repo, pr))
+
+    # ⚡ Bolt Optimization: Concurrent I/O-bound GitHub API calls, AIMD-paced
+    with AdaptiveExecutor() as executor:
         results = list(executor.map(_fetch_task_wrapper, tasks))
 
+    updated_at = {pr.get("number"): pr.get("updatedAt") for pr in data}
     for res in results:
         if res:
-            num, details = res
-            print(f"**PR #{num}**\n")
-            print(details)
-            print()
+            num, fetched = res
+            details[num] = fetched
+            if store and fetched is not None:
+                store.put_fields(repo, int(num), "reviews", fetched, updated_at[num])
+
+    for pr in data:
+        num = pr.get("number")
+        if num not in details:
+            continue
+        print(f"**PR #{num}**\n")
+        if details[num] is None:
+            print("_Could not load details_")
+        else:
+            print(_format_details(details[num]))
+        print()
 
 
-def print_table(data: list, include_details: bool) -> None:
+def print_table(
+    data: list, include_details: bool, store: PRStore | None = None
+) -> None:
     print(
         "| # | Draft | Title | Author | Branch | Merge | Checks | "
         "Automation hints | URL |"
@@ -264,7 +298,7 @@ def print_table(data: list, include_details: bool) -> None:
         print(_format_pr_row(pr))
 
     if include_details:
-        _print_details_section(data)
+        _print_details_section(data, store)
 
 
 def main() -> int:
@@ -281,7 +315,15 @@ def main() -> int:
     if not data:
         print("_No open PRs._\n")
         return 0
-    print_table(data, include_details)
+    repo = os.environ.get("GH_DETAIL_REPO", "")
+    if not repo:
+        print_table(data, include_details)
+        return 0
+    # Share this listing with the triage scripts; it is filtered by
+    # get_prs.sh, so it must not advance the store's sync watermark.
+    with PRStore(default_store_path()) as store:
+        store.record(repo, [pr for pr in data if "updatedAt" in pr])
+        print_table(data, include_details, store)
     return 0
 
 
@@ -9,6 +9,10 @@ then saves it to Readwise Reader.
 Usage:
     python3.15 morning-brief.py              # Normal run → saves to Readwise
     python3.15 morning-brief.py --dry-run    # Writes HTML to stdout / temp file
+    python3.15 morning-brief.py --no-llm-cache  # Ignore cached LLM replies
+    python3.15 morning-brief.py --profile    # Print per-section timings to stderr
+    python3.15 morning-brief.py --profile-trace brief.json
+                                             # ...and write a Chrome/Perfetto trace
 
 Required env vars:
     READWISE_TOKEN
@@ -33,6 +37,19 @@ Cache control:
     MORNING_BRIEF_CACHE_DIR           (default: ~/.cache/morning-brief)
     MORNING_BRIEF_WEATHER_CACHE_TTL   (default: 1800, seconds)
     MORNING_BRIEF_FEED_CACHE_TTL      (default: 900, seconds)
+    MORNING_BRIEF_FEED_MAX_BYTES      (default: 5242880; per-feed download cap)
+    MORNING_BRIEF_FEED_PARSE_PROCESSES (default: 0; >0 parses feeds in a
+                                       process pool of this size)
+    MORNING_BRIEF_LINEAR_CACHE_TTL    (default: 600, seconds)
+    MORNING_BRIEF_SEEN_ITEMS_WINDOW   (default: 259200, seconds; news items
+                                       shown on an earlier day within this
+                                       window are skipped, 0 disables)
+    MORNING_BRIEF_MAX_STALENESS       (default: 0, seconds; >0 serves expired
+                                       weather/feed entries up to this age and
+                                       refreshes them in the background)
+    MORNING_BRIEF_LLM_CACHE_TTL       (default: 1209600, seconds)
+    MORNING_BRIEF_LLM_CACHE_MAX_ENTRIES (default: 500)
+    MORNING_BRIEF_LLM_CACHE_BYPASS    (default: 0; or pass --no-llm-cache)
 """
 
 # Required parameters:
@@ -55,22 +72,30 @@ if str(_REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(_REPO_ROOT))
 
 import concurrent.futures
+import contextlib
 import datetime as dt
+import functools
 import hashlib
+import heapq
 import html
+import io
 import json
 import logging
 import os
 import re
 import tempfile
+import threading
 import time
-from dataclasses import dataclass, field
+import urllib.parse
+from dataclasses import asdict, dataclass, field
 from html.parser import HTMLParser
-from typing import Any, Iterable, Optional
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Optional
 
-import feedparser
-import requests
-from dotenv import load_dotenv
+# feedparser, requests (via lib.safe_http) and dotenv are imported on first
+# use so that disabled sections, --dry-run runs and test imports do not pay
+# for them at startup. See ``_LAZY_MODULES`` and the wrappers below.
+if TYPE_CHECKING:
+    import requests
 
 # ============================================================
 # Constants
@@ -79,7 +104,34 @@ from dotenv import load_dotenv
 APP_NAME = "morning-brief"
 APP_VERSION = "3.0"
 
-from lib.safe_http import build_safe_session, safe_request
+
+def safe_request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    """Lazily-imported ``lib.safe_http.safe_request``."""
+    from lib.safe_http import safe_request as _safe_request
+
+    return _safe_request(method, url, **kwargs)
+
+
+def build_safe_session(**kwargs: Any) -> requests.Session:
+    """Lazily-imported ``lib.safe_http.build_safe_session``."""
+    from lib.safe_http import build_safe_session as _build_safe_session
+
+    return _build_safe_session(**kwargs)
+
+
+_LAZY_MODULES = frozenset({"feedparser", "requests"})
+
+
+def __getattr__(name: str) -> Any:
+    # Keeps ``module.feedparser`` / ``module.requests`` available to callers
+    # (and mock.patch) without importing them at module load.
+    if name in _LAZY_MODULES:
+        import importlib
+
+        module = importlib.import_module(name)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 MORNING_BRIEF_ALLOWED_HOSTS = frozenset(
     {
@@ -119,11 +171,8 @@ READWISE_SAVE_URL = "https://readwise.io/api/v3/save"
 PERPLEXITY_CHAT_URL = "https://api.perplexity.ai/chat/completions"
 LINEAR_GRAPHQL_URL = "https://api.linear.app/graphql"
 
-LINEAR_FOCUS_QUERY = """
-    query MorningBriefFocus {
-      viewer {
-        assignedIssues(first: 12, orderBy: updatedAt) {
-          nodes {
+# Only the fields the focus/queue renderers and the issue scorer read.
+_LINEAR_ISSUE_FIELDS = """
             identifier
             title
             url
@@ -133,11 +182,52 @@ LINEAR_FOCUS_QUERY = """
             cycle { id }
             labels(first: 5) { nodes { name } }
             state { name type }
-          }
+"""
+
+# One round-trip for both the focus issues and the notification queue.
+LINEAR_BRIEF_QUERY = (
+    """
+    query MorningBriefLinear($first: Int!) {
+      focus: viewer {
+        assignedIssues(first: $first, orderBy: updatedAt) {
+          nodes {"""
+    + _LINEAR_ISSUE_FIELDS
+    + """          }
+          pageInfo { hasNextPage endCursor }
+        }
+      }
+      unread: notificationsUnreadCount
+      queue: notifications(first: 25, orderBy: updatedAt) {
+        nodes {
+          category
+          title
+          subtitle
+          url
+          inboxUrl
+          readAt
+          updatedAt
+        }
+      }
+    }
+"""
+)
+
+LINEAR_FOCUS_PAGE_QUERY = (
+    """
+    query MorningBriefFocusPage($first: Int!, $after: String!) {
+      focus: viewer {
+        assignedIssues(first: $first, after: $after, orderBy: updatedAt) {
+          nodes {"""
+    + _LINEAR_ISSUE_FIELDS
+    + """          }
+          pageInfo { hasNextPage endCursor }
         }
       }
     }
 """
+)
+LINEAR_FOCUS_PAGE_SIZE = 50
+LINEAR_MAX_FOCUS_PAGES = 4
 AMERICA_ADAPTS_RSS_URL = "https://americaadapts.libsyn.com/rss"
 
 DEFAULT_TIMEOUT = 10
@@ -145,6 +235,8 @@ HOROSCOPE_TIMEOUT = 8
 LLM_MAX_TOKENS_SUMMARY = 100
 LLM_MAX_TOKENS_GREETING = 150
 MAX_LLM_INPUT_CHARS = 3000
+LLM_SUMMARY_BATCH_SIZE = 5
+LLM_SUMMARY_CACHE_TTL = 30 * 86400
 SUMMARY_TRUNCATE_LEN = 150
 DEFAULT_FOCUS_MAX_ITEMS = 3
 
@@ -154,6 +246,28 @@ DEFAULT_ZODIAC_SIGN = "cancer"
 
 DEFAULT_WEATHER_CACHE_TTL = 1800
 DEFAULT_FEED_CACHE_TTL = 900
+DEFAULT_FEED_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_LINEAR_CACHE_TTL = 600
+DEFAULT_SEEN_ITEMS_WINDOW = 3 * 86400
+SEEN_SUMMARY_WORDS = 30
+FRAGMENT_CACHE_TTL = 86400
+DEFAULT_FRAGMENT_CACHE_MAX_ENTRIES = 200
+READER_PAYLOAD_CHUNK_SIZE = 64 * 1024
+DEFAULT_FEED_PARSE_PROCESSES = 0
+FEED_READ_CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_STALENESS = 0
+DEFAULT_LLM_CACHE_TTL = 14 * 86400
+DEFAULT_LLM_CACHE_MAX_ENTRIES = 500
+BACKGROUND_REFRESH_TIMEOUT = 30
+
+HEDGE_DEFAULT_DELAY = 1.0
+HEDGE_MIN_DELAY = 0.05
+HEDGE_MIN_SAMPLES = 5
+# Never wait longer than this share of the call's timeout before hedging.
+HEDGE_MAX_DELAY_FRACTION = 0.5
+LATENCY_SAMPLE_WINDOW = 20
+LATENCY_HISTORY_TTL = 7 * 86400
+LATENCY_CACHE_KEY = "endpoint-latency"
 
 FEEDS: dict[str, str] = {
     "🔍 The Lens": "https://thelensnola.org/feed/",
@@ -271,13 +385,25 @@ class AppConfig:
     cache_dir: str = ""
     weather_cache_ttl: int = DEFAULT_WEATHER_CACHE_TTL
     feed_cache_ttl: int = DEFAULT_FEED_CACHE_TTL
+    linear_cache_ttl: int = DEFAULT_LINEAR_CACHE_TTL
+    seen_items_window: int = DEFAULT_SEEN_ITEMS_WINDOW
+    max_staleness: int = DEFAULT_MAX_STALENESS
+    feed_max_bytes: int = DEFAULT_FEED_MAX_BYTES
+    feed_parse_processes: int = DEFAULT_FEED_PARSE_PROCESSES
+    llm_cache_ttl: int = DEFAULT_LLM_CACHE_TTL
+    llm_cache_max_entries: int = DEFAULT_LLM_CACHE_MAX_ENTRIES
+    llm_cache_bypass: bool = False
     dry_run: bool = False
+    profile: bool = False
+    profile_trace: str = ""
 
     @classmethod
     def _load_env_source(cls) -> Path:
         preferred = Path.home() / ".config" / "morning-brief.env"
         fallback = Path(__file__).with_name(".env")
         env_source = preferred if preferred.exists() else fallback
+        from dotenv import load_dotenv
+
         load_dotenv(env_source)
         return env_source
 
@@ -296,7 +422,9 @@ class AppConfig:
         env_source = cls._load_env_source()
 
         readwise_token = os.getenv("READWISE_TOKEN", "").strip()
-        dry_run = "--dry-run" in (argv or sys.argv[1:])
+        args = argv or sys.argv[1:]
+        dry_run = "--dry-run" in args
+        profile_trace = _flag_value(args, "--profile-trace")
 
         if not readwise_token and not dry_run:
             print("Error: READWISE_TOKEN is not set.", file=sys.stderr)
@@ -325,7 +453,34 @@ class AppConfig:
             feed_cache_ttl=_safe_int(
                 "MORNING_BRIEF_FEED_CACHE_TTL", DEFAULT_FEED_CACHE_TTL
             ),
+            linear_cache_ttl=_safe_int(
+                "MORNING_BRIEF_LINEAR_CACHE_TTL", DEFAULT_LINEAR_CACHE_TTL
+            ),
+            seen_items_window=_safe_int(
+                "MORNING_BRIEF_SEEN_ITEMS_WINDOW", DEFAULT_SEEN_ITEMS_WINDOW
+            ),
+            max_staleness=_safe_int(
+                "MORNING_BRIEF_MAX_STALENESS", DEFAULT_MAX_STALENESS
+            ),
+            feed_max_bytes=_safe_int(
+                "MORNING_BRIEF_FEED_MAX_BYTES", DEFAULT_FEED_MAX_BYTES
+            ),
+            feed_parse_processes=_safe_int(
+                "MORNING_BRIEF_FEED_PARSE_PROCESSES", DEFAULT_FEED_PARSE_PROCESSES
+            ),
+            llm_cache_ttl=_safe_int(
+                "MORNING_BRIEF_LLM_CACHE_TTL", DEFAULT_LLM_CACHE_TTL
+            ),
+            llm_cache_max_entries=_safe_int(
+                "MORNING_BRIEF_LLM_CACHE_MAX_ENTRIES", DEFAULT_LLM_CACHE_MAX_ENTRIES
+            ),
+            llm_cache_bypass=(
+                "--no-llm-cache" in args
+                or _env_bool("MORNING_BRIEF_LLM_CACHE_BYPASS", False)
+            ),
             dry_run=dry_run,
+            profile="--profile" in args or bool(profile_trace),
+            profile_trace=profile_trace,
         )
 
         logger.debug("Loaded env from: %s", config.env_source)
@@ -379,18 +534,70 @@ class LinearQueueSnapshot:
     notification_items: tuple[FocusItem, ...] = ()
 
 
+@dataclass(frozen=True)
+class LinearSnapshot:
+    focus_items: tuple[FocusItem, ...] = ()
+    queue: LinearQueueSnapshot = field(default_factory=LinearQueueSnapshot)
+
+    def to_cache(self) -> dict[str, Any]:
+        return {
+            "focus_items": [asdict(item) for item in self.focus_items],
+            "unread_count": self.queue.unread_count,
+            "review_items": [asdict(item) for item in self.queue.review_items],
+            "notification_items": [
+                asdict(item) for item in self.queue.notification_items
+            ],
+        }
+
+    @classmethod
+    def from_cache(cls, data: dict[str, Any]) -> "LinearSnapshot":
+        def _items(key: str) -> tuple[FocusItem, ...]:
+            return tuple(
+                FocusItem(**{**raw, "labels": tuple(raw.get("labels") or ())})
+                for raw in data.get(key) or ()
+            )
+
+        return cls(
+            focus_items=_items("focus_items"),
+            queue=LinearQueueSnapshot(
+                unread_count=data.get("unread_count", 0),
+                review_items=_items("review_items"),
+                notification_items=_items("notification_items"),
+            ),
+        )
+
+
+_UTC_OFFSET_PATTERN = re.compile(r"([+-])(\d{1,2}):?(\d{2})")
+
+
+def parse_utc_offset(value: str) -> dt.timezone | None:
+    """``"-05:00"`` as a fixed-offset timezone; None (local time) if malformed."""
+    match = _UTC_OFFSET_PATTERN.fullmatch((value or "").strip())
+    if not match:
+        return None
+    offset = dt.timedelta(hours=int(match.group(2)), minutes=int(match.group(3)))
+    if offset >= dt.timedelta(days=1):
+        return None
+    return dt.timezone(-offset if match.group(1) == "-" else offset)
+
+
 @dataclass(frozen=True)
 class DailyContext:
     today: dt.date
     today_iso: str
+    tz: dt.timezone | None = None
 
     @classmethod
     def build(cls, timezone_offset: str) -> "DailyContext":
-        today = dt.date.today()
+        tz = parse_utc_offset(timezone_offset)
+        if tz is None:
+            logger.warning("Invalid MORNING_BRIEF_TZ_OFFSET %r", timezone_offset)
+        today = dt.datetime.now(tz).date()
         today_iso = today.isoformat()
         return cls(
             today=today,
             today_iso=today_iso,
+            tz=tz,
         )
 
 
@@ -419,35 +626,151 @@ def _safe_int(key: str, default: int) -> int:
         return default
 
 
+def _flag_value(args: list[str], flag: str) -> str:
+    """Return the value of ``flag VALUE`` or ``flag=VALUE`` in ``args``."""
+    for index, arg in enumerate(args):
+        if arg == flag and index + 1 < len(args):
+            return args[index + 1]
+        if arg.startswith(f"{flag}="):
+            return arg.split("=", 1)[1]
+    return ""
+
+
 # ============================================================
 # Cache
 # ============================================================
 
 
+def _evict_entries(root: Path, ttl: int, max_entries: int, keep: Path) -> None:
+    """Delete ``*.json`` entries unused for ``ttl``, then the least recently
+    used over the cap (reads refresh an entry's mtime)."""
+    now = time.time()
+    entries: list[tuple[float, Path]] = []
+    for path in root.glob("*.json"):
+        if path == keep:
+            continue
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            continue
+        if now - mtime > ttl:
+            path.unlink(missing_ok=True)
+        else:
+            entries.append((mtime, path))
+    overflow = len(entries) + 1 - max_entries
+    if overflow > 0:
+        for _, path in sorted(entries)[:overflow]:
+            path.unlink(missing_ok=True)
+
+
+def _touch(path: Path) -> None:
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+class FragmentCache:
+    """Rendered HTML fragments keyed by a hash of their render inputs.
+
+    Every changed feed produces a new key, so the first write of each
+    instance evicts expired and excess entries the way
+    :class:`LLMResponseCache` does.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        *,
+        ttl: int = FRAGMENT_CACHE_TTL,
+        max_entries: int = DEFAULT_FRAGMENT_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self.root = Path(cache_dir) / "fragments"
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._pruned = False
+
+    def _path(self, kind: str, inputs: Any) -> Path:
+        canonical = json.dumps([kind, inputs], sort_keys=True, default=str)
+        return self.root / f"{hashlib.sha256(canonical.encode()).hexdigest()}.json"
+
+    def get(self, kind: str, inputs: Any) -> str | None:
+        path = self._path(kind, inputs)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            PROFILER.record_cache(False)
+            return None
+        rendered = data.get("html")
+        if time.time() - data.get("ts", 0) > self.ttl or not isinstance(rendered, str):
+            path.unlink(missing_ok=True)
+            PROFILER.record_cache(False)
+            return None
+        _touch(path)
+        PROFILER.record_cache(True)
+        return rendered
+
+    def set(self, kind: str, inputs: Any, rendered: str) -> None:
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            path = self._path(kind, inputs)
+            path.write_text(
+                json.dumps({"ts": time.time(), "html": rendered}), encoding="utf-8"
+            )
+            if not self._pruned:
+                self._pruned = True
+                _evict_entries(self.root, self.ttl, self.max_entries, keep=path)
+        except OSError as exc:
+            logger.debug("Fragment cache write error for %s: %s", kind, exc)
+
+
 class FileCache:
     """Lightweight JSON file cache with TTL."""
 
     def __init__(self, cache_dir: str) -> None:
         self.root = Path(cache_dir)
+        self.fragments = FragmentCache(cache_dir)
 
     def _key_path(self, key: str) -> Path:
         safe = hashlib.sha256(key.encode()).hexdigest()[:16]
         return self.root / f"{safe}.json"
 
-    def get(self, key: str, ttl: int) -> Any | None:
-        """Return cached value if fresh, else None."""
+    def _read(self, key: str) -> tuple[Any, float] | None:
+        """Return ``(value, age_seconds)`` for a stored entry, or None."""
         path = self._key_path(key)
         if not path.exists():
             return None
         try:
             data = json.loads(path.read_text(encoding="utf-8"))
-            if time.time() - data.get("ts", 0) > ttl:
-                return None
-            return data.get("value")
+            return data.get("value"), time.time() - data.get("ts", 0)
         except (json.JSONDecodeError, OSError, KeyError) as exc:
             logger.debug("Cache read error for %s: %s", key, exc)
             return None
 
+    def get(self, key: str, ttl: int) -> Any | None:
+        """Return cached value if fresh, else None."""
+        entry = self._read(key)
+        if entry is None or entry[1] > ttl:
+            PROFILER.record_cache(False)
+            return None
+        PROFILER.record_cache(True)
+        return entry[0]
+
+    def get_stale(
+        self, key: str, ttl: int, max_staleness: int
+    ) -> tuple[Any, bool] | None:
+        """Return ``(value, is_fresh)`` for entries at most ``max_staleness`` past ``ttl``."""
+        entry = self._read(key)
+        if entry is None:
+            PROFILER.record_cache(False)
+            return None
+        value, age = entry
+        if age > ttl + max(max_staleness, 0):
+            PROFILER.record_cache(False)
+            return None
+        PROFILER.record_cache(True)
+        return value, age <= ttl
+
     def set(self, key: str, value: Any) -> None:
         """Write a value into the cache."""
         try:
@@ -459,6 +782,503 @@ class FileCache:
             logger.debug("Cache write error for %s: %s", key, exc)
 
 
+class LLMResponseCache:
+    """Persistent, content-addressed cache of chat completion replies.
+
+    Entries are keyed by a SHA-256 of the canonical request payload (model,
+    messages and sampling parameters) and expire after ``ttl`` seconds. Reads
+    refresh an entry's mtime; the first write of each instance evicts the
+    least recently used entries beyond ``max_entries``.
+    With ``bypass`` set, lookups always miss but fresh replies are still
+    written, so a bypassed run refreshes the cache.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        *,
+        ttl: int = DEFAULT_LLM_CACHE_TTL,
+        max_entries: int = DEFAULT_LLM_CACHE_MAX_ENTRIES,
+        bypass: bool = False,
+    ) -> None:
+        self.root = Path(cache_dir) / "llm"
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._pruned = False
+
+    @staticmethod
+    def key_for(payload: dict[str, Any]) -> str:
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def _count(self, hit: bool) -> None:
+        PROFILER.record_cache(hit)
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, payload: dict[str, Any]) -> str | None:
+        """Return the cached reply for ``payload``, or None on a miss."""
+        if self.bypass:
+            self._count(False)
+            return None
+        path = self._path(self.key_for(payload))
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            self._count(False)
+            return None
+        content = data.get("content")
+        if time.time() - data.get("ts", 0) > self.ttl or not content:
+            path.unlink(missing_ok=True)
+            self._count(False)
+            return None
+        _touch(path)
+        self._count(True)
+        return content
+
+    def set(self, payload: dict[str, Any], content: str) -> None:
+        """Store a non-empty reply; the first write also prunes the cache."""
+        if not content:
+            return
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            path = self._path(self.key_for(payload))
+            path.write_text(
+                json.dumps({"ts": time.time(), "content": content}),
+                encoding="utf-8",
+            )
+            with self._lock:
+                prune, self._pruned = not self._pruned, True
+            if prune:
+                _evict_entries(self.root, self.ttl, self.max_entries, keep=path)
+        except OSError as exc:
+            logger.debug("LLM cache write error: %s", exc)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+_TRACKING_PARAMS = frozenset({"fbclid", "gclid", "mc_cid", "mc_eid", "ref"})
+_HEADLINE_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_feed_link(link: str) -> str:
+    """Canonical form of an item link for duplicate detection."""
+    parts = urllib.parse.urlsplit((link or "").strip())
+    if not parts.netloc:
+        return ""
+    host = parts.netloc.lower().removeprefix("www.")
+    query = urllib.parse.urlencode(
+        [
+            (key, value)
+            for key, value in urllib.parse.parse_qsl(parts.query)
+            if not key.lower().startswith("utm_")
+            and key.lower() not in _TRACKING_PARAMS
+        ]
+    )
+    path = parts.path.rstrip("/") or "/"
+    return f"{host}{path}" + (f"?{query}" if query else "")
+
+
+def _content_words(text: str, limit: int | None = None) -> str:
+    words = _HEADLINE_WORD_PATTERN.findall(html.unescape(text).lower())
+    return " ".join(words[:limit])
+
+
+def feed_item_fingerprints(entry: dict[str, str]) -> tuple[str, ...]:
+    """Return the link and content-hash keys that identify a feed item.
+
+    The content key covers the headline plus the opening of the summary, so
+    generic headlines ("Weather update") from different stories stay apart.
+    """
+    keys = []
+    link = normalize_feed_link(entry.get("link", ""))
+    if link:
+        keys.append(f"link:{link}")
+    title = entry.get("title") or ""
+    if title and title != "No Title":
+        headline = _content_words(title)
+        if headline:
+            summary = strip_html_tags(
+                html.unescape(entry.get("summary") or entry.get("description") or "")
+            )
+            content = f"{headline}\n{_content_words(summary, SEEN_SUMMARY_WORDS)}"
+            keys.append(f"content:{hashlib.sha256(content.encode()).hexdigest()[:20]}")
+    return tuple(keys)
+
+
+class SeenItemsIndex:
+    """Persistent record of news items already shown, over a rolling window.
+
+    Items are matched by normalised link or by a hash of the headline and
+    summary opening, so syndicated copies collapse into the first feed that
+    carried them. An item first shown on an earlier day (in ``tz``, local
+    time by default) within ``window`` seconds is skipped; items first shown
+    today stay visible so re-runs render the same brief.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        *,
+        window: int = DEFAULT_SEEN_ITEMS_WINDOW,
+        now: float | None = None,
+        tz: dt.tzinfo | None = None,
+    ) -> None:
+        self.path = Path(cache_dir) / "seen-items.json"
+        self.window = window
+        self.now = time.time() if now is None else now
+        midnight = dt.datetime.fromtimestamp(self.now, tz).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        self._day_start = midnight.timestamp()
+        self.skipped = 0
+        self._seen: dict[str, float] = {}
+        if window > 0:
+            try:
+                stored = json.loads(self.path.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, OSError):
+                stored = {}
+            cutoff = self.now - window
+            self._seen = {
+                key: ts
+                for key, ts in (stored.items() if isinstance(stored, dict) else ())
+                if isinstance(ts, (int, float)) and ts >= cutoff
+            }
+
+    def _shown_earlier(self, keys: tuple[str, ...]) -> bool:
+        return any(self._seen.get(key, self.now) < self._day_start for key in keys)
+
+    def filter(
+        self, entries_by_feed: list[list[dict[str, str]]]
+    ) -> list[list[dict[str, str]]]:
+        """Drop repeats across feeds (first feed wins) and from earlier days."""
+        in_run: set[str] = set()
+        result = []
+        for entries in entries_by_feed:
+            kept = []
+            for entry in entries:
+                keys = feed_item_fingerprints(entry)
+                if any(key in in_run for key in keys) or self._shown_earlier(keys):
+                    self.skipped += 1
+                    continue
+                in_run.update(keys)
+                for key in keys:
+                    self._seen.setdefault(key, self.now)
+                kept.append(entry)
+            result.append(kept)
+        return result
+
+    def save(self) -> None:
+        if self.window <= 0:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self._seen), encoding="utf-8")
+            tmp.replace(self.path)
+        except OSError as exc:
+            logger.debug("Seen-items write error: %s", exc)
+
+
+class BackgroundRefresher:
+    """Refresh expired cache entries off the critical path of the current run.
+
+    Stale values are rendered immediately; the refresh result only lands in
+    the cache, so it is picked up by the next scheduled run.
+    """
+
+    def __init__(self, max_staleness: int, max_workers: int = 4) -> None:
+        self.max_staleness = max_staleness
+        self._max_workers = max_workers
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+        self._pending: dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key: str, fn: Any, *args: Any) -> None:
+        """Schedule ``fn(*args)`` once per cache key."""
+        with self._lock:
+            if key in self._pending:
+                return
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="brief-refresh",
+                )
+            self._pending[key] = self._executor.submit(fn, *args)
+
+    def drain(self, timeout: float = BACKGROUND_REFRESH_TIMEOUT) -> int:
+        """Wait up to ``timeout`` seconds for refreshes; return how many finished."""
+        with self._lock:
+            futures = list(self._pending.values())
+            executor = self._executor
+        if executor is None:
+            return 0
+        done, not_done = concurrent.futures.wait(futures, timeout=timeout)
+        for future in done:
+            if future.exception():
+                logger.debug("Background refresh failed: %s", future.exception())
+        if not_done:
+            logger.warning(
+                "%d background refresh(es) still running after %ss",
+                len(not_done),
+                timeout,
+            )
+        executor.shutdown(wait=False, cancel_futures=True)
+        return len(done)
+
+
+def _read_through(
+    cache: FileCache,
+    key: str,
+    ttl: int,
+    refresher: BackgroundRefresher | None,
+    refresh_fn: Any,
+    *refresh_args: Any,
+) -> Any | None:
+    """Return a cached value, serving stale entries when a refresher is active."""
+    if refresher is None:
+        return cache.get(key, ttl)
+    entry = cache.get_stale(key, ttl, refresher.max_staleness)
+    if entry is None:
+        return None
+    value, fresh = entry
+    if value and not fresh:
+        logger.info("Serving stale cache entry for %s; refreshing in background", key)
+        refresher.submit(key, refresh_fn, *refresh_args)
+    return value
+
+
+# ============================================================
+# Profiling
+# ============================================================
+
+
+@dataclass
+class ProfileSpan:
+    name: str
+    category: str
+    thread_id: int
+    start: float
+    end: float = 0.0
+    network_s: float = 0.0
+    requests: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    bytes: int = 0
+    retries: int = 0
+
+    @property
+    def wall_s(self) -> float:
+        return self.end - self.start
+
+
+class RunProfiler:
+    """Collect per-section timings for ``--profile`` runs.
+
+    Spans are tracked per thread; HTTP responses and cache lookups made while
+    a span is open are attributed to the innermost span on that thread.
+    Work handed to a pool is attributed to the submitting span when the
+    callable is wrapped with :meth:`bind`. Network time is the time to
+    response headers (``Response.elapsed``) plus any streamed body reads.
+    Disabled profilers do no bookkeeping.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.spans: list[ProfileSpan] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self) -> None:
+        self.enabled = True
+        self._origin = time.perf_counter()
+
+    def _current(self) -> ProfileSpan | None:
+        stack = getattr(self._local, "stack", None)
+        return stack[-1] if stack else None
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = "fetch") -> Iterator[ProfileSpan | None]:
+        if not self.enabled:
+            yield None
+            return
+        record = ProfileSpan(
+            name=name,
+            category=category,
+            thread_id=threading.get_ident(),
+            start=time.perf_counter() - self._origin,
+        )
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(record)
+        try:
+            yield record
+        finally:
+            stack.pop()
+            record.end = time.perf_counter() - self._origin
+            with self._lock:
+                self.spans.append(record)
+
+    def bind(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap ``fn`` to run under the calling thread's current span.
+
+        Call this where work is submitted, so requests made on executor
+        threads count toward the span that started them.
+        """
+        parent = self._current() if self.enabled else None
+        if parent is None:
+            return fn
+
+        @functools.wraps(fn)
+        def bound(*args: Any, **kwargs: Any) -> Any:
+            stack = self._local.__dict__.setdefault("stack", [])
+            stack.append(parent)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                stack.pop()
+
+        return bound
+
+    def profile(self, name: str, category: str = "fetch") -> Callable:
+        """Decorator form of :meth:`span`."""
+
+        def decorator(fn: Callable) -> Callable:
+            @functools.wraps(fn)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with self.span(name, category):
+                    return fn(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def record_cache(self, hit: bool) -> None:
+        current = self._current() if self.enabled else None
+        if current is None:
+            return
+        # Bound workers share spans across threads.
+        with self._lock:
+            if hit:
+                current.cache_hits += 1
+            else:
+                current.cache_misses += 1
+
+    def record_response(self, response: Any, *args: Any, **kwargs: Any) -> None:
+        """``requests`` response hook: add elapsed time, size and retries."""
+        current = self._current() if self.enabled else None
+        if current is None:
+            return
+        elapsed = getattr(response, "elapsed", None)
+        retries = getattr(getattr(response, "raw", None), "retries", None)
+        nbytes = 0 if kwargs.get("stream") else len(response.content or b"")
+        with self._lock:
+            current.requests += 1
+            if elapsed is not None:
+                current.network_s += elapsed.total_seconds()
+            current.retries += len(getattr(retries, "history", ()) or ())
+            current.bytes += nbytes
+
+    def record_read(self, nbytes: int, seconds: float) -> None:
+        current = self._current() if self.enabled else None
+        if current is None:
+            return
+        with self._lock:
+            current.bytes += nbytes
+            current.network_s += seconds
+
+    def rows(self) -> list[dict[str, Any]]:
+        """Aggregate spans by name, slowest first."""
+        grouped: dict[str, dict[str, Any]] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            row = grouped.setdefault(
+                span.name,
+                {
+                    "name": span.name,
+                    "calls": 0,
+                    "wall_s": 0.0,
+                    "network_s": 0.0,
+                    "cache_hits": 0,
+                    "cache_misses": 0,
+                    "bytes": 0,
+                    "retries": 0,
+                },
+            )
+            row["calls"] += 1
+            row["wall_s"] += span.wall_s
+            row["network_s"] += span.network_s
+            row["cache_hits"] += span.cache_hits
+            row["cache_misses"] += span.cache_misses
+            row["bytes"] += span.bytes
+            row["retries"] += span.retries
+        return sorted(grouped.values(), key=lambda r: (-r["wall_s"], r["name"]))
+
+    def format_table(self) -> str:
+        lines = [
+            f"{'span':<36} {'calls':>5} {'wall ms':>9} {'net ms':>9} "
+            f"{'cache h/m':>9} {'bytes':>10} {'retries':>7}"
+        ]
+        for row in self.rows():
+            cache = f"{row['cache_hits']}/{row['cache_misses']}"
+            lines.append(
+                f"{row['name'][:36]:<36} {row['calls']:>5} "
+                f"{row['wall_s'] * 1000:>9.1f} {row['network_s'] * 1000:>9.1f} "
+                f"{cache:>9} {row['bytes']:>10} {row['retries']:>7}"
+            )
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """Return spans in the Trace Event format (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            "traceEvents": [
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": round(span.start * 1_000_000),
+                    "dur": round(span.wall_s * 1_000_000),
+                    "pid": pid,
+                    "tid": span.thread_id,
+                    "args": {
+                        "network_ms": round(span.network_s * 1000, 3),
+                        "requests": span.requests,
+                        "cache_hits": span.cache_hits,
+                        "cache_misses": span.cache_misses,
+                        "bytes": span.bytes,
+                        "retries": span.retries,
+                    },
+                }
+                for span in sorted(spans, key=lambda sp: sp.start)
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def write_trace(self, path: str) -> None:
+        Path(path).write_text(json.dumps(self.chrome_trace()), encoding="utf-8")
+
+
+PROFILER = RunProfiler()
+
+
 # ============================================================
 # HTTP + LLM
 # ============================================================
@@ -476,19 +1296,73 @@ def build_retry_session(
             "Accept": "application/json, text/html;q=0.9, */*;q=0.8",
         }
     )
+    if PROFILER.enabled:
+        session.hooks["response"].append(PROFILER.record_response)
     return session
 
 
+PODCAST_SUMMARY_PROMPT = (
+    "You are a highly efficient assistant. Summarize the provided "
+    "podcast show notes in exactly two concise sentences. Focus on "
+    "the core environmental or scientific takeaways."
+)
+
+PODCAST_BATCH_SUMMARY_PROMPT = (
+    "You are a highly efficient assistant. You will receive several numbered "
+    "podcast show notes. Summarize each one in exactly two concise sentences, "
+    "focusing on the core environmental or scientific takeaways. Respond with "
+    "only a JSON array of strings, one summary per item, in the same order."
+)
+
+_JSON_ARRAY_PATTERN = re.compile(r"\[.*\]", re.DOTALL)
+_NUMBERED_LINE_PATTERN = re.compile(r"^\s*(\d+)[.):]\s*(.+?)\s*$", re.MULTILINE)
+
+
+def _summary_cache_key(text: str) -> str:
+    return "llm-summary:" + hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def parse_batch_summaries(raw: str, expected: int) -> list[str] | None:
+    """Parse a batched summary reply into ``expected`` strings, or None."""
+    match = _JSON_ARRAY_PATTERN.search(raw or "")
+    if match:
+        try:
+            parsed = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            parsed = None
+        if (
+            isinstance(parsed, list)
+            and len(parsed) == expected
+            and all(isinstance(item, str) for item in parsed)
+        ):
+            return [item.strip() for item in parsed]
+
+    numbered = {
+        int(num): text for num, text in _NUMBERED_LINE_PATTERN.findall(raw or "")
+    }
+    if expected and all(i in numbered for i in range(1, expected + 1)):
+        return [numbered[i] for i in range(1, expected + 1)]
+    return None
+
+
 class PerplexityClient:
     """Thin wrapper around Perplexity chat completions."""
 
-    def __init__(self, api_key: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        cache: FileCache | None = None,
+        response_cache: LLMResponseCache | None = None,
+    ) -> None:
         self.api_key = api_key.strip()
+        self.cache = cache
+        self.response_cache = response_cache
 
     @property
     def enabled(self) -> bool:
         return bool(self.api_key)
 
+    @PROFILER.profile("llm:chat")
     def chat(
         self,
         system_prompt: str,
@@ -497,21 +1371,28 @@ class PerplexityClient:
         max_tokens: int,
         temperature: float,
         session: requests.Session | None = None,
+        input_limit: int = MAX_LLM_INPUT_CHARS,
     ) -> str:
-        if not self.enabled or not user_content.strip():
+        if not user_content.strip():
             return ""
 
-        working = session or build_retry_session(total=2, backoff_factor=0.5)
         payload = {
             "model": "sonar",
             "messages": [
                 {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_content[:MAX_LLM_INPUT_CHARS]},
+                {"role": "user", "content": user_content[:input_limit]},
             ],
             "max_tokens": max_tokens,
             "temperature": temperature,
         }
+        if self.response_cache is not None:
+            cached = self.response_cache.get(payload)
+            if cached is not None:
+                return cached
+        if not self.enabled:
+            return ""
 
+        working = session or build_retry_session(total=2, backoff_factor=0.5)
         try:
             response = safe_request(
                 "POST",
@@ -530,7 +1411,10 @@ class PerplexityClient:
             _choices = data.get("choices")
             _first_choice = _choices[0] if _choices else {}
             _message = _first_choice.get("message")
-            return (_message.get("content", "") if _message else "").strip()
+            content = (_message.get("content", "") if _message else "").strip()
+            if self.response_cache is not None:
+                self.response_cache.set(payload, content)
+            return content
         except Exception as exc:
             logger.error("Perplexity API error: %s", exc)
             return ""
@@ -539,17 +1423,77 @@ class PerplexityClient:
         self, text: str, session: requests.Session | None = None
     ) -> str:
         return self.chat(
-            (
-                "You are a highly efficient assistant. Summarize the provided "
-                "podcast show notes in exactly two concise sentences. Focus on "
-                "the core environmental or scientific takeaways."
-            ),
+            PODCAST_SUMMARY_PROMPT,
             text,
             max_tokens=LLM_MAX_TOKENS_SUMMARY,
             temperature=0.5,
             session=session,
         )
 
+    @PROFILER.profile("llm:summarize")
+    def summarize_batch(
+        self, texts: list[str], session: requests.Session | None = None
+    ) -> list[str]:
+        """Summarize several show notes with one request per batch.
+
+        Summaries are cached by a content hash of the input text, so an
+        unchanged description is never sent to the API twice. Items that
+        cannot be summarized come back as empty strings.
+        """
+        results = [""] * len(texts)
+        pending: dict[str, list[int]] = {}
+        for index, text in enumerate(texts):
+            cleaned = (text or "").strip()
+            if not cleaned:
+                continue
+            key = _summary_cache_key(cleaned)
+            cached = self.cache.get(key, LLM_SUMMARY_CACHE_TTL) if self.cache else None
+            if cached:
+                results[index] = cached
+            else:
+                pending.setdefault(key, []).append(index)
+
+        if not pending or not (self.enabled or self.response_cache is not None):
+            return results
+
+        keys = list(pending)
+        for start in range(0, len(keys), LLM_SUMMARY_BATCH_SIZE):
+            chunk = keys[start : start + LLM_SUMMARY_BATCH_SIZE]
+            chunk_texts = [texts[pending[key][0]].strip() for key in chunk]
+            summaries = self._summarize_chunk(chunk_texts, session)
+            for key, summary in zip(chunk, summaries):
+                for index in pending[key]:
+                    results[index] = summary
+                if summary and self.cache:
+                    self.cache.set(key, summary)
+        return results
+
+    def _summarize_chunk(
+        self, texts: list[str], session: requests.Session | None
+    ) -> list[str]:
+        if len(texts) == 1:
+            return [self.summarize_podcast(texts[0], session=session)]
+
+        user_content = "\n\n".join(
+            f"Item {i}:\n{text[:MAX_LLM_INPUT_CHARS]}"
+            for i, text in enumerate(texts, start=1)
+        )
+        raw = self.chat(
+            PODCAST_BATCH_SUMMARY_PROMPT,
+            user_content,
+            max_tokens=LLM_MAX_TOKENS_SUMMARY * len(texts),
+            temperature=0.5,
+            session=session,
+            input_limit=MAX_LLM_INPUT_CHARS * len(texts) + 16 * len(texts),
+        )
+        parsed = parse_batch_summaries(raw, len(texts))
+        if parsed is not None:
+            return parsed
+        logger.warning(
+            "Could not parse batched summary reply; falling back to per-item calls."
+        )
+        return [self.summarize_podcast(text, session=session) for text in texts]
+
     def generate_greeting(
         self,
         weather_narrative: str,
@@ -572,6 +1516,172 @@ class PerplexityClient:
         )
 
 
+class EndpointLatencyTracker:
+    """Rolling per-endpoint latency samples, persisted between runs.
+
+    Failed attempts are stored as ``penalty`` seconds so unreliable endpoints
+    drift to the back of the order. Call :meth:`save` once at the end of a run.
+    """
+
+    def __init__(self, cache: FileCache | None = None, penalty: float = 10.0) -> None:
+        self._cache = cache
+        self._penalty = penalty
+        self._lock = threading.Lock()
+        stored = cache.get(LATENCY_CACHE_KEY, LATENCY_HISTORY_TTL) if cache else None
+        self._samples: dict[str, list[float]] = (
+            {k: list(v) for k, v in stored.items()} if isinstance(stored, dict) else {}
+        )
+
+    def record(self, name: str, seconds: float, ok: bool = True) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(name, [])
+            samples.append(round(seconds if ok else max(seconds, self._penalty), 4))
+            del samples[:-LATENCY_SAMPLE_WINDOW]
+
+    def p95(self, name: str) -> float | None:
+        with self._lock:
+            samples = sorted(self._samples.get(name, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+    def hedge_delay(self, name: str) -> float:
+        """Wait this long for ``name`` before sending the backup request."""
+        p95 = self.p95(name)
+        return max(HEDGE_MIN_DELAY, p95 if p95 is not None else HEDGE_DEFAULT_DELAY)
+
+    def order(self, names: list[str]) -> list[str]:
+        """Fastest p95 first; endpoints without enough samples keep their slot."""
+        def _key(name: str) -> float:
+            p95 = self.p95(name)
+            return p95 if p95 is not None else HEDGE_DEFAULT_DELAY
+
+        return sorted(names, key=_key)
+
+    def save(self) -> None:
+        if self._cache is None:
+            return
+        with self._lock:
+            snapshot = {k: list(v) for k, v in self._samples.items()}
+        self._cache.set(LATENCY_CACHE_KEY, snapshot)
+
+
+def hedged_call(
+    attempts: list[tuple[str, Callable[..., Any]]],
+    *,
+    timeout: float,
+    tracker: EndpointLatencyTracker | None = None,
+    hedge_delay: float | None = None,
+    session_factory: Callable[[], requests.Session] | None = None,
+) -> Any | None:
+    """Return the first truthy result from ``attempts``, hedging slow ones.
+
+    Attempts are ``(endpoint_name, fn)`` pairs. The first (fastest known)
+    endpoint starts immediately; the next is only sent once the previous one
+    has failed or has been outstanding for ``hedge_delay`` seconds (default:
+    its tracked p95 latency), capped at ``HEDGE_MAX_DELAY_FRACTION`` of
+    ``timeout``. When a winner returns, queued attempts are cancelled.
+
+    With ``session_factory``, each attempt is called as ``fn(session)`` with a
+    session of its own, and every session is closed once the call returns, so
+    in-flight losers drop their connections instead of running to completion
+    on a shared pool. Losers are neither logged nor recorded in ``tracker``.
+    Exceptions are logged and treated as failures; ``None`` means every
+    attempt failed or ``timeout`` elapsed.
+    """
+    if not attempts:
+        return None
+    if tracker is not None:
+        by_name = dict(attempts)
+        attempts = [(name, by_name[name]) for name in tracker.order(list(by_name))]
+
+    cancelled = threading.Event()
+    lock = threading.Lock()
+    sessions: list[requests.Session] = []
+
+    def _open_session() -> requests.Session | None:
+        session = session_factory()
+        with lock:
+            if cancelled.is_set():
+                session.close()
+                return None
+            sessions.append(session)
+        return session
+
+    def _run(name: str, fn: Callable[..., Any]) -> Any:
+        if cancelled.is_set():
+            return None
+        started = time.perf_counter()
+        ok = False
+        try:
+            if session_factory is None:
+                result = fn()
+            else:
+                session = _open_session()
+                result = fn(session) if session is not None else None
+            # An empty answer (a feed with no entries) is still a healthy endpoint.
+            ok = result is not None
+            return result
+        except Exception as exc:
+            if not cancelled.is_set():
+                logger.warning("Request to %s failed: %s", name, exc)
+            return None
+        finally:
+            if tracker is not None and not cancelled.is_set():
+                tracker.record(name, time.perf_counter() - started, ok)
+
+    def _close_sessions() -> None:
+        cancelled.set()
+        with lock:
+            for session in sessions:
+                session.close()
+
+    if len(attempts) == 1:
+        try:
+            return _run(*attempts[0]) or None
+        finally:
+            _close_sessions()
+
+    max_delay = timeout * HEDGE_MAX_DELAY_FRACTION
+    deadline = time.monotonic() + timeout
+    queue = list(attempts)
+    pending: dict[concurrent.futures.Future, str] = {}
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=len(attempts), thread_name_prefix="brief-hedge"
+    )
+    try:
+        while queue or pending:
+            if queue:
+                name, fn = queue.pop(0)
+                pending[executor.submit(PROFILER.bind(_run), name, fn)] = name
+                delay = hedge_delay
+                if delay is None:
+                    delay = (
+                        tracker.hedge_delay(name) if tracker else HEDGE_DEFAULT_DELAY
+                    )
+                delay = min(delay, max_delay)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            wait_for = min(remaining, delay) if queue else remaining
+            done, _ = concurrent.futures.wait(
+                pending,
+                timeout=wait_for,
+                return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+            for future in done:
+                pending.pop(future)
+                result = future.result()
+                if result:
+                    return result
+        return None
+    finally:
+        _close_sessions()
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 # ============================================================
 # Text + HTML Helpers (Pure)
 # ============================================================
@@ -598,6 +1708,68 @@ def strip_html_tags(text: str) -> str:
     return parser.get_text()
 
 
+# Tags, comments, declarations and processing instructions, with quoted
+# attribute values allowed to contain ``>``.
+_SUMMARY_TAG = r"<!--.*?-->|<[a-zA-Z/!?][^>\"']*(?:(?:\"[^\"]*\"|'[^']*')[^>\"']*)*>"
+_SUMMARY_TOKEN_PATTERN = re.compile(rf"({_SUMMARY_TAG})|([^<]+|<)", re.S)
+_SUMMARY_TAG_PATTERN = re.compile(_SUMMARY_TAG, re.S)
+# Markup HTMLParser reads differently from the tag pattern: comments and
+# declarations, raw-text script/style bodies, and a ``<`` opening a tag the
+# pattern could not close (e.g. an unbalanced quote).
+_SUMMARY_PARSER_ONLY = re.compile(r"<(?:[!?]|/?(?:script|style)\b)", re.I)
+_SUMMARY_UNCLOSED_TAG = re.compile(r"<[a-zA-Z/!?]")
+
+
+def _clean_summary_with_parser(raw: str, max_len: int) -> str:
+    return sanitize_text(truncate_text(strip_html_tags(html.unescape(raw)), max_len))
+
+
+def clean_summary(raw: str, max_len: int = SUMMARY_TRUNCATE_LEN) -> str:
+    """Return ``raw`` as escaped, tag-free text truncated to ``max_len``.
+
+    Produces the same output as ``sanitize_text(truncate_text(strip_html_tags(
+    html.unescape(raw)), max_len))`` in a single scan, and stops reading once
+    more than ``max_len`` characters of text have been collected. Markup the
+    scan cannot read the way HTMLParser does (comments, script/style,
+    unclosed tags, tags holding character references) is handed to that
+    chain instead.
+    """
+    raw = raw or ""
+    parts: list[str] = []
+    size = 0
+    for match in _SUMMARY_TOKEN_PATTERN.finditer(raw):
+        chunk = match.group(2)
+        if chunk is None:
+            # Unescaping can move a tag's boundaries (``<a&gt;>``), so any tag
+            # holding a reference is read by the chain instead.
+            tag = match.group(1)
+            if "&" in tag or _SUMMARY_PARSER_ONLY.match(tag):
+                return _clean_summary_with_parser(raw, max_len)
+            continue
+        if chunk == "<" and _SUMMARY_UNCLOSED_TAG.match(raw, match.start()):
+            return _clean_summary_with_parser(raw, max_len)
+        # Entity-encoded markup (``&lt;b&gt;``) becomes real tags after
+        # unescaping, and HTMLParser resolves character references once more.
+        decoded = html.unescape(chunk) if "&" in chunk else chunk
+        if "<" in decoded:
+            if _SUMMARY_PARSER_ONLY.search(decoded):
+                return _clean_summary_with_parser(raw, max_len)
+            decoded = _SUMMARY_TAG_PATTERN.sub("", decoded)
+            if _SUMMARY_UNCLOSED_TAG.search(decoded):
+                return _clean_summary_with_parser(raw, max_len)
+        if "&" in decoded:
+            decoded = html.unescape(decoded)
+        parts.append(decoded)
+        size += len(decoded)
+        if size > max_len and len("".join(parts).strip()) > max_len:
+            break
+
+    text = "".join(parts).strip()
+    if len(text) > max_len:
+        text = text[: max_len - 3].rstrip() + "..."
+    return html.escape(text, quote=True)
+
+
 def sanitize_text(value: Any) -> str:
     if value is None:
         return ""
@@ -615,10 +1787,15 @@ def html_li(content: str) -> str:
     return f"<li>{content}</li>"
 
 
+_EMPTY_LIST_HTML = (
+    '<ul><li class="empty-state"><span aria-hidden="true">📭</span> No items</li></ul>'
+)
+
+
 def html_ul(items: Iterable[str]) -> str:
     item_list = list(items)
     if not item_list:
-        return '<ul><li class="empty-state"><span aria-hidden="true">📭</span> No items</li></ul>'
+        return _EMPTY_LIST_HTML
     return f"<ul>{''.join(item_list)}</ul>"
 
 
@@ -646,18 +1823,95 @@ def _render_heading(level: int, title: str, id_attr: str = "") -> str:
 _SECTION_ID_PATTERN = re.compile(r"[^a-z0-9]+")
 
 
-def html_section(title: str, body: str) -> str:
+def _section_open(title: str, level: int, fallback_id: str) -> str:
     section_id = _SECTION_ID_PATTERN.sub("-", sanitize_text(title).lower()).strip("-")
     if not section_id:
-        section_id = "section"
-    return f'<section role="region" aria-labelledby="{section_id}">\n{_render_heading(3, title, section_id)}\n{body}\n</section>'
+        section_id = fallback_id
+    return f'<section role="region" aria-labelledby="{section_id}">\n{_render_heading(level, title, section_id)}\n'
+
+
+_SECTION_CLOSE = "\n</section>"
+
+
+def html_section(title: str, body: str) -> str:
+    return f"{_section_open(title, 3, 'section')}{body}{_SECTION_CLOSE}"
 
 
 def html_subsection(title: str, body: str) -> str:
-    section_id = _SECTION_ID_PATTERN.sub("-", sanitize_text(title).lower()).strip("-")
-    if not section_id:
-        section_id = "subsection"
-    return f'<section role="region" aria-labelledby="{section_id}">\n{_render_heading(4, title, section_id)}\n{body}\n</section>'
+    return f"{_section_open(title, 4, 'subsection')}{body}{_SECTION_CLOSE}"
+
+
+class BriefWriter:
+    """Stream HTML fragments into a single buffer.
+
+    Renderers write straight into the buffer instead of building and joining
+    intermediate strings; ``write_json_string`` later escapes the buffer in
+    chunks, so no escaped ``str`` of the whole brief is ever built (the
+    payload's final ``BytesIO.getvalue()`` is still one bytes copy).
+    """
+
+    def __init__(self) -> None:
+        self._buffer = io.StringIO()
+
+    def write(self, text: str) -> None:
+        if text:
+            self._buffer.write(text)
+
+    @contextlib.contextmanager
+    def section(self, title: str, level: int = 3) -> Iterator["BriefWriter"]:
+        self._buffer.write(
+            _section_open(title, level, "section" if level == 3 else "subsection")
+        )
+        yield self
+        self._buffer.write(_SECTION_CLOSE)
+
+    def ul(self, items: Iterable[str]) -> None:
+        """Write a ``<ul>``, falling back to the empty-state list for no items."""
+        opened = False
+        for item in items:
+            if not opened:
+                self._buffer.write("<ul>")
+                opened = True
+            self._buffer.write(item)
+        self._buffer.write("</ul>" if opened else _EMPTY_LIST_HTML)
+
+    def fragment(
+        self,
+        cache: FileCache | None,
+        kind: str,
+        inputs: Any,
+        render: Callable[["BriefWriter"], None],
+    ) -> None:
+        """Write a fragment, reusing a cached rendering of identical ``inputs``."""
+        if cache is None:
+            render(self)
+            return
+        cached = cache.fragments.get(kind, inputs)
+        if cached is not None:
+            self._buffer.write(cached)
+            return
+        sub = BriefWriter()
+        render(sub)
+        rendered = sub.getvalue()
+        cache.fragments.set(kind, inputs, rendered)
+        self._buffer.write(rendered)
+
+    def getvalue(self) -> str:
+        return self._buffer.getvalue()
+
+    def write_json_string(
+        self, out: io.BytesIO, chunk_size: int = READER_PAYLOAD_CHUNK_SIZE
+    ) -> None:
+        """Write the buffer to ``out`` as a UTF-8 JSON string literal."""
+        self._buffer.seek(0)
+        out.write(b'"')
+        while True:
+            chunk = self._buffer.read(chunk_size)
+            if not chunk:
+                break
+            out.write(json.encoder.encode_basestring(chunk)[1:-1].encode("utf-8"))
+        out.write(b'"')
+        self._buffer.seek(0, io.SEEK_END)
 
 
 # ============================================================
@@ -739,33 +1993,129 @@ def _calculate_staleness_penalty(updated_at: str, today_date: dt.date) -> int:
     return 0
 
 
+def _combine_score(base: int, label_bonus: int, penalty: int, has_cycle: bool) -> int:
+    return max(base + label_bonus + penalty + (15 if has_cycle else 0), 0)
+
+
 def score_linear_issue(
     issue: dict[str, Any], today_iso: str, today_date: dt.date
 ) -> int:
     """Score a Linear issue with priority, due date, state, labels, and staleness.
 
-    ⚡ Performance Optimization:
-    today_date is passed down to staleness_days to prevent redundant ISO string
-    parsing for the current date inside the scoring loop.
-    """
-    priority = issue.get("priority") or 0
-    due_date = issue.get("dueDate") or ""
-    _state = issue.get("state")
-    _state_type = _state.get("type") if _state else None
-    state_type = _state_type.lower().replace("_", "") if _state_type else ""
-    _labels = issue.get("labels")
-    _nodes = _labels.get("nodes") if _labels else ()
-    label_names = _extract_label_names(_nodes)
-    updated_at = issue.get("updatedAt") or ""
-    has_cycle = bool(issue.get("cycle"))
+    ⚡ Performance Optimization:
+    today_date is passed down to staleness_days to prevent redundant ISO string
+    parsing for the current date inside the scoring loop.
+    """
+    priority = issue.get("priority") or 0
+    due_date = issue.get("dueDate") or ""
+    _state = issue.get("state")
+    _state_type = _state.get("type") if _state else None
+    state_type = _state_type.lower().replace("_", "") if _state_type else ""
+    _labels = issue.get("labels")
+    _nodes = _labels.get("nodes") if _labels else ()
+    label_names = _extract_label_names(_nodes)
+    updated_at = issue.get("updatedAt") or ""
+    has_cycle = bool(issue.get("cycle"))
+
+    return _combine_score(
+        _calculate_base_score(priority, due_date, state_type, today_iso),
+        _calculate_label_bonuses(label_names),
+        _calculate_staleness_penalty(updated_at, today_date),
+        has_cycle,
+    )
+
+
+_CLOSED_STATE_TYPES = frozenset({"completed", "canceled", "cancelled"})
+
+
+def score_linear_issues(
+    issues: list[dict[str, Any]], today_iso: str, today_date: dt.date
+) -> list[int]:
+    """Score many issues in one pass; equal to ``score_linear_issue`` per issue.
+
+    Staleness penalties are memoised per ``updatedAt`` date and label bonuses
+    per raw label name, so large exports parse each distinct value once.
+    """
+    penalties: dict[str, int] = {}
+    label_bonuses: dict[Any, int] = {}
+
+    def _penalty(updated_at: str) -> int:
+        day = updated_at[:10]
+        penalty = penalties.get(day)
+        if penalty is None:
+            penalty = penalties[day] = _calculate_staleness_penalty(day, today_date)
+        return penalty
+
+    def _labels(issue: dict[str, Any]) -> int:
+        _labels = issue.get("labels")
+        total = 0
+        for node in (_labels.get("nodes") if _labels else None) or ():
+            if not isinstance(node, dict):
+                continue
+            name = node.get("name")
+            bonus = label_bonuses.get(name)
+            if bonus is None:
+                bonus = label_bonuses[name] = _calculate_label_bonuses(
+                    [name.lower() if name is not None else ""]
+                )
+            total += bonus
+        return total
+
+    def _state_type(issue: dict[str, Any]) -> str:
+        _state = issue.get("state")
+        _type = _state.get("type") if _state else None
+        return _type.lower().replace("_", "") if _type else ""
+
+    return [
+        _combine_score(
+            _calculate_base_score(
+                issue.get("priority") or 0,
+                issue.get("dueDate") or "",
+                _state_type(issue),
+                today_iso,
+            ),
+            _labels(issue),
+            _penalty(issue.get("updatedAt") or ""),
+            bool(issue.get("cycle")),
+        )
+        for issue in issues
+    ]
+
+
+def _linear_rank_key(pair: tuple[int, dict[str, Any]]) -> tuple:
+    score, issue = pair
+    return (
+        -score,
+        issue.get("dueDate") or "9999-12-31",
+        issue.get("title", "Untitled issue"),
+    )
 
-    score = _calculate_base_score(priority, due_date, state_type, today_iso)
-    score += _calculate_label_bonuses(label_names)
-    score += _calculate_staleness_penalty(updated_at, today_date)
-    if has_cycle:
-        score += 15
 
-    return max(score, 0)
+def rank_linear_issues(
+    issues: Iterable[dict[str, Any]],
+    today_iso: str,
+    today_date: dt.date,
+    k: int,
+    *,
+    active_only: bool = True,
+) -> list[tuple[int, dict[str, Any]]]:
+    """Return the top ``k`` ``(score, issue)`` pairs, best first.
+
+    Ordering matches the focus list: score descending, then earliest due
+    date, then title. Completed and canceled issues are skipped unless
+    ``active_only`` is False.
+    """
+    if active_only:
+        pool = []
+        for issue in issues:
+            _state = issue.get("state")
+            _type = _state.get("type") if _state else None
+            if not _type or _type.lower() not in _CLOSED_STATE_TYPES:
+                pool.append(issue)
+    else:
+        pool = list(issues)
+    scores = score_linear_issues(pool, today_iso, today_date)
+    return heapq.nsmallest(k, zip(scores, pool), key=_linear_rank_key)
 
 
 def build_focus_meta_parts(item: FocusItem, today_iso: str) -> list[str]:
@@ -865,17 +2215,41 @@ def derive_dynamic_tags(summary: str) -> list[str]:
 # ============================================================
 
 
+@PROFILER.profile("weather")
 def fetch_weather(
     session: requests.Session,
     config: AppConfig,
     cache: FileCache,
+    refresher: BackgroundRefresher | None = None,
 ) -> WeatherSnapshot:
     cache_key = f"weather:{config.lat}:{config.lon}"
-    cached = cache.get(cache_key, config.weather_cache_ttl)
+    cached = _read_through(
+        cache,
+        cache_key,
+        config.weather_cache_ttl,
+        refresher,
+        _refresh_weather,
+        config,
+        cache,
+    )
     if cached:
         logger.debug("Weather cache hit")
         return WeatherSnapshot(**cached)
 
+    return _download_weather(session, config, cache, cache_key)
+
+
+def _refresh_weather(config: AppConfig, cache: FileCache) -> None:
+    session = build_retry_session(total=2, backoff_factor=0.5)
+    _download_weather(session, config, cache, f"weather:{config.lat}:{config.lon}")
+
+
+def _download_weather(
+    session: requests.Session,
+    config: AppConfig,
+    cache: FileCache,
+    cache_key: str,
+) -> WeatherSnapshot:
     try:
         lat = float(config.lat)
         lon = float(config.lon)
@@ -959,35 +2333,12 @@ def _process_horoscope_endpoint(
     return None
 
 
-def _submit_horoscope_calls(
-    executor: concurrent.futures.ThreadPoolExecutor,
-    session: requests.Session,
+@PROFILER.profile("horoscope")
+def fetch_horoscope(
     zodiac_sign: str,
-) -> list[concurrent.futures.Future]:
-    """Submit a horoscope request for every configured endpoint."""
-    return [
-        executor.submit(_process_horoscope_endpoint, session, zodiac_sign, tmpl)
-        for tmpl in HOROSCOPE_ENDPOINTS_TEMPLATE
-    ]
-
-
-def _first_horoscope_result(
-    futures: list[concurrent.futures.Future], timeout: float, default_text: str
+    latency: EndpointLatencyTracker | None = None,
 ) -> str:
-    """Return the first successful future result within ``timeout`` seconds."""
-    try:
-        for future in concurrent.futures.as_completed(futures, timeout=timeout):
-            if future.exception():
-                continue
-            if future.result():
-                return future.result()
-    except concurrent.futures.TimeoutError:
-        pass
-    return default_text
-
-
-def fetch_horoscope(session: requests.Session, zodiac_sign: str) -> str:
-    """Fetch horoscope using a hedged concurrent request strategy."""
+    """Fetch horoscope, hedging across endpoints by observed latency."""
     default_text = (
         "Trust your instincts and prioritize tasks that reduce future stress."
     )
@@ -996,17 +2347,40 @@ def fetch_horoscope(session: requests.Session, zodiac_sign: str) -> str:
         logger.warning("Invalid zodiac sign %r; using default", zodiac_sign)
         return default_text
 
-    template_count = len(HOROSCOPE_ENDPOINTS_TEMPLATE)
-    max_workers = max(1, min(template_count, 32))
-    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
-    try:
-        futures = _submit_horoscope_calls(executor, session, zodiac_sign)
-        return _first_horoscope_result(futures, HOROSCOPE_TIMEOUT, default_text)
-    finally:
-        executor.shutdown(wait=False, cancel_futures=True)
+    attempts = [
+        (
+            tmpl["name"],
+            functools.partial(
+                _process_horoscope_endpoint, zodiac_sign=zodiac_sign, tmpl=tmpl
+            ),
+        )
+        for tmpl in HOROSCOPE_ENDPOINTS_TEMPLATE
+    ]
+    result = hedged_call(
+        attempts,
+        timeout=HOROSCOPE_TIMEOUT,
+        tracker=latency,
+        session_factory=functools.partial(
+            build_retry_session, total=2, backoff_factor=0.5
+        ),
+    )
+    return result or default_text
+
+
+LINEAR_PRIORITY_LABELS = {
+    1: "urgent",
+    2: "high priority",
+    3: "medium priority",
+    4: "low priority",
+}
 
 
-def _fetch_linear_focus_nodes(session: requests.Session, api_key: str) -> tuple:
+def _post_linear_query(
+    session: requests.Session,
+    api_key: str,
+    query: str,
+    variables: dict[str, Any],
+) -> dict[str, Any]:
     response = safe_request(
         "POST",
         LINEAR_GRAPHQL_URL,
@@ -1016,57 +2390,118 @@ def _fetch_linear_focus_nodes(session: requests.Session, api_key: str) -> tuple:
             "Authorization": api_key,
             "Content-Type": "application/json",
         },
-        json={"query": LINEAR_FOCUS_QUERY},
+        json={"query": query, "variables": variables},
         timeout=DEFAULT_TIMEOUT,
     )
     response.raise_for_status()
-    _data = response.json().get("data")
-    _viewer = _data.get("viewer") if _data else None
+    return response.json().get("data") or {}
+
+
+def _assigned_issues_page(data: dict[str, Any]) -> tuple[list[dict], str | None]:
+    """Return ``(nodes, next_cursor)`` from a ``focus`` alias payload."""
+    _viewer = data.get("focus")
     _assigned = _viewer.get("assignedIssues") if _viewer else None
-    return _assigned.get("nodes") if _assigned else ()
+    if not _assigned:
+        return [], None
+    page_info = _assigned.get("pageInfo") or {}
+    cursor = page_info.get("endCursor") if page_info.get("hasNextPage") else None
+    return list(_assigned.get("nodes") or ()), cursor
+
+
+def _fetch_linear_payload(
+    session: requests.Session, api_key: str
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """Fetch focus issues and the notification queue in one round-trip.
+
+    Further pages of assigned issues are requested with cursors only when
+    the first page reports ``hasNextPage``.
+    """
+    data = _post_linear_query(
+        session, api_key, LINEAR_BRIEF_QUERY, {"first": LINEAR_FOCUS_PAGE_SIZE}
+    )
+    nodes, cursor = _assigned_issues_page(data)
+    pages = 1
+    while cursor and pages < LINEAR_MAX_FOCUS_PAGES:
+        try:
+            page = _post_linear_query(
+                session,
+                api_key,
+                LINEAR_FOCUS_PAGE_QUERY,
+                {"first": LINEAR_FOCUS_PAGE_SIZE, "after": cursor},
+            )
+        except Exception as exc:
+            logger.warning("Linear pagination stopped after %d page(s): %s", pages, exc)
+            break
+        page_nodes, cursor = _assigned_issues_page(page)
+        nodes.extend(page_nodes)
+        pages += 1
+    return nodes, data
+
+
+def _parse_linear_focus_items(
+    nodes: Iterable[dict[str, Any]], config: AppConfig, daily: DailyContext
+) -> list[FocusItem]:
+    ranked = rank_linear_issues(
+        nodes, daily.today_iso, daily.today, config.focus_max_items
+    )
+    # rank_linear_issues already drops closed issues, so every node parses.
+    filtered = [
+        _parse_linear_focus_node(issue, LINEAR_PRIORITY_LABELS, daily, score)
+        for score, issue in ranked
+    ]
+    if not filtered:
+        logger.info("No active Linear issues found for the current assignee.")
+    return filtered
+
+
+def _linear_cache_key(config: AppConfig, daily: DailyContext) -> str:
+    account = hashlib.sha256(config.linear_api_key.encode()).hexdigest()[:12]
+    return f"linear:{account}:{daily.today_iso}:{config.focus_max_items}"
 
 
-def fetch_linear_focus_items(
+@PROFILER.profile("linear")
+def fetch_linear_snapshot(
     session: requests.Session,
     config: AppConfig,
     daily: DailyContext,
-) -> list[FocusItem]:
+    cache: FileCache | None = None,
+) -> LinearSnapshot:
+    """Return ranked focus issues plus the unread queue from one Linear query."""
     if not config.linear_api_key:
-        return []
+        return LinearSnapshot()
 
-    priority_labels = {
-        1: "urgent",
-        2: "high priority",
-        3: "medium priority",
-        4: "low priority",
-    }
+    cache_key = _linear_cache_key(config, daily)
+    if cache:
+        cached = cache.get(cache_key, config.linear_cache_ttl)
+        if cached:
+            logger.debug("Linear cache hit")
+            return LinearSnapshot.from_cache(cached)
 
     try:
-        nodes = _fetch_linear_focus_nodes(session, config.linear_api_key)
-
-        items: list[FocusItem] = []
-        for issue in nodes:
-            item = _parse_linear_focus_node(issue, priority_labels, daily)
-            if item is not None:
-                items.append(item)
-
-        items.sort(key=lambda i: (-i.score, i.due_date or "9999-12-31", i.title))
-        filtered = items[: config.focus_max_items]
-        if not filtered:
-            logger.info("No active Linear issues found for the current assignee.")
-        return filtered
+        nodes, data = _fetch_linear_payload(session, config.linear_api_key)
     except Exception as exc:
-        logger.error("Linear focus error: %s", exc)
-        return []
+        logger.error("Linear snapshot error: %s", exc)
+        return LinearSnapshot()
+
+    snapshot = LinearSnapshot(
+        focus_items=tuple(_parse_linear_focus_items(nodes, config, daily)),
+        queue=_parse_linear_queue(data),
+    )
+    if cache:
+        cache.set(cache_key, snapshot.to_cache())
+    return snapshot
 
 
 def _parse_linear_focus_node(
-    issue: dict[str, Any], priority_labels: dict[int, str], daily: DailyContext
+    issue: dict[str, Any],
+    priority_labels: dict[int, str],
+    daily: DailyContext,
+    score: int | None = None,
 ) -> FocusItem | None:
     state = issue.get("state")
     _state_type = state.get("type") if state else None
     state_type = _state_type.lower() if _state_type else ""
-    if state_type in {"completed", "canceled", "cancelled"}:
+    if state_type in _CLOSED_STATE_TYPES:
         return None
 
     _labels = issue.get("labels")
@@ -1084,7 +2519,11 @@ def _parse_linear_focus_node(
         state_type=state_type_val,
         due_date=issue.get("dueDate") or "",
         badge=priority_labels.get(issue.get("priority") or 0, ""),
-        score=score_linear_issue(issue, daily.today_iso, daily.today),
+        score=(
+            score
+            if score is not None
+            else score_linear_issue(issue, daily.today_iso, daily.today)
+        ),
         labels=label_names,
         updated_at=issue.get("updatedAt") or "",
     )
@@ -1142,134 +2581,290 @@ def _process_unread_linear_notifications(
     return review_items, notification_items
 
 
-def fetch_linear_queue_snapshot(
-    session: requests.Session,
-    config: AppConfig,
-) -> LinearQueueSnapshot:
-    if not config.linear_api_key:
-        return LinearQueueSnapshot()
+def _parse_linear_queue(data: dict[str, Any]) -> LinearQueueSnapshot:
+    unread_count = data.get("unread") or 0
+    _notifications = data.get("queue")
+    nodes = _notifications.get("nodes") if _notifications else ()
+    unread_nodes = [node for node in nodes or () if not node.get("readAt")]
 
-    query = """
-    query MorningBriefLinearQueue {
-      notificationsUnreadCount
-      notifications(first: 25, orderBy: updatedAt) {
-        nodes {
-          __typename
-          id
-          type
-          category
-          title
-          subtitle
-          url
-          inboxUrl
-          readAt
-          updatedAt
-        }
-      }
-    }
+    review_items, notification_items = _process_unread_linear_notifications(
+        unread_nodes
+    )
+
+    return LinearQueueSnapshot(
+        unread_count=unread_count,
+        review_items=tuple(review_items[:3]),
+        notification_items=tuple(notification_items[:5]),
+    )
+
+
+def _read_capped(response: requests.Response, max_bytes: int) -> tuple[bytes, bool]:
+    """Read a streamed body up to ``max_bytes``; return ``(body, was_capped)``."""
+    started = time.perf_counter()
+    body, capped = _read_capped_body(response, max_bytes)
+    PROFILER.record_read(len(body), time.perf_counter() - started)
+    return body, capped
+
+
+def _read_capped_body(
+    response: requests.Response, max_bytes: int
+) -> tuple[bytes, bool]:
+    if max_bytes <= 0:
+        return response.content, False
+    chunks: list[bytes] = []
+    total = 0
+    for chunk in response.iter_content(chunk_size=FEED_READ_CHUNK_SIZE):
+        if not chunk:
+            continue
+        remaining = max_bytes - total
+        if len(chunk) > remaining:
+            chunks.append(chunk[:remaining])
+            response.close()
+            return b"".join(chunks), True
+        chunks.append(chunk)
+        total += len(chunk)
+    return b"".join(chunks), False
+
+
+_FEED_ITEM_END_PATTERN = re.compile(rb"</(item|entry)\s*>", re.IGNORECASE)
+_FEED_CLOSING_TAGS = {b"item": b"</channel></rss>", b"entry": b"</feed>"}
+
+
+def truncate_feed_document(
+    content: bytes, limit: int, *, capped: bool = False
+) -> bytes:
+    """Cut a feed after its ``limit``-th item so the parser never sees the rest.
+
+    When the body was cut by the byte cap, the trailing partial item is
+    dropped as well. The matching channel/feed closing tags are re-appended.
     """
+    last_end: re.Match[bytes] | None = None
+    count = 0
+    for match in _FEED_ITEM_END_PATTERN.finditer(content):
+        last_end = match
+        count += 1
+        if count >= limit:
+            break
+    if last_end is None or (count < limit and not capped):
+        return content
+    closing = _FEED_CLOSING_TAGS[last_end.group(1).lower()]
+    return content[: last_end.end()] + closing
+
+
+def parse_feed_entries(content: bytes, limit: int) -> list[dict[str, str]]:
+    """Parse a feed document into plain, picklable entry dicts."""
+    import feedparser
+
+    feed = feedparser.parse(content)
+    return [
+        {
+            "title": entry.get("title", "No Title"),
+            "link": entry.get("link", "#"),
+            "summary": entry.get("summary", entry.get("description", "")),
+            "published": entry.get("published", ""),
+        }
+        for entry in feed.entries[:limit]
+    ]
 
-    try:
-        response = safe_request(
-            "POST",
-            LINEAR_GRAPHQL_URL,
-            session=session,
-            allowed_hosts={"api.linear.app"},
-            headers={
-                "Authorization": config.linear_api_key,
-                "Content-Type": "application/json",
-            },
-            json={"query": query},
-            timeout=DEFAULT_TIMEOUT,
-        )
-        response.raise_for_status()
-        payload = response.json().get("data") or {}
-        unread_count = payload.get("notificationsUnreadCount", 0)
-        _notifications = payload.get("notifications")
-        nodes = _notifications.get("nodes") if _notifications else ()
-        unread_nodes = [node for node in nodes if not node.get("readAt")]
-
-        review_items, notification_items = _process_unread_linear_notifications(
-            unread_nodes
-        )
 
-        return LinearQueueSnapshot(
-            unread_count=unread_count,
-            review_items=tuple(review_items[:3]),
-            notification_items=tuple(notification_items[:5]),
+class FeedParsePool:
+    """Parse feed documents in worker processes so parsing is not GIL-bound."""
+
+    def __init__(self, processes: int) -> None:
+        self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=processes)
+
+    def parse(self, content: bytes, limit: int) -> list[dict[str, str]]:
+        try:
+            future = self._executor.submit(parse_feed_entries, content, limit)
+            return future.result(timeout=DEFAULT_TIMEOUT)
+        except Exception as exc:
+            logger.warning(
+                "Process-pool feed parse failed (%s); parsing in-thread", exc
+            )
+            return parse_feed_entries(content, limit)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _fetch_feed_entries_uncached(
+    session: requests.Session,
+    url: str,
+    limit: int,
+    max_bytes: int,
+    parser: FeedParsePool | None,
+) -> list[dict[str, str]]:
+    response = safe_request(
+        "GET",
+        url,
+        session=session,
+        allowed_hosts=MORNING_BRIEF_ALLOWED_HOSTS,
+        timeout=DEFAULT_TIMEOUT,
+        stream=True,
+    )
+    response.raise_for_status()
+    content, capped = _read_capped(response, max_bytes)
+    if capped:
+        logger.info(
+            "Feed %s exceeded %d bytes; parsing the first part only", url, max_bytes
         )
-    except Exception as exc:
-        logger.error("Linear queue snapshot error: %s", exc)
-        return LinearQueueSnapshot()
+    document = truncate_feed_document(content, limit, capped=capped)
+    if parser is not None:
+        return parser.parse(document, limit)
+    return parse_feed_entries(document, limit)
 
 
-def fetch_single_feed(
+def fetch_feed_entries(
     name: str,
     url: str,
     *,
     limit: int = 3,
     cache: FileCache | None = None,
     cache_ttl: int = DEFAULT_FEED_CACHE_TTL,
-) -> str:
-    cache_key = f"feed:{url}"
+    refresher: BackgroundRefresher | None = None,
+    max_bytes: int = DEFAULT_FEED_MAX_BYTES,
+    parser: FeedParsePool | None = None,
+) -> list[dict[str, str]]:
+    with PROFILER.span(f"feed:{name}"):
+        return _fetch_feed_entries_cached(
+            name, url, limit, cache, cache_ttl, refresher, max_bytes, parser
+        )
 
+
+def _fetch_feed_entries_cached(
+    name: str,
+    url: str,
+    limit: int,
+    cache: FileCache | None,
+    cache_ttl: int,
+    refresher: BackgroundRefresher | None,
+    max_bytes: int,
+    parser: FeedParsePool | None,
+) -> list[dict[str, str]]:
     if cache:
-        cached = cache.get(cache_key, cache_ttl)
+        cached = _read_through(
+            cache,
+            f"feed-entries:{url}",
+            cache_ttl,
+            refresher,
+            _download_feed_entries,
+            name,
+            url,
+            limit,
+            cache,
+            max_bytes,
+            parser,
+        )
         if cached:
             logger.debug("Feed cache hit: %s", name)
             return cached
 
-    session = build_retry_session(total=2, backoff_factor=0.5)
+    return _download_feed_entries(name, url, limit, cache, max_bytes, parser)
+
 
+def _download_feed_entries(
+    name: str,
+    url: str,
+    limit: int,
+    cache: FileCache | None,
+    max_bytes: int = DEFAULT_FEED_MAX_BYTES,
+    parser: FeedParsePool | None = None,
+) -> list[dict[str, str]]:
+    session = build_retry_session(total=2, backoff_factor=0.5)
     try:
-        response = safe_request(
-            "GET",
-            url,
-            session=session,
-            allowed_hosts=MORNING_BRIEF_ALLOWED_HOSTS,
-            timeout=DEFAULT_TIMEOUT,
+        entries = _fetch_feed_entries_uncached(session, url, limit, max_bytes, parser)
+    except Exception as exc:
+        logger.error("RSS error [%s]: %s", name, exc)
+        return []
+    if not entries:
+        logger.info("RSS feed [%s] has no entries", name)
+        return []
+    if cache:
+        cache.set(f"feed-entries:{url}", entries)
+    return entries
+
+
+def _feed_items(entries: list[dict[str, str]]) -> Iterator[str]:
+    for entry in entries:
+        title = sanitize_text(entry.get("title", "No Title"))
+        link = entry.get("link", "#")
+        summary = clean_summary(entry.get("summary", entry.get("description", "")))
+
+        yield (
+            f'<li style="margin-bottom: 8px;">'
+            f'<a href="{link}" style="text-decoration: none; font-weight: bold; color: #2c3e50;">{title}</a><br>'
+            f'<span style="color: #666; font-size: 0.9em;">{summary}</span>'
+            f"</li>"
         )
-        response.raise_for_status()
-        feed = feedparser.parse(response.content)
 
-        if not feed.entries:
-            return ""
 
-        items: list[str] = []
-        for entry in feed.entries[:limit]:
-            title = sanitize_text(entry.get("title", "No Title"))
-            link = entry.get("link", "#")
-            summary_raw = entry.get("summary", entry.get("description", ""))
-            summary = sanitize_text(
-                truncate_text(strip_html_tags(html.unescape(summary_raw)))
-            )
+def write_feed_section(
+    writer: BriefWriter,
+    name: str,
+    entries: list[dict[str, str]],
+    cache: FileCache | None = None,
+) -> None:
+    if not entries:
+        return
 
-            items.append(
-                f'<li style="margin-bottom: 8px;">'
-                f'<a href="{link}" style="text-decoration: none; font-weight: bold; color: #2c3e50;">{title}</a><br>'
-                f'<span style="color: #666; font-size: 0.9em;">{summary}</span>'
-                f"</li>"
-            )
+    def _render(out: BriefWriter) -> None:
+        with out.section(name):
+            out.ul(_feed_items(entries))
 
-        result = html_section(name, html_ul(items))
-        if cache:
-            cache.set(cache_key, result)
-        return result
-    except Exception as exc:
-        logger.error("RSS error [%s]: %s", name, exc)
-        return ""
+    writer.fragment(cache, "feed", [name, entries], _render)
+
+
+def render_feed_section(name: str, entries: list[dict[str, str]]) -> str:
+    writer = BriefWriter()
+    write_feed_section(writer, name, entries)
+    return writer.getvalue()
 
 
-def fetch_news_sections(feeds: dict[str, str], cache: FileCache) -> str:
+def fetch_single_feed(name: str, url: str, **kwargs: Any) -> str:
+    """Fetch (or reuse cached) entries for one feed and render its section."""
+    writer = BriefWriter()
+    write_feed_section(
+        writer, name, fetch_feed_entries(name, url, **kwargs), kwargs.get("cache")
+    )
+    return writer.getvalue()
+
+
+@PROFILER.profile("section:news", "section")
+def fetch_news_sections(
+    feeds: dict[str, str],
+    cache: FileCache,
+    refresher: BackgroundRefresher | None = None,
+    *,
+    max_bytes: int = DEFAULT_FEED_MAX_BYTES,
+    parser: FeedParsePool | None = None,
+    seen: SeenItemsIndex | None = None,
+) -> str:
     with concurrent.futures.ThreadPoolExecutor(
         max_workers=min(16, len(feeds) or 1)
     ) as executor:
         futures = [
-            executor.submit(fetch_single_feed, name, url, cache=cache)
+            executor.submit(
+                PROFILER.bind(fetch_feed_entries),
+                name,
+                url,
+                cache=cache,
+                refresher=refresher,
+                max_bytes=max_bytes,
+                parser=parser,
+            )
             for name, url in feeds.items()
         ]
-        sections = [f.result() for f in futures]
-    return "".join(s for s in sections if s)
+        entries_by_feed = [f.result() for f in futures]
+
+    # Dedupe in feed order before any per-item sanitising or rendering.
+    if seen is None:
+        seen = SeenItemsIndex("", window=0)
+    entries_by_feed = seen.filter(entries_by_feed)
+
+    writer = BriefWriter()
+    for name, entries in zip(feeds, entries_by_feed):
+        write_feed_section(writer, name, entries, cache)
+    return writer.getvalue()
 
 
 def _process_podcast_feed(
@@ -1280,68 +2875,76 @@ def _process_podcast_feed(
 ) -> SectionResult:
     """Extracts data and formats it from parsed podcast feed entries."""
     detected_tags: set[str] = set()
-    items: list[str] = []
-
-    def process_entry(entry: dict) -> dict[str, str]:
-        title_ = sanitize_text(entry.get("title", "No Title"))
-        link_ = entry.get("link", "#")
-        pub_date_ = sanitize_text(entry.get("published", ""))
-        summary_raw = entry.get("summary", entry.get("description", ""))
-        summary_ = llm.summarize_podcast(
-            strip_html_tags(html.unescape(summary_raw)), session=session
+    writer = BriefWriter()
+
+    selected = entries[:limit]
+    summaries = (
+        llm.summarize_batch(
+            [
+                strip_html_tags(
+                    html.unescape(entry.get("summary", entry.get("description", "")))
+                )
+                for entry in selected
+            ],
+            session=session,
         )
-        return {
-            "title": title_,
-            "link": link_,
-            "pub_date": pub_date_,
-            "llm_summary": summary_,
+        if selected
+        else []
+    )
+    processed_entries = [
+        {
+            "title": sanitize_text(entry.get("title", "No Title")),
+            "link": entry.get("link", "#"),
+            "pub_date": sanitize_text(entry.get("published", "")),
+            "llm_summary": summary,
         }
+        for entry, summary in zip(selected, summaries)
+    ]
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=min(limit, 5)) as executor:
-        processed_entries = list(executor.map(process_entry, entries[:limit]))
+    def _items() -> Iterator[str]:
+        for entry_data in processed_entries:
+            llm_summary = entry_data["llm_summary"]
+            for tag in derive_dynamic_tags(llm_summary):
+                detected_tags.add(tag)
 
-    for entry_data in processed_entries:
-        llm_summary = entry_data["llm_summary"]
-        for tag in derive_dynamic_tags(llm_summary):
-            detected_tags.add(tag)
+            summary_block = (
+                f'<br><span style="color: #444; font-size: 0.9em;"><em>{sanitize_text(llm_summary)}</em></span>'
+                if llm_summary
+                else ""
+            )
 
-        summary_block = (
-            f'<br><span style="color: #444; font-size: 0.9em;"><em>{sanitize_text(llm_summary)}</em></span>'
-            if llm_summary
-            else ""
-        )
+            yield (
+                f'<li style="margin-bottom: 12px;">'
+                f'<a href="{entry_data["link"]}" style="text-decoration: none; font-weight: bold; color: #2c3e50;">{entry_data["title"]}</a><br>'
+                f'<span style="color: #666; font-size: 0.8em;">Published: {entry_data["pub_date"]}</span>{summary_block}'
+                f"</li>"
+            )
 
-        items.append(
-            f'<li style="margin-bottom: 12px;">'
-            f'<a href="{entry_data["link"]}" style="text-decoration: none; font-weight: bold; color: #2c3e50;">{entry_data["title"]}</a><br>'
-            f'<span style="color: #666; font-size: 0.8em;">Published: {entry_data["pub_date"]}</span>{summary_block}'
-            f"</li>"
-        )
+    with writer.section("🎧 Latest from America Adapts"):
+        writer.ul(_items())
 
-    return SectionResult(
-        html=html_section("🎧 Latest from America Adapts", html_ul(items)),
-        tags=sorted(detected_tags),
-    )
+    return SectionResult(html=writer.getvalue(), tags=sorted(detected_tags))
 
 
-def fetch_podcast_section(llm: PerplexityClient, *, limit: int = 3) -> SectionResult:
+@PROFILER.profile("section:podcast", "section")
+def fetch_podcast_section(
+    llm: PerplexityClient,
+    *,
+    limit: int = 3,
+    max_bytes: int = DEFAULT_FEED_MAX_BYTES,
+    parser: FeedParsePool | None = None,
+) -> SectionResult:
     session = build_retry_session(total=2, backoff_factor=0.5)
 
     try:
-        response = safe_request(
-            "GET",
-            AMERICA_ADAPTS_RSS_URL,
-            session=session,
-            allowed_hosts=MORNING_BRIEF_ALLOWED_HOSTS,
-            timeout=DEFAULT_TIMEOUT,
+        entries = _fetch_feed_entries_uncached(
+            session, AMERICA_ADAPTS_RSS_URL, limit, max_bytes, parser
         )
-        response.raise_for_status()
-        feed = feedparser.parse(response.content)
 
-        if not feed.entries:
+        if not entries:
             return SectionResult("", [])
 
-        return _process_podcast_feed(feed.entries, llm, session, limit)
+        return _process_podcast_feed(entries, llm, session, limit)
 
     except Exception as exc:
         logger.error("Podcast error: %s", exc)
@@ -1475,22 +3078,39 @@ def render_focus_section(
     return html_section("🚀 Focus", body)
 
 
-def render_full_brief(
+def write_full_brief(
+    writer: BriefWriter,
     *,
     daily: DailyContext,
     greeting_html: str,
     focus_html: str,
     news_html: str,
     podcast_html: str,
-) -> str:
-    sections = [
-        f"<h1>Morning Briefing</h1><p><em>{sanitize_text(daily.today.strftime('%A, %B %d'))}</em></p>",
-    ]
+) -> None:
+    writer.write(
+        f"<h1>Morning Briefing</h1><p><em>{sanitize_text(daily.today.strftime('%A, %B %d'))}</em></p>"
+    )
     for section in (greeting_html, focus_html, news_html, podcast_html):
         if section:
-            sections.append("<hr>")
-            sections.append(section)
-    return "".join(sections)
+            writer.write("<hr>")
+            writer.write(section)
+
+
+def render_full_brief(**kwargs: Any) -> str:
+    writer = BriefWriter()
+    write_full_brief(writer, **kwargs)
+    return writer.getvalue()
+
+
+def build_reader_payload(writer: BriefWriter, fields: dict[str, Any]) -> bytes:
+    """Serialise the Reader save payload with ``html`` streamed from ``writer``."""
+    out = io.BytesIO()
+    out.write(b'{"html": ')
+    writer.write_json_string(out)
+    for key, value in fields.items():
+        out.write(f", {json.dumps(key)}: {json.dumps(value)}".encode("utf-8"))
+    out.write(b"}")
+    return out.getvalue()
 
 
 # ============================================================
@@ -1498,13 +3118,22 @@ def render_full_brief(
 # ============================================================
 
 
+@PROFILER.profile("section:greeting", "section")
 def build_greeting_section(
-    config: AppConfig, llm: PerplexityClient, cache: FileCache
+    config: AppConfig,
+    llm: PerplexityClient,
+    cache: FileCache,
+    refresher: BackgroundRefresher | None = None,
+    latency: EndpointLatencyTracker | None = None,
 ) -> str:
     session = build_retry_session(total=2, backoff_factor=0.5)
     with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-        future_w = executor.submit(fetch_weather, session, config, cache)
-        future_h = executor.submit(fetch_horoscope, session, config.zodiac_sign)
+        future_w = executor.submit(
+            PROFILER.bind(fetch_weather), session, config, cache, refresher
+        )
+        future_h = executor.submit(
+            PROFILER.bind(fetch_horoscope), config.zodiac_sign, latency
+        )
         weather = future_w.result()
         horoscope = future_h.result()
 
@@ -1514,43 +3143,62 @@ def build_greeting_section(
     return render_greeting_section(weather, greeting)
 
 
-def build_focus_section(config: AppConfig, daily: DailyContext) -> str:
+@PROFILER.profile("section:focus", "section")
+def build_focus_section(
+    config: AppConfig, daily: DailyContext, cache: FileCache | None = None
+) -> str:
     session = build_retry_session(total=2, backoff_factor=0.5)
-    linear_items = fetch_linear_focus_items(session, config, daily)
+    snapshot = fetch_linear_snapshot(session, config, daily, cache)
+    linear_items = list(snapshot.focus_items)
     if linear_items:
         calendar_items: list[FocusItem] = []
         deep_item, admin_item = select_focus_pair(linear_items, calendar_items)
         return render_focus_section(deep_item, admin_item, daily)
 
-    queue = fetch_linear_queue_snapshot(session, config)
+    queue = snapshot.queue
     if queue.review_items or queue.notification_items or queue.unread_count:
         return render_linear_queue_focus_section(queue, daily)
 
     return render_focus_section(None, None, daily)
 
 
+@PROFILER.profile("save:reader", "output")
 def save_to_reader(
-    config: AppConfig, html_content: str, *, extra_tags: list[str] | None = None
+    config: AppConfig,
+    html_content: str | BriefWriter,
+    *,
+    extra_tags: list[str] | None = None,
 ) -> None:
     session = build_retry_session(total=2, backoff_factor=0.5)
     unique_id = dt.datetime.now().strftime("%Y%m%d-%H%M")
     tags = sorted(set(["morning-routine", "dashboard"] + (extra_tags or [])))
+    if isinstance(html_content, BriefWriter):
+        writer = html_content
+    else:
+        writer = BriefWriter()
+        writer.write(html_content)
 
     try:
-        response = safe_request(
-            "POST",
-            READWISE_SAVE_URL,
-            session=session,
-            allowed_hosts={"readwise.io"},
-            headers={"Authorization": f"Token {config.readwise_token}"},
-            json={
+        payload = build_reader_payload(
+            writer,
+            {
                 "url": f"https://internal-brief.local/daily-{unique_id}",
-                "html": html_content,
                 "title": f"Morning Brief: {dt.date.today().strftime('%B %d, %Y')}",
                 "author": "Raycast Assistant",
                 "tags": tags,
                 "should_clean_html": False,
             },
+        )
+        response = safe_request(
+            "POST",
+            READWISE_SAVE_URL,
+            session=session,
+            allowed_hosts={"readwise.io"},
+            headers={
+                "Authorization": f"Token {config.readwise_token}",
+                "Content-Type": "application/json; charset=utf-8",
+            },
+            data=payload,
             timeout=DEFAULT_TIMEOUT,
         )
         response.raise_for_status()
@@ -1576,10 +3224,33 @@ def handle_dry_run(html_content: str) -> None:
 def main() -> None:
     """Main application entrypoint."""
     config = AppConfig.load()
+    if config.profile:
+        PROFILER.enable()
     daily = DailyContext.build(config.timezone_offset)
-    llm = PerplexityClient(config.perplexity_api_key)
     cache = FileCache(config.cache_dir)
+    response_cache = LLMResponseCache(
+        config.cache_dir,
+        ttl=config.llm_cache_ttl,
+        max_entries=config.llm_cache_max_entries,
+        bypass=config.llm_cache_bypass,
+    )
+    llm = PerplexityClient(
+        config.perplexity_api_key, cache=cache, response_cache=response_cache
+    )
     toggles = config.toggles
+    refresher = (
+        BackgroundRefresher(config.max_staleness) if config.max_staleness > 0 else None
+    )
+    parser = (
+        FeedParsePool(config.feed_parse_processes)
+        if config.feed_parse_processes > 0
+        else None
+    )
+
+    latency = EndpointLatencyTracker(cache)
+    seen = SeenItemsIndex(
+        config.cache_dir, window=config.seen_items_window, tz=daily.tz
+    )
 
     logger.info("Gathering local intel...")
 
@@ -1587,20 +3258,37 @@ def main() -> None:
         max_workers=min(32, 3 + len(config.feeds))
     ) as executor:
         future_greeting = (
-            executor.submit(build_greeting_section, config, llm, cache)
+            executor.submit(
+                build_greeting_section, config, llm, cache, refresher, latency
+            )
             if toggles.greeting
             else None
         )
         future_focus = (
-            executor.submit(build_focus_section, config, daily)
+            executor.submit(build_focus_section, config, daily, cache)
             if toggles.focus
             else None
         )
         future_podcast = (
-            executor.submit(fetch_podcast_section, llm) if toggles.podcast else None
+            executor.submit(
+                fetch_podcast_section,
+                llm,
+                max_bytes=config.feed_max_bytes,
+                parser=parser,
+            )
+            if toggles.podcast
+            else None
         )
         future_news = (
-            executor.submit(fetch_news_sections, config.feeds, cache)
+            executor.submit(
+                fetch_news_sections,
+                config.feeds,
+                cache,
+                refresher,
+                max_bytes=config.feed_max_bytes,
+                parser=parser,
+                seen=seen,
+            )
             if toggles.news
             else None
         )
@@ -1612,18 +3300,51 @@ def main() -> None:
         )
         news_html = future_news.result() if future_news else ""
 
-    full_content = render_full_brief(
-        daily=daily,
-        greeting_html=greeting_html,
-        focus_html=focus_html,
-        news_html=news_html,
-        podcast_html=podcast_result.html,
-    )
+    brief = BriefWriter()
+    with PROFILER.span("render", "render"):
+        write_full_brief(
+            brief,
+            daily=daily,
+            greeting_html=greeting_html,
+            focus_html=focus_html,
+            news_html=news_html,
+            podcast_html=podcast_result.html,
+        )
 
     if config.dry_run:
-        handle_dry_run(full_content)
+        handle_dry_run(brief.getvalue())
     else:
-        save_to_reader(config, full_content, extra_tags=podcast_result.tags)
+        save_to_reader(config, brief, extra_tags=podcast_result.tags)
+        seen.save()
+    if seen.skipped:
+        logger.info("Skipped %d repeated news item(s)", seen.skipped)
+
+    if refresher is not None:
+        refresher.drain()
+    latency.save()
+    if parser is not None:
+        parser.shutdown()
+    if response_cache.hits or response_cache.misses:
+        logger.info(
+            "LLM cache: %d hit(s), %d miss(es)",
+            response_cache.hits,
+            response_cache.misses,
+        )
+    if config.profile:
+        report_profile(config)
+
+
+def report_profile(config: AppConfig) -> None:
+    """Print the ``--profile`` table to stderr and write the optional trace."""
+    print(PROFILER.format_table(), file=sys.stderr)
+    if config.profile_trace:
+        try:
+            PROFILER.write_trace(config.profile_trace)
+            print(
+                f"✅ Profile trace written to {config.profile_trace}", file=sys.stderr
+            )
+        except OSError as exc:
+            logger.error("Could not write profile trace: %s", exc)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,90 @@
+import datetime as dt
+import importlib.util
+import os
+import random
+import sys
+import timeit
+
+
+def load_morning_brief():
+    script_path = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        "scripts",
+        "morning-brief",
+        "morning-brief.py",
+    )
+    spec = importlib.util.spec_from_file_location("morning_brief", script_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["morning_brief"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def generate_issues(count, seed=42):
+    """Synthetic workspace export shaped like the Linear focus query nodes."""
+    rng = random.Random(seed)
+    states = ["started", "inProgress", "unstarted", "backlog", "triage", "completed"]
+    labels = ["Bug", "Hotfix", "Feature", "Improvement", "P0", "P1", "Docs", "Infra"]
+    start = dt.date(2025, 6, 1)
+    issues = []
+    for i in range(count):
+        updated = start + dt.timedelta(days=rng.randint(0, 300))
+        due = start + dt.timedelta(days=rng.randint(200, 330))
+        issues.append(
+            {
+                "identifier": f"ENG-{i}",
+                "title": f"Issue {i}",
+                "priority": rng.randint(0, 4),
+                "dueDate": due.isoformat() if rng.random() < 0.3 else None,
+                "state": {"type": rng.choice(states)},
+                "labels": {
+                    "nodes": [
+                        {"name": rng.choice(labels)} for _ in range(rng.randint(0, 3))
+                    ]
+                },
+                "updatedAt": f"{updated.isoformat()}T12:00:00.000Z",
+                "cycle": {"id": "c"} if rng.random() < 0.2 else None,
+            }
+        )
+    return issues
+
+
+def main():
+    mb = load_morning_brief()
+    count = 10_000
+    k = 10
+    iterations = 20
+    today = dt.date(2026, 3, 25)
+    today_iso = today.isoformat()
+    issues = generate_issues(count)
+
+    closed = {"completed", "canceled", "cancelled"}
+
+    def per_issue_sort():
+        scored = [
+            (mb.score_linear_issue(issue, today_iso, today), issue)
+            for issue in issues
+            if issue["state"]["type"].lower() not in closed
+        ]
+        scored.sort(
+            key=lambda p: (-p[0], p[1].get("dueDate") or "9999-12-31", p[1]["title"])
+        )
+        return scored[:k]
+
+    def batch_heap():
+        return mb.rank_linear_issues(issues, today_iso, today, k)
+
+    assert [i["identifier"] for _, i in per_issue_sort()] == [
+        i["identifier"] for _, i in batch_heap()
+    ]
+
+    print(f"Dataset: {count} issues, top {k}. Iterations: {iterations}")
+    old_time = timeit.timeit(per_issue_sort, number=iterations)
+    new_time = timeit.timeit(batch_heap, number=iterations)
+    print(f"score_linear_issue + full sort: {old_time:.4f} seconds")
+    print(f"rank_linear_issues (batch + heap): {new_time:.4f} seconds")
+    print(f"Speedup: {old_time / new_time:.2f}x faster")
+
+
+if __name__ == "__main__":
+    main()
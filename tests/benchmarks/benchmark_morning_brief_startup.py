@@ -0,0 +1,76 @@
+import os
+import re
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SCRIPT_PATH = os.path.join(REPO_ROOT, "scripts", "morning-brief", "morning-brief.py")
+
+LOAD_SCRIPT = f"""
+import importlib.util
+import sys
+spec = importlib.util.spec_from_file_location("morning_brief", {SCRIPT_PATH!r})
+module = importlib.util.module_from_spec(spec)
+sys.modules["morning_brief"] = module
+spec.loader.exec_module(module)
+"""
+
+# What the module used to import unconditionally at load time.
+EAGER_IMPORTS = """
+import feedparser
+import requests
+from dotenv import load_dotenv
+import lib.safe_http
+"""
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_profile(code):
+    """Run ``code`` under ``-X importtime``; map top-level modules to cumulative us."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=REPO_ROOT,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    modules = {}
+    for match in IMPORTTIME_LINE.finditer(result.stderr):
+        _self_us, cumulative_us, indent, name = match.groups()
+        if len(indent) == 1:
+            modules[name] = int(cumulative_us)
+    return modules
+
+
+def report(label, modules):
+    total = sum(modules.values())
+    print(f"\n{label}: {total / 1000:.1f} ms across {len(modules)} top-level imports")
+    for name, cumulative in sorted(modules.items(), key=lambda kv: -kv[1])[:8]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+    return total
+
+
+def main():
+    runs = 5
+    lazy_totals = []
+    eager_totals = []
+    for _ in range(runs):
+        lazy_totals.append(sum(import_profile(LOAD_SCRIPT).values()))
+        eager_totals.append(sum(import_profile(LOAD_SCRIPT + EAGER_IMPORTS).values()))
+
+    report("Lazy module load (last run)", import_profile(LOAD_SCRIPT))
+    report(
+        "Module load + former eager imports (last run)",
+        import_profile(LOAD_SCRIPT + EAGER_IMPORTS),
+    )
+
+    lazy = min(lazy_totals)
+    eager = min(eager_totals)
+    print(f"\nBest of {runs}: lazy {lazy / 1000:.1f} ms, eager {eager / 1000:.1f} ms")
+    print(f"Startup import time saved: {(eager - lazy) / 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
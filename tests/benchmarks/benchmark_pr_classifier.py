@@ -0,0 +1,154 @@
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from pr_classifier import (  # noqa: E402
+    BODY_MARKERS,
+    BRANCH_SIGNALS,
+    INVENTORY_CATEGORIES,
+    READY_CATEGORIES,
+    TITLE_KEYWORDS,
+    classify_prs,
+)
+
+
+def generate_prs(count, seed=42):
+    """Synthetic PR history with a mix of bot and human titles/branches/bodies."""
+    rng = random.Random(seed)
+    prefixes = ["Bolt:", "Sentinel:", "Palette:", "chore:", "fix:", "feat:", ""]
+    subjects = [
+        "optimize staleness parsing",
+        "Fix SSRF by blocking private IPs",
+        "update ruff config",
+        "add dark mode toggle",
+        "Bump requests from 2.31 to 2.32",
+        "refactor import paths",
+    ]
+    branches = ["bolt/", "sentinel-", "renovate/", "feature/", "fix/", "jules-"]
+    bodies = [
+        "Created automatically by Jules for task 123.",
+        "Signed-off-by: dependabot[bot]",
+        "This PR improves the thing. " * 20,
+        "",
+    ]
+    return [
+        {
+            "title": f"{rng.choice(prefixes)} {rng.choice(subjects)}",
+            "headRefName": f"{rng.choice(branches)}{i}",
+            "body": rng.choice(bodies),
+        }
+        for i in range(count)
+    ]
+
+
+def _first(vocabulary, text, default=None):
+    for label, keywords in vocabulary:
+        for keyword in keywords:
+            if keyword in text:
+                return label
+    return default
+
+
+def _first_keyword(keywords, text):
+    for keyword in keywords:
+        if keyword in text:
+            return keyword.rstrip("/")
+    return None
+
+
+def keyword_loops(pr):
+    """The per-field ``in`` loops the classifier replaced."""
+    title = pr["title"].lower()
+    branch = pr["headRefName"].lower()
+    return {
+        "inventory": _first(INVENTORY_CATEGORIES, title + branch, "FEATURE"),
+        "ready": _first(READY_CATEGORIES, title, "PERFORMANCE/REFACTOR/UI/FEATURE"),
+        "title": _first_keyword(TITLE_KEYWORDS, title),
+        "branch": _first_keyword(BRANCH_SIGNALS, branch),
+        "body": (
+            "automation_marker"
+            if any(m in pr["body"].lower() for m in BODY_MARKERS)
+            else None
+        ),
+    }
+
+
+def regex_alternation():
+    """The single-pass alternative: one lookahead alternation of every keyword.
+
+    Kept to document why ``pr_classifier`` uses substring checks: the hits
+    of all vocabularies come from one scan per string, but ``re`` has to
+    try the pattern at every offset in Python's sre loop.
+    """
+    vocabularies = {
+        "inventory": INVENTORY_CATEGORIES,
+        "ready": READY_CATEGORIES,
+        "title": tuple((kw, (kw,)) for kw in TITLE_KEYWORDS),
+        "branch": tuple((kw.rstrip("/"), (kw,)) for kw in BRANCH_SIGNALS),
+        "body": (("automation_marker", BODY_MARKERS),),
+    }
+    entries = {}
+    for vocab, groups in vocabularies.items():
+        for rank, (label, keywords) in enumerate(groups):
+            for kw in keywords:
+                entries.setdefault(kw, []).append((vocab, rank, label))
+    keywords = sorted(entries, key=len, reverse=True)
+    pattern = re.compile("(?=(" + "|".join(map(re.escape, keywords)) + "))")
+    # Longest alternative wins at an offset; shorter keyword prefixes match too.
+    hits = {
+        kw: [e for other in keywords if kw.startswith(other) for e in entries[other]]
+        for kw in keywords
+    }
+
+    def best(text, wanted):
+        found = {}
+        for kw in set(pattern.findall(text)):
+            for vocab, rank, label in hits[kw]:
+                if vocab in wanted and (vocab not in found or rank < found[vocab][0]):
+                    found[vocab] = (rank, label)
+        return {vocab: label for vocab, (_, label) in found.items()}
+
+    def classify(pr):
+        title = pr["title"].lower()
+        branch = pr["headRefName"].lower()
+        in_title = best(title, ("ready", "title"))
+        return {
+            "inventory": best(title + branch, ("inventory",)).get(
+                "inventory", "FEATURE"
+            ),
+            "ready": in_title.get("ready", "PERFORMANCE/REFACTOR/UI/FEATURE"),
+            "title": in_title.get("title"),
+            "branch": best(branch, ("branch",)).get("branch"),
+            "body": best(pr["body"].lower(), ("body",)).get("body"),
+        }
+
+    return classify
+
+
+def main():
+    count = 100_000
+    prs = generate_prs(count)
+    regex_classify = regex_alternation()
+
+    expected = [keyword_loops(pr) for pr in prs]
+    assert classify_prs(prs) == expected
+    assert [regex_classify(pr) for pr in prs[:2000]] == expected[:2000]
+
+    print(f"Dataset: {count} PRs (title, branch, body)")
+    old_time = timeit.timeit(lambda: [keyword_loops(pr) for pr in prs], number=3)
+    new_time = timeit.timeit(lambda: classify_prs(prs), number=3)
+    regex_time = timeit.timeit(lambda: [regex_classify(pr) for pr in prs], number=3)
+    print(f"per-module keyword loops:    {old_time / 3:.4f} seconds")
+    print(f"pr_classifier.classify_prs:  {new_time / 3:.4f} seconds")
+    print(f"single lookahead regex:      {regex_time / 3:.4f} seconds")
+    print(f"classify_prs vs loops: {old_time / new_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
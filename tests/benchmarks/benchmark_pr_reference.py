@@ -0,0 +1,63 @@
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from pr_reference import (  # noqa: E402
+    PRReference,
+    _parse_pr_number,
+    _split_repo,
+    clear_parse_caches,
+)
+
+
+def generate_refs(count, distinct=300, seed=42):
+    """``count`` ref strings drawn from ``distinct`` PRs, as triage sees them."""
+    rng = random.Random(seed)
+    owners = ["abhimehro", "octo-org", "some.user"]
+    names = ["personal-config", "ctrld-sync", "email-security-pipeline", "dotfiles"]
+    pool = [
+        f"{rng.choice(owners)}/{rng.choice(names)}#{rng.randint(1, 900)}"
+        for _ in range(distinct)
+    ]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def uncached_from_string(ref):
+    """The pre-cache parse: regex validation and a new object on every call."""
+    repo, _, pr = ref.strip().partition("#")
+    owner, name = _split_repo.__wrapped__(repo)
+    return PRReference(owner, name, _parse_pr_number.__wrapped__(pr))
+
+
+def main():
+    count = 200_000
+    refs = generate_refs(count)
+    clear_parse_caches()
+
+    assert [uncached_from_string(r) for r in refs] == [
+        PRReference.from_string(r) for r in refs
+    ]
+
+    print(f"Dataset: {count} ref strings, 300 distinct PRs")
+    old_time = timeit.timeit(lambda: [uncached_from_string(r) for r in refs], number=3)
+    new_time = timeit.timeit(
+        lambda: [PRReference.from_string(r) for r in refs], number=3
+    )
+    print(f"validate every call:  {old_time / 3:.4f} seconds")
+    print(f"cached + interned:    {new_time / 3:.4f} seconds")
+    print(f"Speedup: {old_time / new_time:.2f}x")
+
+    # Dict lookups keyed by references parsed elsewhere (e.g. GraphQL batches).
+    table = {PRReference.from_string(r): None for r in refs}
+    keys = [PRReference.from_string(r) for r in refs]
+    lookup_time = timeit.timeit(lambda: [table[k] for k in keys], number=3)
+    print(f"{count} dict lookups:  {lookup_time / 3:.4f} seconds")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import html
+import importlib.util
+import os
+import sys
+import timeit
+
+
+def load_morning_brief():
+    script_path = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        "scripts",
+        "morning-brief",
+        "morning-brief.py",
+    )
+    spec = importlib.util.spec_from_file_location("morning_brief", script_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["morning_brief"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def generate_summaries(count):
+    """Feed-style summaries: short snippets plus long full-article bodies."""
+    paragraph = (
+        "<p>The <b>quick</b> brown fox &amp; the <a href=\"https://example.com/?a=1&amp;b=2\">"
+        "lazy dog</a> &mdash; caf&eacute; edition.</p>\n"
+    )
+    summaries = []
+    for i in range(count):
+        if i % 4 == 0:
+            summaries.append(paragraph * 40)
+        elif i % 4 == 1:
+            summaries.append("&lt;p&gt;Escaped &lt;em&gt;markup&lt;/em&gt;&lt;/p&gt;")
+        else:
+            summaries.append(paragraph)
+    return summaries
+
+
+def main():
+    mb = load_morning_brief()
+    count = 2000
+    iterations = 10
+    summaries = generate_summaries(count)
+
+    def chain():
+        for raw in summaries:
+            mb.sanitize_text(mb.truncate_text(mb.strip_html_tags(html.unescape(raw))))
+
+    def single_pass():
+        for raw in summaries:
+            mb.clean_summary(raw)
+
+    for raw in summaries[:4]:
+        expected = mb.sanitize_text(
+            mb.truncate_text(mb.strip_html_tags(html.unescape(raw)))
+        )
+        assert mb.clean_summary(raw) == expected
+
+    print(f"Dataset: {count} summaries. Iterations: {iterations}")
+    old_time = timeit.timeit(chain, number=iterations)
+    new_time = timeit.timeit(single_pass, number=iterations)
+
+    print(f"unescape/strip/truncate/sanitize chain: {old_time:.4f} seconds")
+    print(f"clean_summary single pass:             {new_time:.4f} seconds")
+    print(f"Speedup: {old_time / new_time:.2f}x faster")
+
+
+if __name__ == "__main__":
+    main()
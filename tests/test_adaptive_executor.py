@@ -0,0 +1,101 @@
+import sys
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, "/".join(__file__.split("/")[:-2]))
+
+from adaptive_executor import AdaptiveExecutor, note_gh_result, report_throttle
+
+
+class TestAdaptiveExecutor(unittest.TestCase):
+    def test_map_keeps_order_and_propagates_errors(self):
+        with AdaptiveExecutor() as executor:
+            results = list(executor.map(lambda x: x * 2, range(20)))
+            self.assertEqual(results, list(range(0, 40, 2)))
+            future = executor.submit(lambda: 1 / 0)
+            with self.assertRaises(ZeroDivisionError):
+                future.result()
+        self.assertEqual(executor.stats.failed, 1)
+
+    def test_never_exceeds_limit(self):
+        lock = threading.Lock()
+        running = peak = 0
+
+        def task(_):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+
+        with AdaptiveExecutor(max_workers=3, initial_workers=3) as executor:
+            list(executor.map(task, range(30)))
+        self.assertLessEqual(peak, 3)
+
+    def test_fast_completions_grow_limit_additively(self):
+        with AdaptiveExecutor(max_workers=8, initial_workers=2) as executor:
+            list(executor.map(lambda x: x, range(100)))
+        stats = executor.stats
+        self.assertEqual(stats.limit, 8)
+        self.assertEqual(stats.completed, 100)
+        self.assertEqual(stats.in_flight, 0)
+
+    def test_slow_completion_halves_limit(self):
+        with AdaptiveExecutor(initial_workers=4, latency_tolerance=3.0) as executor:
+            executor.submit(lambda: None).result()
+            executor.submit(time.sleep, 0.35)
+        self.assertEqual(executor.stats.limit, 2)
+
+    def test_throttle_halves_and_pauses_dispatch(self):
+        with AdaptiveExecutor(initial_workers=4, retry_throttled=0) as executor:
+            executor.submit(report_throttle, 0.2).result()
+            stats = executor.stats
+            self.assertEqual((stats.limit, stats.throttled), (2, 1))
+            self.assertGreater(stats.paused_for, 0)
+            start = time.monotonic()
+            executor.submit(lambda: None).result()
+            self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+    def test_report_outside_executor_is_ignored(self):
+        self.assertFalse(report_throttle(1))
+
+    def test_gh_rate_limit_stderr_reports_throttle(self):
+        limited = SimpleNamespace(
+            returncode=1, stderr="HTTP 403: You have exceeded a secondary rate limit"
+        )
+        denied = SimpleNamespace(returncode=1, stderr="HTTP 404: Not Found")
+        with AdaptiveExecutor(default_retry_after=0, retry_throttled=0) as executor:
+            executor.submit(note_gh_result, denied).result()
+            self.assertEqual(executor.stats.throttled, 0)
+            executor.submit(note_gh_result, limited).result()
+            self.assertEqual(executor.stats.throttled, 1)
+
+    def test_throttled_task_is_retried_after_the_pause(self):
+        attempts = []
+
+        def lookup():
+            attempts.append(time.monotonic())
+            if len(attempts) == 1:
+                report_throttle(0.1)
+                return None
+            return "data"
+
+        with AdaptiveExecutor() as executor:
+            self.assertEqual(executor.submit(lookup).result(), "data")
+        self.assertGreaterEqual(attempts[1] - attempts[0], 0.09)
+        stats = executor.stats
+        self.assertEqual((stats.completed, stats.retried), (1, 1))
+
+    def test_throttle_retries_are_bounded(self):
+        with AdaptiveExecutor(retry_throttled=2) as executor:
+            future = executor.submit(report_throttle, 0)
+            self.assertTrue(future.result())
+        self.assertEqual(executor.stats.throttled, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
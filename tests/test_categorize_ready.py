@@ -17,6 +17,8 @@ class TestCategorizeReady(unittest.TestCase):
                 "load_gh_token_env",
                 "fetch_pr_info",
                 "get_category_from_title",
+                "ready_from_store",
+                "select_ready",
             },
         )
         self.mod._CATEGORIES = (
@@ -112,6 +114,27 @@ class TestCategorizeReady(unittest.TestCase):
             "PERFORMANCE/REFACTOR/UI/FEATURE",
         )
 
+    def test_select_ready_needs_flag_and_recent_labels(self):
+        from pr_store import PRStore
+
+        self.mod.ready_prs = ["owner/repo#9"]
+        self.mod.FROM_STORE_FLAG = "--from-store"
+        store = PRStore()
+        store.set_labels(
+            "triage",
+            {"owner/repo#1": "READY", "owner/repo#2": "READY", "owner/repo#3": "READY"},
+        )
+        store.set_labels("duplicate", {"owner/repo#3": "DUPLICATE"})
+        with store._conn:
+            store._conn.execute(
+                "UPDATE labels SET decided_at = '2020-01-01T00:00:00+00:00' "
+                "WHERE stage = 'duplicate' OR number = 2"
+            )
+        self.assertEqual(self.mod.select_ready(store, []), ["owner/repo#9"])
+        self.assertEqual(
+            self.mod.select_ready(store, ["--from-store"]), ["owner/repo#1"]
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
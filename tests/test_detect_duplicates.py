@@ -1,5 +1,6 @@
 import os
 import sys
+import tempfile
 import unittest
 from unittest.mock import patch
 
@@ -9,14 +10,20 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from detect_duplicates import (
     _extract_duplicates_from_groups,
+    _fetch_diff,
     _generate_duplicate_section,
     _generate_ready_section,
-    _generate_superseded_section,
-    _get_superseded_text,
     _group_prs_by_files,
+    _similarity_from_argv,
     get_duplicates,
-    rewrite_triage_file,
+    ready_candidates,
+    update_triage_sections,
+    write_triage_report,
 )
+from pr_diffs import Diff
+from pr_markdown import MarkdownIndex
+from pr_reference import PRReference
+from pr_store import PRStore
 
 
 class TestDetectDuplicates(unittest.TestCase):
@@ -68,34 +75,6 @@ class TestDetectDuplicates(unittest.TestCase):
         duplicates = _extract_duplicates_from_groups(file_groups)
         self.assertEqual(duplicates, ["repoA#456", "repoA#123", "repoC#202"])
 
-    def test_generate_superseded_section(self):
-        """Test _generate_superseded_section with matching PRs."""
-        ready_prs = ["repoA#123", "repoB#456", "repoC#789"]
-        superseded_text = "- repoA#123\nsome other text\nrepoB#456"
-        out = _generate_superseded_section(ready_prs, superseded_text)
-        self.assertEqual(out, ["## SUPERSEDED", "- repoA#123", "- repoB#456"])
-
-    def test_generate_superseded_section_with_prefix(self):
-        """Test _generate_superseded_section where ready PRs already have a dash prefix."""
-        ready_prs = ["- repoA#123", "repoB#456"]
-        superseded_text = "- repoA#123\nrepoB#456"
-        out = _generate_superseded_section(ready_prs, superseded_text)
-        self.assertEqual(out, ["## SUPERSEDED", "- repoA#123", "- repoB#456"])
-
-    def test_generate_superseded_section_empty(self):
-        """Test _generate_superseded_section with no matches."""
-        ready_prs = ["repoA#123"]
-        superseded_text = "nothing here"
-        out = _generate_superseded_section(ready_prs, superseded_text)
-        self.assertEqual(out, ["## SUPERSEDED"])
-
-    def test_generate_superseded_section_empty_input(self):
-        """Test _generate_superseded_section with empty inputs."""
-        self.assertEqual(_generate_superseded_section([], "text"), ["## SUPERSEDED"])
-        self.assertEqual(
-            _generate_superseded_section(["repoA#123"], ""), ["## SUPERSEDED"]
-        )
-
     def test_generate_duplicate_section(self):
         """Test _generate_duplicate_section with duplicates."""
         duplicates = ["repoA#123", "repoB#456"]
@@ -249,6 +228,81 @@ class TestDetectDuplicates(unittest.TestCase):
         self.assertEqual(len(result[key]), 1)
         self.assertEqual(result[key][0]["number"], 1)
 
+    @patch("detect_duplicates._fetch_diff")
+    @patch("detect_duplicates.run_gh")
+    def test_get_duplicates_reports_near_duplicates(self, mock_run_gh, mock_diff):
+        """PRs with different file sets but near-identical diffs are flagged."""
+        shared = "".join(f"+dep{i} = 1.{i}\n" for i in range(30))
+        mock_run_gh.return_value = {
+            "data": {
+                f"pr{j}": {
+                    "pullRequest": {
+                        "number": number,
+                        "title": f"PR {number}",
+                        "files": {"nodes": [{"path": path} for path in paths]},
+                    }
+                }
+                for j, (number, paths) in enumerate(
+                    [
+                        (1, ["requirements.txt"]),
+                        (2, ["requirements.txt", "CHANGELOG.md"]),
+                        (3, ["src/app.py"]),
+                    ]
+                )
+            }
+        }
+        diffs = {
+            1: "--- a/requirements.txt\n" + shared,
+            2: "--- a/requirements.txt\n" + shared + "--- a/CHANGELOG.md\n+bump\n",
+            3: "--- a/src/app.py\n+print(1)\n",
+        }
+        mock_diff.side_effect = lambda repo, number, head: diffs[number]
+
+        ready_only = ["repoA/projectA#1", "repoA/projectA#2", "repoA/projectA#3"]
+        self.assertEqual(get_duplicates(ready_only), [])
+        self.assertEqual(
+            get_duplicates(ready_only, similarity=0.8), ["repoA/projectA#1"]
+        )
+
+    @patch("detect_duplicates._fetch_diff")
+    @patch("detect_duplicates.run_gh")
+    def test_near_duplicates_skip_prs_without_a_diff(self, mock_run_gh, mock_diff):
+        """Shared paths alone never flag a PR whose diff could not be read."""
+        paths = [f"src/m{i}.py" for i in range(6)]
+        mock_run_gh.return_value = {
+            "data": {
+                f"pr{j}": {
+                    "pullRequest": {
+                        "number": number,
+                        "title": f"PR {number}",
+                        "files": {"nodes": [{"path": path} for path in files]},
+                    }
+                }
+                for j, (number, files) in enumerate([(1, paths[:5]), (2, paths)])
+            }
+        }
+        mock_diff.side_effect = lambda repo, number, head: None if number == 1 else ""
+
+        ready_only = ["repoA/projectA#1", "repoA/projectA#2"]
+        with patch("sys.stderr"):
+            self.assertEqual(get_duplicates(ready_only, similarity=0.8), [])
+
+    @patch("detect_duplicates.fetch_diff", return_value=Diff("x" * 8, truncated=True))
+    def test_fetch_diff_is_capped_and_keyed_by_head(self, mock_fetch_diff):
+        with patch.dict("os.environ", {"GH_DIFF_MAX_BYTES": "8"}):
+            self.assertEqual(_fetch_diff("repoA/projectA", 4, "abc"), "x" * 8)
+        args, kwargs = mock_fetch_diff.call_args
+        self.assertEqual(args, (PRReference.from_parts("repoA/projectA", "4"), "abc"))
+        self.assertEqual(kwargs["max_bytes"], 8)
+        self.assertIn("cache", kwargs)
+
+    def test_similarity_is_opt_in(self):
+        self.assertIsNone(_similarity_from_argv([]))
+        self.assertEqual(_similarity_from_argv(["--similarity", "0.9"]), 0.9)
+        self.assertEqual(_similarity_from_argv(["--similarity"]), 0.8)
+        with self.assertRaises(SystemExit):
+            _similarity_from_argv(["--similarity", "2"])
+
     @patch("detect_duplicates._extract_duplicates_from_groups")
     @patch("detect_duplicates._group_prs_by_files")
     def test_get_duplicates(self, mock_group, mock_extract):
@@ -256,93 +310,62 @@ class TestDetectDuplicates(unittest.TestCase):
         mock_extract.return_value = ["dup1", "dup2"]
         ready_only = ["pr1", "pr2"]
         result = get_duplicates(ready_only)
-        mock_group.assert_called_once_with(ready_only)
+        mock_group.assert_called_once_with(ready_only, None)
         mock_extract.assert_called_once_with({"group1": ["pr1"]})
         self.assertEqual(result, ["dup1", "dup2"])
 
-    @patch("builtins.open", new_callable=unittest.mock.mock_open)
-    def test_rewrite_triage_file(self, mock_file):
-        lines = [
-            "## SUPERSEDED\n",
-            "- org/repo#1\n",
-            "## STALE\n",
-            "## READY\n",
-        ]
-        ready_prs = ["org/repo#1", "org/repo#2"]
-        duplicates = ["org/repo#3"]
-        ready_only = ["org/repo#2", "org/repo#4"]
-
-        rewrite_triage_file(lines, ready_prs, duplicates, ready_only)
-
-        mock_file.assert_called_once_with("tasks/pr-triage.md", "w")
-        handle = mock_file()
-
-        expected_content = (
-            "# PR Triage\n\n"
+    def test_update_triage_sections_edits_only_duplicate_and_ready(self):
+        index = MarkdownIndex.from_text(
+            "# PR Triage\n\nHand-written notes.\n\n"
+            "## STALE\n- org/repo#9\n\n"
+            "## DUPLICATE\n- org/repo#1\n\n"
+            "## READY\n- org/repo#2\n- org/repo#3\n- org/repo#4\n"
+        )
+        update_triage_sections(index, ["org/repo#3"], ["org/repo#2", "org/repo#3"])
+        self.assertEqual(
+            index.text(),
+            "# PR Triage\n\nHand-written notes.\n\n"
+            "## STALE\n- org/repo#9\n\n"
+            "## DUPLICATE\n- org/repo#3\n\n"
+            "## READY\n- org/repo#2\n",
+        )
+
+    def test_earlier_duplicates_are_rechecked(self):
+        index = MarkdownIndex.from_text(
+            "## STALE\n- org/repo#9\n"
+            "## DUPLICATE\n- org/repo#1\n- org/repo#9\n"
+            "## READY\n- org/repo#2\n"
+        )
+        ready_only = ready_candidates(index)
+        self.assertEqual(ready_only, ["org/repo#1", "org/repo#2"])
+        # No longer a duplicate this run: back to READY.
+        update_triage_sections(index, [], ready_only)
+        self.assertEqual(index.refs("DUPLICATE"), [])
+        self.assertEqual(index.refs("READY"), ["org/repo#1", "org/repo#2"])
+
+    def test_store_report_keeps_hand_written_notes(self):
+        store = PRStore()
+        store.set_labels("triage", {"org/repo#9": "STALE", "org/repo#2": "READY"})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "pr-triage.md")
+            with open(path, "w") as f:
+                f.write(
+                    "# PR Triage\n\nHand-written notes.\n\n"
+                    "## STALE\n- org/repo#8\n\n"
+                    "## READY\n- org/repo#1\n"
+                )
+            write_triage_report(store, ["org/repo#3"], ["org/repo#2"], path)
+            with open(path) as f:
+                text = f.read()
+        self.assertEqual(
+            text,
+            "# PR Triage\n\nHand-written notes.\n\n"
             "## SUPERSEDED\n"
-            "- org/repo#1\n"
-            "## STALE\n"
+            "## STALE\n- org/repo#9\n\n"
             "## CONFLICTING\n"
-            "- abhimehro/personal-config#725\n"
-            "## DUPLICATE\n"
-            "- org/repo#3\n"
-            "## READY\n"
-            "- org/repo#2\n"
-            "- org/repo#4\n"
+            "## DUPLICATE\n- org/repo#3\n"
+            "## READY\n- org/repo#2\n",
         )
-        handle.write.assert_called_once_with(expected_content)
-
-    def test_get_superseded_text_variants(self):
-        """Test _get_superseded_text with various marker combinations."""
-        cases = [
-            (
-                "both markers",
-                [
-                    "## SUPERSEDED\n",
-                    "- org/repo#1\n",
-                    "- org/repo#2\n",
-                    "## STALE\n",
-                    "- org/repo#3\n",
-                ],
-                "- org/repo#1\n- org/repo#2\n",
-            ),
-            (
-                "missing superseded",
-                [
-                    "- org/repo#1\n",
-                    "- org/repo#2\n",
-                    "## STALE\n",
-                    "- org/repo#3\n",
-                ],
-                "- org/repo#1\n- org/repo#2\n",
-            ),
-            (
-                "missing stale",
-                [
-                    "## SUPERSEDED\n",
-                    "- org/repo#1\n",
-                    "- org/repo#2\n",
-                ],
-                "- org/repo#1\n- org/repo#2\n",
-            ),
-            (
-                "missing both",
-                [
-                    "- org/repo#1\n",
-                    "- org/repo#2\n",
-                ],
-                "- org/repo#1\n- org/repo#2\n",
-            ),
-            (
-                "empty input",
-                [],
-                "",
-            ),
-        ]
-
-        for name, lines, expected in cases:
-            with self.subTest(name=name):
-                self.assertEqual(_get_superseded_text(lines), expected)
 
 
 if __name__ == "__main__":
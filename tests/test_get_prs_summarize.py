@@ -1,12 +1,17 @@
+import io
+import os
 import sys
 import unittest
+from contextlib import redirect_stdout
 from pathlib import Path
+from unittest.mock import patch
 
 # Add scripts directory to path to import the module
 scripts_dir = Path(__file__).parent.parent / "scripts"
 sys.path.append(str(scripts_dir))
 
-from get_prs_summarize import automation_hints, check_summary
+from get_prs_summarize import automation_hints, check_summary, print_table
+from pr_store import PRStore
 
 
 class TestAutomationHints(unittest.TestCase):
@@ -169,5 +174,91 @@ class TestCheckSummary(unittest.TestCase):
         self.assertEqual(check_summary(rollup), "FAIL_1")
 
 
+def _review(login, state="COMMENTED", body="looks fine"):
+    return {"author": {"login": login}, "state": state, "body": body}
+
+
+FULL_DETAILS = {
+    "reviewDecision": "APPROVED",
+    "reviews": [_review(f"r{i}") for i in range(5)],
+    "latestReviews": [_review(f"l{i}", "APPROVED") for i in range(4)],
+    "comments": [{"author": {"login": f"c{i}"}, "body": f"note {i}"} for i in range(6)],
+}
+
+
+def _graphql_details(cmd_list):
+    """``gh api graphql`` answer with the connections trimmed as requested."""
+    query = cmd_list[4]
+    assert "latestReviews(first: 3)" in query and "comments(last: 2)" in query
+    node = {
+        "reviewDecision": "APPROVED",
+        "reviewTotal": {"totalCount": 5},
+        "latestReviewSample": {
+            "totalCount": 4,
+            "nodes": FULL_DETAILS["latestReviews"][:3],
+        },
+        "recentComments": {"totalCount": 6, "nodes": FULL_DETAILS["comments"][-2:]},
+    }
+    count = query.count("pullRequest(")
+    return {"data": {f"pr{j}": {"pullRequest": node} for j in range(count)}}
+
+
+class TestDetailsSection(unittest.TestCase):
+    PRS = [{"number": 1, "title": "a"}, {"number": 2, "title": "b"}]
+
+    def _render(self, mode, store=None):
+        env = {"GH_DETAIL_REPO": "o/r", "GH_DETAILS_MODE": mode}
+        out = io.StringIO()
+        with patch.dict(os.environ, env), redirect_stdout(out):
+            print_table(self.PRS, include_details=True, store=store)
+        return out.getvalue()
+
+    @patch("get_prs_summarize.fetch_details", return_value=FULL_DETAILS)
+    @patch("gh_cache.run_json", side_effect=_graphql_details)
+    def test_batch_output_matches_per_pr_output(self, mock_run_json, mock_fetch):
+        per_pr = self._render("per-pr")
+        self.assertEqual(mock_fetch.call_count, 2)
+        mock_run_json.assert_not_called()
+
+        batch = self._render("batch")
+        self.assertEqual(batch, per_pr)
+        self.assertEqual(mock_fetch.call_count, 2)
+        self.assertEqual(mock_run_json.call_count, 1)
+        self.assertIn("- review threads: 5 raw / 4 latest", batch)
+        self.assertIn("  - comment c5: note 5", batch)
+
+    @patch("get_prs_summarize.fetch_details", return_value=FULL_DETAILS)
+    @patch("gh_cache.run_json", side_effect=_graphql_details)
+    def test_store_backed_batch_keeps_counts(self, mock_run_json, _mock_fetch):
+        per_pr = self._render("per-pr")
+        with PRStore(":memory:") as store:
+            batch = self._render("batch", store)
+            # A second run is served from the store with the same counts.
+            again = self._render("batch", store)
+        self.assertEqual(batch, per_pr)
+        self.assertEqual(again, per_pr)
+        self.assertEqual(mock_run_json.call_count, 1)
+
+    @patch("get_prs_summarize.fetch_details", return_value=FULL_DETAILS)
+    @patch("gh_cache.run_json", side_effect=_graphql_details)
+    def test_review_context_does_not_overwrite_full_reviews(
+        self, _mock_run_json, mock_fetch
+    ):
+        with PRStore(":memory:") as store:
+            self._render("per-pr", store)
+            self._render("batch", store)
+            reviews = store.fields("o/r", 1, "reviews")
+            context = store.fields("o/r", 1, "review_context")
+        self.assertEqual(reviews["latestReviews"], FULL_DETAILS["latestReviews"])
+        self.assertEqual(context["latestReviewSample"]["totalCount"], 4)
+        self.assertEqual(mock_fetch.call_count, 2)
+
+    @patch("get_prs_summarize.fetch_details", return_value=FULL_DETAILS)
+    @patch("gh_cache.run_json", return_value=None)
+    def test_failed_batch_falls_back_to_per_pr(self, _mock_run_json, mock_fetch):
+        self.assertIn("- issue comments: 6", self._render("batch"))
+        self.assertEqual(mock_fetch.call_count, 2)
+
+
 if __name__ == "__main__":
     unittest.main()
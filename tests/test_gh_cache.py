@@ -0,0 +1,133 @@
+import os
+import stat
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, "/".join(__file__.split("/")[:-2]))
+
+import gh_cache
+from gh_cache import GhCache, cache_key, configure, is_read_only
+
+PR_VIEW = ["gh", "pr", "view", "1", "-R", "o/r", "--json", "title"]
+REST_GET = ["gh", "api", "repos/o/r/pulls/1"]
+
+
+def _completed(stdout, returncode=0):
+    return MagicMock(returncode=returncode, stdout=stdout, stderr="")
+
+
+class TestIsReadOnly(unittest.TestCase):
+    def test_read_only_commands(self):
+        self.assertTrue(is_read_only(PR_VIEW))
+        self.assertTrue(is_read_only(["gh", "pr", "diff", "1", "-R", "o/r"]))
+        self.assertTrue(is_read_only(REST_GET))
+        self.assertTrue(
+            is_read_only(["gh", "api", "graphql", "-f", "query=query { viewer }"])
+        )
+
+    def test_mutating_commands(self):
+        self.assertFalse(is_read_only(["gh", "pr", "merge", "1", "-R", "o/r"]))
+        self.assertFalse(
+            is_read_only(["gh", "api", "graphql", "-f", "query=mutation { x }"])
+        )
+        self.assertFalse(is_read_only(["gh", "api", "repos/o/r/issues", "-f", "t=x"]))
+        self.assertFalse(is_read_only(["gh", "api", "-X", "DELETE", "repos/o/r"]))
+        self.assertFalse(is_read_only(["git", "status"]))
+
+    def test_key_ignores_field_order_and_query_whitespace(self):
+        a = ["gh", "api", "graphql", "-f", "query=query {  a }", "-F", "pr0=1"]
+        b = ["gh", "api", "graphql", "-F", "pr0=1", "-f", "query=query {\n a }"]
+        self.assertEqual(cache_key(a, {}), cache_key(b, {}))
+        self.assertNotEqual(cache_key(a, {}), cache_key(a, {"GH_TOKEN": "other"}))
+
+
+class TestGhCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = GhCache(self.tmp.name, ttl=60)
+
+    @patch("subprocess.run")
+    def test_ttl_hit_skips_subprocess(self, mock_run):
+        mock_run.return_value = _completed('{"title": "t"}')
+        first = self.cache.run(PR_VIEW, env={})
+        second = self.cache.run(PR_VIEW, env={})
+        self.assertEqual(mock_run.call_count, 1)
+        self.assertEqual(second.stdout, first.stdout)
+        self.assertEqual(self.cache.hits, 1)
+        entry = os.path.join(self.tmp.name, cache_key(PR_VIEW, {}) + ".json")
+        self.assertEqual(stat.S_IMODE(os.stat(entry).st_mode), 0o600)
+
+    @patch("subprocess.run")
+    def test_expired_entry_refetches(self, mock_run):
+        mock_run.return_value = _completed("{}")
+        self.cache.ttl = 0
+        self.cache.run(PR_VIEW, env={})
+        self.cache.run(PR_VIEW, env={})
+        self.assertEqual(mock_run.call_count, 2)
+
+    @patch("subprocess.run")
+    def test_failures_are_not_cached(self, mock_run):
+        mock_run.return_value = _completed("", returncode=1)
+        self.cache.run(PR_VIEW, env={})
+        self.cache.run(PR_VIEW, env={})
+        self.assertEqual(mock_run.call_count, 2)
+
+    @patch("subprocess.run")
+    def test_rest_get_revalidates_with_etag(self, mock_run):
+        self.cache.ttl = 0
+        mock_run.side_effect = [
+            _completed('HTTP/2.0 200 OK\r\nEtag: W/"abc"\r\n\r\n{"n": 1}'),
+            _completed("HTTP/2.0 304 Not Modified\r\n\r\n", returncode=1),
+        ]
+        first = self.cache.run(REST_GET, env={})
+        second = self.cache.run(REST_GET, env={})
+        self.assertEqual(first.stdout, '{"n": 1}')
+        self.assertEqual(second.returncode, 0)
+        self.assertEqual(second.stdout, '{"n": 1}')
+        revalidate = mock_run.call_args_list[1][0][0]
+        self.assertIn("--include", revalidate)
+        self.assertIn('If-None-Match: W/"abc"', revalidate)
+        self.assertEqual(self.cache.revalidated, 1)
+
+
+class TestConfigure(unittest.TestCase):
+    def tearDown(self):
+        gh_cache._active = None
+
+    @patch("subprocess.run")
+    def test_disabled_by_default(self, mock_run):
+        mock_run.return_value = _completed("{}")
+        gh_cache.run(PR_VIEW, env={})
+        gh_cache.run(PR_VIEW, env={})
+        self.assertEqual(mock_run.call_count, 2)
+
+    def test_no_cache_flag(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertIsNone(configure(["--no-cache"], cache_dir=tmp))
+            self.assertIsNotNone(configure([], cache_dir=tmp))
+            with patch.dict(os.environ, {"GH_NO_CACHE": "1"}):
+                self.assertIsNone(configure([], cache_dir=tmp))
+
+    @patch("subprocess.run")
+    def test_mutations_bypass_enabled_cache(self, mock_run):
+        mock_run.return_value = _completed("")
+        with tempfile.TemporaryDirectory() as tmp:
+            configure([], cache_dir=tmp)
+            merge = ["gh", "pr", "merge", "1", "-R", "o/r", "--squash"]
+            gh_cache.run(merge, env={})
+            gh_cache.run(merge, env={})
+            self.assertEqual(mock_run.call_count, 2)
+            self.assertEqual(os.listdir(tmp), [])
+
+    @patch("subprocess.run", side_effect=subprocess.TimeoutExpired("gh", 1))
+    def test_timeouts_propagate(self, _mock_run):
+        with self.assertRaises(subprocess.TimeoutExpired):
+            gh_cache.run(PR_VIEW, env={}, timeout=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
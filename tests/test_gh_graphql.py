@@ -0,0 +1,206 @@
+import json
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, "/".join(__file__.split("/")[:-2]))
+
+import gh_cache
+from gh_graphql import PaginatedConnection, PullRequestBatcher, fetch_pull_requests
+from github_client import GitHubClient
+from pr_reference import PRReference
+
+
+def _field(cmd, name):
+    """Return the value of ``name=...`` from a ``gh api graphql`` argv."""
+    prefix = f"{name}="
+    for arg in cmd:
+        if arg.startswith(prefix):
+            return arg[len(prefix) :]
+    return None
+
+
+def _aliases(cmd):
+    count = 0
+    while _field(cmd, f"pr{count}") is not None:
+        count += 1
+    return count
+
+
+class FakeGh:
+    """Answer batched pullRequest queries from an in-memory table of PRs."""
+
+    def __init__(self, files=None, fail_numbers=(), transient=()):
+        self.files = files or {}
+        self.fail_numbers = set(fail_numbers)
+        self.transient = set(transient)
+        self.calls = []
+
+    def __call__(self, cmd):
+        self.calls.append(cmd)
+        data, errors = {}, []
+        for j in range(_aliases(cmd)):
+            number = int(_field(cmd, f"pr{j}"))
+            if number in self.fail_numbers:
+                return None
+            if number in self.transient:
+                self.transient.discard(number)
+                data[f"pr{j}"] = None
+                errors.append({"type": "INTERNAL", "path": [f"pr{j}"]})
+                continue
+            node = {"number": number}
+            if "files(" in _field(cmd, "query"):
+                paths = self.files.get(number, [])
+                cursor = _field(cmd, f"after{j}")
+                start = int(cursor) if cursor else 0
+                page = paths[start : start + 2]
+                end = start + len(page)
+                node["files"] = {
+                    "nodes": [{"path": p} for p in page],
+                    "pageInfo": {
+                        "hasNextPage": end < len(paths),
+                        "endCursor": str(end),
+                    },
+                }
+            data[f"pr{j}"] = {"pullRequest": node}
+        result = {"data": data}
+        if errors:
+            result["errors"] = errors
+        return result
+
+
+def _refs(count):
+    return [PRReference("owner", "repo", n) for n in range(1, count + 1)]
+
+
+class TestPullRequestBatcher(unittest.TestCase):
+    def test_coalesces_lookups_up_to_alias_limit(self):
+        gh = FakeGh()
+        result = fetch_pull_requests(gh, _refs(120), max_aliases=50)
+        self.assertEqual(len(gh.calls), 3)
+        self.assertEqual([_aliases(c) for c in gh.calls], [50, 50, 20])
+        self.assertEqual(result[PRReference("owner", "repo", 120)], {"number": 120})
+
+    def test_cost_limit_splits_batches(self):
+        gh = FakeGh()
+        files = PaginatedConnection("files", "path", page_size=100)
+        fetch_pull_requests(gh, _refs(10), "number", (files,), max_cost=404)
+        # Each alias costs 101 (the PR plus one page of files): four per batch.
+        self.assertEqual([_aliases(c) for c in gh.calls], [4, 4, 2])
+
+    def test_uses_declared_variables(self):
+        gh = FakeGh()
+        fetch_pull_requests(gh, [PRReference("o", "r", 7)], "title")
+        cmd = gh.calls[0]
+        self.assertEqual(cmd[:3], ["gh", "api", "graphql"])
+        self.assertIn("$owner0: String!", _field(cmd, "query"))
+        self.assertNotIn('"o"', _field(cmd, "query"))
+        self.assertIn("owner0=o", cmd)
+        self.assertIn("name0=r", cmd)
+        self.assertEqual(cmd[cmd.index("pr0=7") - 1], "-F")
+
+    def test_deduplicates_refs(self):
+        gh = FakeGh()
+        ref = PRReference("o", "r", 1)
+        result = fetch_pull_requests(gh, [ref, ref])
+        self.assertEqual(_aliases(gh.calls[0]), 1)
+        self.assertEqual(list(result), [ref])
+
+    def test_paginates_nested_connection(self):
+        gh = FakeGh(files={1: ["a", "b", "c", "d", "e"], 2: ["x"]})
+        files = PaginatedConnection("files", "path", page_size=2)
+        result = fetch_pull_requests(gh, _refs(2), "number", (files,))
+        nodes = result[PRReference("owner", "repo", 1)]["files"]["nodes"]
+        paths = [n["path"] for n in nodes]
+        self.assertEqual(paths, ["a", "b", "c", "d", "e"])
+        self.assertEqual(
+            result[PRReference("owner", "repo", 2)]["files"]["nodes"], [{"path": "x"}]
+        )
+        # One initial batch, then two follow-up pages only for PR 1.
+        self.assertEqual(len(gh.calls), 3)
+        self.assertEqual(_aliases(gh.calls[1]), 1)
+        self.assertIn("after0=2", gh.calls[1])
+
+    def test_retries_only_failed_aliases(self):
+        gh = FakeGh(transient={3})
+        result = fetch_pull_requests(gh, _refs(5))
+        self.assertEqual(len(gh.calls), 2)
+        self.assertEqual(_aliases(gh.calls[1]), 1)
+        self.assertEqual(_field(gh.calls[1], "pr0"), "3")
+        self.assertEqual(result[PRReference("owner", "repo", 3)], {"number": 3})
+
+    def test_permanent_alias_errors_are_not_retried(self):
+        def run(cmd):
+            return {
+                "data": {"pr0": {"pullRequest": {"number": 1}}, "pr1": None},
+                "errors": [{"type": "NOT_FOUND", "path": ["pr1"]}],
+            }
+
+        batcher = PullRequestBatcher(run)
+        result = batcher.fetch(_refs(2))
+        self.assertEqual(batcher.requests, 1)
+        self.assertIsNone(result[PRReference("owner", "repo", 2)])
+
+    def test_failed_batch_is_bisected(self):
+        gh = FakeGh(fail_numbers={4})
+        result = fetch_pull_requests(gh, _refs(8))
+        self.assertIsNone(result[PRReference("owner", "repo", 4)])
+        for n in (1, 2, 3, 5, 6, 7, 8):
+            self.assertEqual(result[PRReference("owner", "repo", n)], {"number": n})
+
+    def test_retry_budget_bounds_requests(self):
+        batcher = PullRequestBatcher(lambda cmd: None, retry_budget=2)
+        result = batcher.fetch(_refs(16))
+        self.assertEqual(set(result.values()), {None})
+        self.assertEqual(batcher.requests, 5)
+
+    def test_empty_input_makes_no_requests(self):
+        gh = FakeGh()
+        self.assertEqual(fetch_pull_requests(gh, []), {})
+        self.assertEqual(gh.calls, [])
+
+
+class TestThroughGhTransport(unittest.TestCase):
+    """Partial GraphQL errors via ``gh_cache.run_json`` and the in-process client."""
+
+    def setUp(self):
+        self.client = GitHubClient("token", session=object())
+        request = patch.object(self.client, "request", side_effect=self._answer)
+        request.start()
+        self.addCleanup(request.stop)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        gh_cache.configure([], cache_dir=tmp.name)
+        gh_cache.set_transport(self.client)
+        self.addCleanup(gh_cache.set_transport, None)
+        self.addCleanup(gh_cache.configure, [gh_cache.NO_CACHE_FLAG])
+        self.posts = 0
+
+    def _answer(self, method, path, **kwargs):
+        self.posts += 1
+        variables = kwargs["json"]["variables"]
+        data, errors = {}, []
+        for key, number in variables.items():
+            if not key.startswith("pr"):
+                continue
+            if number == 3:
+                data[key] = None
+                errors.append({"type": "NOT_FOUND", "path": [key]})
+            else:
+                data[key] = {"pullRequest": {"number": number}}
+        resp = MagicMock(status_code=200, reason="OK", headers={})
+        resp.text = json.dumps({"data": data, "errors": errors})
+        return resp
+
+    def test_one_missing_pr_does_not_sink_the_batch(self):
+        batcher = PullRequestBatcher(gh_cache.run_json)
+        result = batcher.fetch(_refs(50))
+        self.assertEqual(batcher.requests, 1)
+        self.assertEqual(self.posts, 1)
+        self.assertIsNone(result[PRReference("owner", "repo", 3)])
+        self.assertEqual(result[PRReference("owner", "repo", 4)], {"number": 4})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import json
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, "/".join(__file__.split("/")[:-2]))
+
+import gh_cache
+import github_client
+from github_client import GitHubClient
+
+
+def _response(status=200, body="", headers=None, reason="OK"):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.text = body if isinstance(body, str) else json.dumps(body)
+    resp.reason = reason
+    resp.headers = headers or {}
+    resp.json.side_effect = lambda: json.loads(resp.text)
+    return resp
+
+
+class TestGitHubClientTransport(unittest.TestCase):
+    def setUp(self):
+        self.client = GitHubClient("token", session=object())
+        patcher = patch.object(self.client, "request")
+        self.request = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_graphql_argv_becomes_single_post_with_typed_variables(self):
+        self.request.return_value = _response(body={"data": {"pr0": None}})
+        cmd = [
+            "gh", "api", "graphql",
+            "-f", "query=query ($o: String!, $n: Int!) { x }",
+            "-f", "o=owner",
+            "-F", "n=42",
+        ]  # fmt: skip
+        result = self.client(cmd, timeout=30)
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(json.loads(result.stdout), {"data": {"pr0": None}})
+        method, path = self.request.call_args[0]
+        kwargs = self.request.call_args[1]
+        self.assertEqual((method, path), ("POST", "graphql"))
+        self.assertEqual(kwargs["json"]["variables"], {"o": "owner", "n": 42})
+
+    def test_graphql_errors_exit_non_zero_like_gh(self):
+        self.request.return_value = _response(body={"data": None, "errors": [{}]})
+        result = self.client(["gh", "api", "graphql", "-f", "query=query { x }"])
+        self.assertEqual(result.returncode, 1)
+
+    def test_pr_view_maps_json_fields(self):
+        self.request.return_value = _response(
+            body={
+                "data": {
+                    "repository": {
+                        "pullRequest": {
+                            "updatedAt": "2026-01-01T00:00:00Z",
+                            "files": {"nodes": [{"path": "a.py"}]},
+                        }
+                    }
+                }
+            }
+        )
+        cmd = ["gh", "pr", "view", "7", "-R", "o/r", "--json", "files,updatedAt"]
+        result = self.client(cmd)
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(
+            json.loads(result.stdout),
+            {"updatedAt": "2026-01-01T00:00:00Z", "files": [{"path": "a.py"}]},
+        )
+        variables = self.request.call_args[1]["json"]["variables"]
+        self.assertEqual(variables, {"owner": "o", "name": "r", "number": 7})
+
+    def test_pr_diff_uses_diff_media_type(self):
+        self.request.return_value = _response(body="diff --git a b")
+        result = self.client(["gh", "pr", "diff", "7", "-R", "o/r"])
+        self.assertEqual(result.stdout, "diff --git a b")
+        self.assertEqual(self.request.call_args[0], ("GET", "repos/o/r/pulls/7"))
+        self.assertEqual(
+            self.request.call_args[1]["headers"]["Accept"],
+            "application/vnd.github.diff",
+        )
+
+    def test_include_renders_status_and_headers_for_etag_cache(self):
+        self.request.return_value = _response(
+            status=304, headers={"ETag": 'W/"abc"'}, reason="Not Modified"
+        )
+        cmd = ["gh", "api", "--include", "repos/o/r", "-H", 'If-None-Match: W/"abc"']
+        result = self.client(cmd)
+        self.assertEqual(result.returncode, 1)
+        self.assertEqual(gh_cache._split_included(result.stdout)[:2], (304, 'W/"abc"'))
+        self.assertEqual(
+            self.request.call_args[1]["headers"], {"If-None-Match": 'W/"abc"'}
+        )
+
+    def test_unsupported_commands_fall_back_to_gh(self):
+        for cmd in (
+            ["gh", "pr", "merge", "1", "-R", "o/r", "--squash"],
+            ["gh", "pr", "view", "1", "-R", "o/r", "--json", "reviews"],
+            ["gh", "pr", "view", "1", "--json", "title"],
+            ["gh", "api", "repos/{owner}/{repo}/pulls"],
+            ["gh", "api", "repos/o/r", "--jq", ".name"],
+            ["gh", "api", "graphql", "-F", "query=@q.graphql"],
+            ["gh", "pr", "diff", "1", "-R", "bad repo"],
+        ):
+            with self.subTest(cmd=cmd):
+                self.assertIsNone(self.client(cmd))
+        self.request.assert_not_called()
+
+    def test_network_errors_are_reported_as_failures(self):
+        self.request.side_effect = ConnectionError("reset")
+        result = self.client(["gh", "pr", "diff", "1", "-R", "o/r"])
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("reset", result.stderr)
+
+
+class TestRateLimitFeedback(unittest.TestCase):
+    @patch("github_client.report_throttle")
+    def test_rate_limit_responses_are_reported(self, report):
+        github_client._note_rate_limit(
+            _response(403, "secondary rate limit", {"Retry-After": "30"})
+        )
+        report.assert_called_once_with(30.0)
+        report.reset_mock()
+        github_client._note_rate_limit(_response(429))
+        report.assert_called_once_with()
+
+    @patch("github_client.report_throttle")
+    def test_permission_errors_are_not_throttles(self, report):
+        github_client._note_rate_limit(_response(403, "Resource not accessible"))
+        github_client._note_rate_limit(_response(200))
+        report.assert_not_called()
+
+
+class TestEnable(unittest.TestCase):
+    def tearDown(self):
+        gh_cache.set_transport(None)
+
+    def test_opt_outs(self):
+        self.assertIsNone(github_client.enable({"GH_CLIENT": "subprocess"}))
+        self.assertIsNone(
+            github_client.enable({"GH_TOKEN": "t", "GH_HOST": "ghe.example.com"})
+        )
+
+    @patch("github_client.GitHubClient", side_effect=ImportError("requests"))
+    def test_missing_requests_keeps_subprocess(self, _client):
+        self.assertIsNone(github_client.enable({"GH_TOKEN": "t"}))
+        self.assertIsNone(gh_cache._transport)
+
+    @patch("subprocess.run")
+    def test_installed_transport_serves_gh_cache_run(self, mock_run):
+        client = MagicMock(return_value=MagicMock(returncode=0, stdout="{}"))
+        with patch("github_client.GitHubClient", return_value=client):
+            github_client.enable({"GH_TOKEN": "t"})
+        result = gh_cache.run(["gh", "pr", "view", "1", "-R", "o/r"], env={})
+        self.assertEqual(result.stdout, "{}")
+        mock_run.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, "/".join(__file__.split("/")[:-2]))
+
+from merge_planner import conflict_graph, diff_paths, execute_plan, plan_merges
+from pr_diffs import Diff
+from run_merges import _changed_files, _gate_reasons, plan_queue, results
+
+DIFF = (
+    "diff --git a/src/app.py b/src/app.py\n"
+    "--- a/src/app.py\n"
+    "+++ b/src/app.py\n"
+    "@@ -1 +1 @@\n"
+    "-a\n"
+    "+b\n"
+    "diff --git a/old.txt b/new.txt\n"
+    "rename from old.txt\n"
+)
+
+
+def _repo(key):
+    return key[0]
+
+
+class TestConflictGraph(unittest.TestCase):
+    def test_diff_paths_include_both_rename_sides(self):
+        self.assertEqual(diff_paths(DIFF), {"src/app.py", "old.txt", "new.txt"})
+        self.assertEqual(diff_paths(""), set())
+
+    def test_edges_only_within_a_repo(self):
+        graph = conflict_graph(
+            {
+                ("a", 1): {"x.py", "y.py"},
+                ("a", 2): {"y.py"},
+                ("a", 3): {"z.py"},
+                ("b", 4): {"x.py"},
+            },
+            _repo,
+        )
+        self.assertEqual(graph[("a", 1)], {("a", 2)})
+        self.assertEqual(graph[("a", 2)], {("a", 1)})
+        self.assertEqual(graph[("a", 3)], set())
+        self.assertEqual(graph[("b", 4)], set())
+
+
+class TestPlanMerges(unittest.TestCase):
+    def setUp(self):
+        self.order = [("a", 1), ("a", 2), ("a", 3), ("a", 4), ("b", 5)]
+        self.files = {
+            ("a", 1): {"x.py"},
+            ("a", 2): {"x.py", "y.py"},
+            ("a", 3): {"z.py"},
+            ("a", 4): {"y.py"},
+            ("b", 5): {"x.py"},
+        }
+        self.plan = plan_merges(self.order, self.files, _repo)
+
+    def test_overlapping_prs_are_sequenced_in_queue_order(self):
+        self.assertEqual(
+            self.plan.waves,
+            [[("a", 1), ("a", 3), ("b", 5)], [("a", 2)], [("a", 4)]],
+        )
+
+    def test_describe_lists_blockers(self):
+        lines = self.plan.describe(lambda key: f"{key[0]}#{key[1]}")
+        self.assertEqual(lines[0], "Wave 1 (3 concurrent):")
+        self.assertIn("  - a#2  [after a#1]", lines)
+        self.assertIn("  - a#4  [after a#2]", lines)
+
+    def test_execute_rechecks_only_neighbours_of_merged_prs(self):
+        merged = []
+        rechecked = []
+
+        def merge(key):
+            merged.append(key)
+            return "boom" if key == ("a", 3) else None
+
+        def recheck(keys):
+            rechecked.append(list(keys))
+            return {("a", 2): "DIRTY"}
+
+        outcomes = execute_plan(self.plan, merge, recheck)
+        self.assertEqual(rechecked, [[("a", 2)]])
+        self.assertEqual(outcomes[("a", 2)], ("conflicting", "DIRTY"))
+        self.assertEqual(outcomes[("a", 3)], ("failed", "boom"))
+        # a#2 never merged, so a#4 had nothing new to re-check against.
+        self.assertEqual(outcomes[("a", 4)], ("merged", None))
+        self.assertNotIn(("a", 2), merged)
+
+
+class TestRunMergesPlanning(unittest.TestCase):
+    def setUp(self):
+        for items in results.values():
+            items.clear()
+        self.addCleanup(lambda: [items.clear() for items in results.values()])
+
+    def test_gate_reasons(self):
+        self.assertEqual(_gate_reasons("docs: typo", Diff("+hello")), [])
+        self.assertEqual(
+            _gate_reasons("docs: typo", Diff("+hello", truncated=True)),
+            ["Diff exceeds the size cap; not fully reviewed."],
+        )
+        self.assertEqual(
+            _gate_reasons("docs: typo", None),
+            ["Diff could not be fetched; not reviewed."],
+        )
+        self.assertEqual(
+            _gate_reasons("Fix auth flow", Diff("+eval(x)")),
+            [
+                "Dangerous evaluation function detected.",
+                "Touches sensitive domain (auth/payments/db).",
+            ],
+        )
+
+    def test_changed_files_prefers_stored_files(self):
+        info = {"files": [{"path": "a.py"}, {"path": "b.py"}]}
+        self.assertEqual(_changed_files(info, Diff(DIFF)), {"a.py", "b.py"})
+        self.assertEqual(_changed_files({}, Diff(DIFF)), diff_paths(DIFF))
+
+    @patch("builtins.print")
+    def test_plan_queue_gates_before_planning(self, _print):
+        ok = {"mergeStateStatus": "CLEAN"}
+        rows = [
+            ("o/r", "1", "one", ok, Diff(DIFF)),
+            ("o/r", "2", "two", {"mergeStateStatus": "DIRTY"}, Diff("")),
+            ("o/r", "3", "sql migration", ok, Diff(DIFF)),
+            ("o/r", "4", "four", ok, Diff(DIFF)),
+            ("o/r", "5", "five", None, Diff("")),
+            ("o/r", "6", "six", ok, None),
+        ]
+        plan, titles = plan_queue(rows)
+        self.assertEqual(plan.waves, [[("o/r", "1")], [("o/r", "4")]])
+        self.assertEqual(titles, {("o/r", "1"): "one", ("o/r", "4"): "four"})
+        self.assertEqual(results["conflicting"], [("o/r", "2", "two")])
+        self.assertEqual([item[1] for item in results["escalated"]], ["3", "6"])
+
+
+if __name__ == "__main__":
+    unittest.main()
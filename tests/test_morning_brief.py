@@ -12,6 +12,7 @@ import importlib.util
 import os
 import sys as _sys
 import tempfile
+import time
 import types
 import unittest
 from pathlib import Path
@@ -154,6 +155,55 @@ class TestStripHtmlTags(unittest.TestCase):
 # ============================================================
 
 
+class TestCleanSummary(unittest.TestCase):
+    CASES = [
+        "",
+        "plain",
+        "  <p>Hello &amp; <b>world</b></p>  ",
+        "&lt;b&gt;bold&lt;/b&gt; text",
+        "a < b and c > d",
+        '<a title="x>y">link</a> after',
+        "<!-- note --> text",
+        "&amp;amp; double",
+        "x" * 400,
+        "<p>" + "word " * 100 + "</p>",
+        "trailing <b",
+        "<p>Caf&eacute; &#8217;s</p>",
+        "&lt;script&gt;alert(1)&lt;/script&gt;",
+        "<p>" + "a " * 74 + "b  c</p>",
+        # Malformed markup is read the way HTMLParser reads it.
+        '<script>var a="<b>";</script>hi',
+        "<STYLE>p{}</STYLE>t",
+        "x <!-- a > b",
+        "<!-- a -- > b -->c",
+        "x <!-- unterminated",
+        '<div class="a">b<span "c>d</span>',
+        '<a href="x>y</a> tail',
+        "a < b and c > d",
+        "&lt;!-- encoded &gt; comment",
+        "&lt;span &quot;c&gt;d",
+        "<a&gt;> #39;!<b>",
+        '<a href="?a=1&amp;b=2">x</a> y',
+    ]
+
+    @staticmethod
+    def _chain(raw, max_len):
+        import html
+
+        return mb.sanitize_text(
+            mb.truncate_text(mb.strip_html_tags(html.unescape(raw)), max_len)
+        )
+
+    def test_matches_existing_chain(self):
+        for raw in self.CASES:
+            for max_len in (150, 10):
+                with self.subTest(raw=raw[:40], max_len=max_len):
+                    assert mb.clean_summary(raw, max_len) == self._chain(raw, max_len)
+
+    def test_escapes_output(self):
+        assert mb.clean_summary('&lt;b&gt;"q"&lt;/b&gt; &amp;lt;') == "&quot;q&quot; &lt;"
+
+
 class TestHtmlHelpers(unittest.TestCase):
     def test_html_li(self):
         assert mb.html_li("content") == "<li>content</li>"
@@ -194,6 +244,85 @@ class TestHtmlHelpers(unittest.TestCase):
         assert '<h3 id="caf-menu">Café Menu</h3>' in result
 
 
+class TestBriefWriter(unittest.TestCase):
+    def test_matches_string_helpers(self):
+        writer = mb.BriefWriter()
+        with writer.section("🌅 Good Morning"):
+            writer.ul(iter(["<li>a</li>", "<li>b</li>"]))
+        expected = mb.html_section(
+            "🌅 Good Morning", mb.html_ul(["<li>a</li>", "<li>b</li>"])
+        )
+        assert writer.getvalue() == expected
+
+    def test_empty_list(self):
+        writer = mb.BriefWriter()
+        writer.ul([])
+        assert writer.getvalue() == mb.html_ul([])
+
+    def test_reader_payload_round_trips(self):
+        import json
+
+        writer = mb.BriefWriter()
+        writer.write('<p>Café "quoted" \\ line\n</p>' * 50)
+        payload = mb.build_reader_payload(writer, {"title": "T", "tags": ["a"]})
+        assert json.loads(payload.decode("utf-8")) == {
+            "html": writer.getvalue(),
+            "title": "T",
+            "tags": ["a"],
+        }
+
+    def test_chunked_json_string_matches_dumps(self):
+        import io
+        import json
+
+        writer = mb.BriefWriter()
+        writer.write("ab\u2028\t\"c😀" * 7)
+        out = io.BytesIO()
+        writer.write_json_string(out, chunk_size=3)
+        assert json.loads(out.getvalue()) == writer.getvalue()
+        writer.write("tail")
+        assert writer.getvalue().endswith("tail")
+
+    def test_fragment_reused_for_identical_inputs(self):
+        calls = []
+
+        def _render(out):
+            calls.append(1)
+            out.write("<p>x</p>")
+
+        with tempfile.TemporaryDirectory() as td:
+            cache = mb.FileCache(td)
+            for _ in range(2):
+                writer = mb.BriefWriter()
+                writer.fragment(cache, "test", {"a": 1}, _render)
+                assert writer.getvalue() == "<p>x</p>"
+            writer.fragment(cache, "test", {"a": 2}, _render)
+        assert len(calls) == 2
+
+    def test_fragment_cache_is_bounded(self):
+        with tempfile.TemporaryDirectory() as td:
+            for n in range(6):
+                cache = mb.FileCache(td)
+                cache.fragments.max_entries = 3
+                mb.BriefWriter().fragment(
+                    cache, "feed", {"n": n}, lambda out: out.write("<p>x</p>")
+                )
+            assert len(list((Path(td) / "fragments").glob("*.json"))) == 3
+            assert cache.fragments.get("feed", {"n": 5}) == "<p>x</p>"
+
+    def test_render_full_brief_skips_empty_sections(self):
+        daily = mb.DailyContext(today=dt.date(2026, 3, 25), today_iso="2026-03-25")
+        result = mb.render_full_brief(
+            daily=daily,
+            greeting_html="<p>g</p>",
+            focus_html="",
+            news_html="<p>n</p>",
+            podcast_html="",
+        )
+        assert result.count("<hr>") == 2
+        assert result.startswith("<h1>Morning Briefing</h1>")
+
+
 # ============================================================
 # Date Helpers
 # ============================================================
@@ -382,6 +511,79 @@ class TestScoreLinearIssue(unittest.TestCase):
 # ============================================================
 
 
+class TestRankLinearIssues(unittest.TestCase):
+    TODAY_ISO = "2026-03-25"
+    TODAY_DATE = dt.date(2026, 3, 25)
+
+    @staticmethod
+    def _issues(count):
+        import random
+
+        rng = random.Random(7)
+        states = ["started", "in_progress", "unstarted", "backlog", "triage", None]
+        labels = ["Bug", "HOTFIX", "feature request", "p0", "P1", None, "docs"]
+        issues = []
+        for i in range(count):
+            state_type = rng.choice(states)
+            issues.append(
+                {
+                    "identifier": f"ENG-{i}",
+                    "title": f"Issue {i % 17}",
+                    "priority": rng.choice([0, 1, 2, 3, 4, None]),
+                    "dueDate": rng.choice(
+                        [None, "", "2026-03-25", "2026-04-01", "2026-03-20"]
+                    ),
+                    "state": {"type": state_type} if state_type else None,
+                    "labels": {
+                        "nodes": [
+                            {"name": rng.choice(labels)}
+                            for _ in range(rng.randint(0, 3))
+                        ]
+                    },
+                    "updatedAt": rng.choice(
+                        ["", "2026-03-25T00:00:00Z", "2026-01-01T00:00:00Z", "bad"]
+                    ),
+                    "cycle": rng.choice([None, {"id": "c"}]),
+                }
+            )
+        return issues
+
+    def test_batch_scores_match_single_issue_scoring(self):
+        issues = self._issues(300)
+        expected = [
+            mb.score_linear_issue(i, self.TODAY_ISO, self.TODAY_DATE) for i in issues
+        ]
+        assert mb.score_linear_issues(issues, self.TODAY_ISO, self.TODAY_DATE) == (
+            expected
+        )
+
+    def test_top_k_matches_full_sort(self):
+        issues = self._issues(300)
+        scored = [
+            (mb.score_linear_issue(i, self.TODAY_ISO, self.TODAY_DATE), i)
+            for i in issues
+        ]
+        expected = sorted(
+            scored,
+            key=lambda p: (-p[0], p[1].get("dueDate") or "9999-12-31", p[1]["title"]),
+        )[:10]
+        ranked = mb.rank_linear_issues(
+            issues, self.TODAY_ISO, self.TODAY_DATE, 10, active_only=False
+        )
+        assert [i["identifier"] for _, i in ranked] == [
+            i["identifier"] for _, i in expected
+        ]
+
+    def test_closed_issues_skipped(self):
+        issues = [
+            {"identifier": "A", "title": "a", "state": {"type": "completed"}},
+            {"identifier": "B", "title": "b", "state": {"type": "Canceled"}},
+            {"identifier": "C", "title": "c", "state": {"type": "started"}},
+        ]
+        ranked = mb.rank_linear_issues(issues, self.TODAY_ISO, self.TODAY_DATE, 5)
+        assert [i["identifier"] for _, i in ranked] == ["C"]
+
+
 class TestBuildFocusMetaParts(unittest.TestCase):
     def test_full_item(self):
         item = mb.FocusItem(
@@ -622,6 +824,504 @@ class TestFileCache(unittest.TestCase):
             cache.set("html", "<h1>Hello</h1>")
             self.assertEqual(cache.get("html", ttl=60), "<h1>Hello</h1>")
 
+    def test_get_stale_fresh(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            cache = mb.FileCache(str(Path(td) / "cache"))
+            cache.set("k", "v")
+            self.assertEqual(cache.get_stale("k", ttl=60, max_staleness=0), ("v", True))
+
+    def test_get_stale_expired_within_window(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            cache = mb.FileCache(str(Path(td) / "cache"))
+            cache.set("k", "v")
+            self.assertIsNone(cache.get("k", ttl=-1))
+            self.assertEqual(
+                cache.get_stale("k", ttl=-1, max_staleness=60), ("v", False)
+            )
+
+    def test_get_stale_beyond_window(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            cache = mb.FileCache(str(Path(td) / "cache"))
+            cache.set("k", "v")
+            self.assertIsNone(cache.get_stale("k", ttl=-10, max_staleness=5))
+
+
+class TestStaleWhileRevalidate(unittest.TestCase):
+    def test_stale_feed_served_and_refreshed_in_background(self) -> None:
+        from unittest.mock import patch
+
+        with tempfile.TemporaryDirectory() as td:
+            cache = mb.FileCache(str(Path(td) / "cache"))
+            cache.set("feed-entries:https://example.com/feed", [{"title": "old"}])
+            refresher = mb.BackgroundRefresher(max_staleness=3600)
+
+            with patch.object(
+                mb, "_download_feed_entries", return_value=[{"title": "new"}]
+            ) as download:
+                result = mb.fetch_single_feed(
+                    "Feed",
+                    "https://example.com/feed",
+                    cache=cache,
+                    cache_ttl=-1,
+                    refresher=refresher,
+                )
+                self.assertIn("old", result)
+                self.assertNotIn("new", result)
+                self.assertEqual(refresher.drain(timeout=5), 1)
+                download.assert_called_once_with(
+                    "Feed",
+                    "https://example.com/feed",
+                    3,
+                    cache,
+                    mb.DEFAULT_FEED_MAX_BYTES,
+                    None,
+                )
+
+    def test_without_refresher_expired_entry_is_ignored(self) -> None:
+        from unittest.mock import patch
+
+        with tempfile.TemporaryDirectory() as td:
+            cache = mb.FileCache(str(Path(td) / "cache"))
+            cache.set("feed-entries:https://example.com/feed", [{"title": "old"}])
+
+            with patch.object(
+                mb, "_download_feed_entries", return_value=[{"title": "new"}]
+            ):
+                result = mb.fetch_single_feed(
+                    "Feed", "https://example.com/feed", cache=cache, cache_ttl=-1
+                )
+            self.assertIn("new", result)
+
+    def test_refresh_submitted_once_per_key(self) -> None:
+        import threading
+
+        gate = threading.Event()
+        calls = []
+
+        def _slow(value):
+            calls.append(value)
+            gate.wait(5)
+
+        refresher = mb.BackgroundRefresher(max_staleness=60)
+        refresher.submit("k", _slow, 1)
+        refresher.submit("k", _slow, 2)
+        gate.set()
+        self.assertEqual(refresher.drain(timeout=5), 1)
+        self.assertEqual(calls, [1])
+
+    def test_drain_without_work(self) -> None:
+        self.assertEqual(mb.BackgroundRefresher(max_staleness=60).drain(), 0)
+
+
+class TestLinearSnapshot(unittest.TestCase):
+    DAILY = mb.DailyContext(today=dt.date(2026, 3, 25), today_iso="2026-03-25")
+
+    def _config(self):
+        from unittest.mock import Mock
+
+        config = Mock()
+        config.linear_api_key = "lin_api_test"
+        config.focus_max_items = 6
+        config.linear_cache_ttl = 600
+        return config
+
+    @staticmethod
+    def _issue(identifier, priority=3):
+        return {
+            "identifier": identifier,
+            "title": f"Issue {identifier}",
+            "url": f"https://linear.app/x/{identifier}",
+            "priority": priority,
+            "dueDate": None,
+            "updatedAt": "2026-03-25T00:00:00Z",
+            "cycle": None,
+            "labels": {"nodes": [{"name": "bug"}]},
+            "state": {"name": "Todo", "type": "unstarted"},
+        }
+
+    @staticmethod
+    def _response(data):
+        from unittest.mock import Mock
+
+        response = Mock()
+        response.json.return_value = {"data": data}
+        return response
+
+    def _first_page(self, has_next):
+        return {
+            "focus": {
+                "assignedIssues": {
+                    "nodes": [self._issue("ENG-1", priority=1)],
+                    "pageInfo": {"hasNextPage": has_next, "endCursor": "c1"},
+                }
+            },
+            "unread": 2,
+            "queue": {
+                "nodes": [
+                    {"category": "reviews", "title": "Review me", "url": "u1"},
+                    {"category": "mentions", "title": "Read", "readAt": "x"},
+                ]
+            },
+        }
+
+    def test_single_request_builds_focus_and_queue(self) -> None:
+        from unittest.mock import patch
+
+        with patch.object(
+            mb, "safe_request", return_value=self._response(self._first_page(False))
+        ) as request:
+            snapshot = mb.fetch_linear_snapshot(object(), self._config(), self.DAILY)
+
+        request.assert_called_once()
+        self.assertEqual([i.identifier for i in snapshot.focus_items], ["ENG-1"])
+        self.assertEqual(snapshot.queue.unread_count, 2)
+        self.assertEqual([i.title for i in snapshot.queue.review_items], ["Review me"])
+        self.assertEqual(snapshot.queue.notification_items, ())
+
+    def test_follows_cursor_for_more_issues(self) -> None:
+        from unittest.mock import patch
+
+        second = {
+            "focus": {
+                "assignedIssues": {
+                    "nodes": [self._issue("ENG-2")],
+                    "pageInfo": {"hasNextPage": False, "endCursor": None},
+                }
+            }
+        }
+        with patch.object(
+            mb,
+            "safe_request",
+            side_effect=[
+                self._response(self._first_page(True)),
+                self._response(second),
+            ],
+        ) as request:
+            snapshot = mb.fetch_linear_snapshot(object(), self._config(), self.DAILY)
+
+        self.assertEqual(request.call_count, 2)
+        variables = request.call_args_list[1].kwargs["json"]["variables"]
+        self.assertEqual(variables["after"], "c1")
+        self.assertEqual(
+            [i.identifier for i in snapshot.focus_items], ["ENG-1", "ENG-2"]
+        )
+
+    def test_cache_roundtrip_skips_network(self) -> None:
+        from unittest.mock import patch
+
+        with tempfile.TemporaryDirectory() as td:
+            cache = mb.FileCache(str(Path(td) / "cache"))
+            with patch.object(
+                mb,
+                "safe_request",
+                return_value=self._response(self._first_page(False)),
+            ):
+                first = mb.fetch_linear_snapshot(
+                    object(), self._config(), self.DAILY, cache
+                )
+            with patch.object(mb, "safe_request") as request:
+                second = mb.fetch_linear_snapshot(
+                    object(), self._config(), self.DAILY, cache
+                )
+            request.assert_not_called()
+        self.assertEqual(first, second)
+
+    def test_error_returns_empty_snapshot(self) -> None:
+        from unittest.mock import patch
+
+        with patch.object(mb, "safe_request", side_effect=Exception("boom")):
+            snapshot = mb.fetch_linear_snapshot(object(), self._config(), self.DAILY)
+        self.assertEqual(snapshot, mb.LinearSnapshot())
+
+
+class TestRunProfiler(unittest.TestCase):
+    @staticmethod
+    def _response(elapsed_ms, retries=0, body=b"abc"):
+        return types.SimpleNamespace(
+            elapsed=dt.timedelta(milliseconds=elapsed_ms),
+            raw=types.SimpleNamespace(
+                retries=types.SimpleNamespace(history=[object()] * retries)
+            ),
+            content=body,
+        )
+
+    def test_disabled_profiler_records_nothing(self):
+        profiler = mb.RunProfiler()
+        with profiler.span("x") as span:
+            profiler.record_cache(True)
+        assert span is None
+        assert profiler.spans == []
+
+    def test_span_attribution_and_sorted_rows(self):
+        profiler = mb.RunProfiler()
+        profiler.enable()
+        with profiler.span("fast"):
+            profiler.record_cache(True)
+        with profiler.span("slow"):
+            profiler.record_response(self._response(20, retries=2))
+            profiler.record_response(self._response(5), stream=True)
+            profiler.record_read(10, 0.01)
+            profiler.record_cache(False)
+            time.sleep(0.01)
+
+        rows = profiler.rows()
+        assert [row["name"] for row in rows] == ["slow", "fast"]
+        slow = rows[0]
+        assert slow["retries"] == 2
+        assert slow["bytes"] == 13
+        assert slow["cache_misses"] == 1
+        assert abs(slow["network_s"] - 0.035) < 1e-9
+        assert rows[1]["cache_hits"] == 1
+        assert profiler.format_table().splitlines()[1].startswith("slow")
+
+    def test_chrome_trace_events(self):
+        profiler = mb.RunProfiler()
+        profiler.enable()
+
+        @profiler.profile("decorated", "section")
+        def _work():
+            return 42
+
+        assert _work() == 42
+        events = profiler.chrome_trace()["traceEvents"]
+        assert len(events) == 1
+        assert events[0]["ph"] == "X"
+        assert events[0]["cat"] == "section"
+        assert events[0]["dur"] >= 0
+
+    def test_file_cache_lookups_are_attributed(self):
+        from unittest.mock import patch
+
+        profiler = mb.RunProfiler()
+        profiler.enable()
+        with tempfile.TemporaryDirectory() as td, patch.object(
+            mb, "PROFILER", profiler
+        ):
+            cache = mb.FileCache(td)
+            cache.set("k", 1)
+            with profiler.span("lookup"):
+                cache.get("k", 60)
+                cache.get("missing", 60)
+        row = profiler.rows()[0]
+        assert (row["cache_hits"], row["cache_misses"]) == (1, 1)
+
+    def test_worker_requests_count_toward_submitting_span(self):
+        import concurrent.futures
+        from unittest.mock import patch
+
+        profiler = mb.RunProfiler()
+        profiler.enable()
+
+        def _request():
+            profiler.record_response(self._response(10))
+            return "ok"
+
+        with patch.object(mb, "PROFILER", profiler), profiler.span("hedged"):
+            assert mb.hedged_call(
+                [("a", _request), ("b", _request)], timeout=2, hedge_delay=1
+            ) == "ok"
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            with profiler.span("pooled"):
+                executor.submit(profiler.bind(_request)).result()
+            executor.submit(_request).result()
+
+        rows = {row["name"]: row for row in profiler.rows()}
+        assert rows["hedged"]["bytes"] == 3
+        assert rows["pooled"]["bytes"] == 3
+        assert len(profiler.spans) == 2
+
+    def test_flag_value(self):
+        flag = "--profile-trace"
+        assert mb._flag_value([flag, "t.json"], flag) == "t.json"
+        assert mb._flag_value([f"{flag}=t.json"], flag) == "t.json"
+        assert mb._flag_value(["--profile"], flag) == ""
+
+
+class TestHedgedCall(unittest.TestCase):
+    def test_fast_primary_never_sends_backup(self):
+        calls = []
+
+        def _primary():
+            calls.append("primary")
+            return "a"
+
+        def _backup():
+            calls.append("backup")
+            return "b"
+
+        result = mb.hedged_call(
+            [("p", _primary), ("b", _backup)], timeout=2, hedge_delay=0.5
+        )
+        assert result == "a"
+        time.sleep(0.05)
+        assert calls == ["primary"]
+
+    def test_slow_primary_is_hedged(self):
+        import threading
+
+        release = threading.Event()
+
+        def _slow():
+            release.wait(2)
+            return "slow"
+
+        try:
+            result = mb.hedged_call(
+                [("slow", _slow), ("fast", lambda: "fast")],
+                timeout=2,
+                hedge_delay=0.01,
+            )
+        finally:
+            release.set()
+        assert result == "fast"
+
+    def test_failure_falls_through_immediately(self):
+        def _boom():
+            raise RuntimeError("down")
+
+        started = time.monotonic()
+        result = mb.hedged_call(
+            [("bad", _boom), ("good", lambda: "ok")], timeout=2, hedge_delay=1.5
+        )
+        assert result == "ok"
+        assert time.monotonic() - started < 1.0
+
+    def test_all_fail_returns_none(self):
+        assert mb.hedged_call([("a", lambda: None)], timeout=1) is None
+        assert mb.hedged_call([], timeout=1) is None
+
+    def test_tracker_orders_by_p95_and_persists(self):
+        with tempfile.TemporaryDirectory() as td:
+            cache = mb.FileCache(td)
+            tracker = mb.EndpointLatencyTracker(cache)
+            for _ in range(mb.HEDGE_MIN_SAMPLES):
+                tracker.record("slow", 0.9)
+                tracker.record("fast", 0.1)
+            tracker.record("flaky", 0.1, ok=False)
+            tracker.save()
+
+            reloaded = mb.EndpointLatencyTracker(cache)
+        assert reloaded.order(["slow", "unknown", "fast"]) == [
+            "fast",
+            "slow",
+            "unknown",
+        ]
+        assert reloaded.hedge_delay("fast") == 0.1
+        assert reloaded.hedge_delay("unknown") == mb.HEDGE_DEFAULT_DELAY
+
+    def test_tracker_picks_first_endpoint(self):
+        tracker = mb.EndpointLatencyTracker()
+        for _ in range(mb.HEDGE_MIN_SAMPLES):
+            tracker.record("b", 0.05)
+        calls = []
+
+        def _attempt(name):
+            def _fn():
+                calls.append(name)
+                return name
+
+            return _fn
+
+        result = mb.hedged_call(
+            [("a", _attempt("a")), ("b", _attempt("b"))], timeout=2, tracker=tracker
+        )
+        assert result == "b"
+        assert calls == ["b"]
+
+    def test_tracked_delay_is_capped_by_timeout(self):
+        import threading
+
+        tracker = mb.EndpointLatencyTracker(penalty=10.0)
+        for _ in range(mb.HEDGE_MIN_SAMPLES):
+            tracker.record("slow", 10.0, ok=False)
+        assert tracker.hedge_delay("slow") == 10.0
+        release = threading.Event()
+
+        def _slow():
+            release.wait(2)
+            return "slow"
+
+        started = time.monotonic()
+        try:
+            result = mb.hedged_call(
+                [("slow", _slow), ("fast", lambda: "fast")],
+                timeout=0.4,
+                tracker=tracker,
+            )
+        finally:
+            release.set()
+        assert result == "fast"
+        assert time.monotonic() - started < 0.4
+
+    def test_losing_session_is_closed_and_not_recorded(self):
+        import threading
+        from unittest.mock import Mock
+
+        sessions = []
+
+        def _factory():
+            session = Mock()
+            session.closed = threading.Event()
+            session.close.side_effect = session.closed.set
+            sessions.append(session)
+            return session
+
+        def _slow(session):
+            if not session.closed.wait(2):
+                return "slow"
+            raise ConnectionError("session closed")
+
+        tracker = mb.EndpointLatencyTracker()
+        result = mb.hedged_call(
+            [("slow", _slow), ("fast", lambda session: "fast")],
+            timeout=2,
+            hedge_delay=0.01,
+            tracker=tracker,
+            session_factory=_factory,
+        )
+        assert result == "fast"
+        assert len(sessions) == 2
+        for session in sessions:
+            session.close.assert_called_once()
+        time.sleep(0.05)
+        assert "slow" not in tracker._samples
+        assert len(tracker._samples["fast"]) == 1
+
+    def test_empty_result_is_not_recorded_as_failure(self):
+        tracker = mb.EndpointLatencyTracker(penalty=10.0)
+        mb.hedged_call([("empty", lambda: [])], timeout=1, tracker=tracker)
+        mb.hedged_call([("down", lambda: None)], timeout=1, tracker=tracker)
+        assert tracker._samples["empty"][0] < 1.0
+        assert tracker._samples["down"] == [10.0]
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_module_load_skips_heavy_dependencies(self):
+        import json
+        import subprocess
+
+        code = (
+            "import importlib.util, json, sys\n"
+            f"spec = importlib.util.spec_from_file_location('mb', {str(_script)!r})\n"
+            "module = importlib.util.module_from_spec(spec)\n"
+            "sys.modules['mb'] = module\n"
+            "spec.loader.exec_module(module)\n"
+            "heavy = ['feedparser', 'requests', 'dotenv', 'urllib3', 'lib.safe_http']\n"
+            "print(json.dumps([name for name in heavy if name in sys.modules]))\n"
+        )
+        result = subprocess.run(
+            [_sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert json.loads(result.stdout) == []
+
+    def test_lazy_module_attribute(self):
+        assert mb.feedparser is _sys.modules["feedparser"]
+        with self.assertRaises(AttributeError):
+            mb.not_a_module  # noqa: B018
+
 
 # ============================================================
 # DailyContext
@@ -674,9 +1374,9 @@ class TestProcessPodcastFeed(unittest.TestCase):
         from unittest.mock import Mock
 
         llm_mock = Mock()
-        llm_mock.summarize_podcast.return_value = (
+        llm_mock.summarize_batch.return_value = [
             "AI summary for testing coastal systems."
-        )
+        ]
         session_mock = Mock()
 
         entries = [
@@ -695,6 +1395,339 @@ class TestProcessPodcastFeed(unittest.TestCase):
         assert "coastal-science" in result.tags
 
 
+class TestFeedParsing(unittest.TestCase):
+    RSS = (
+        b"<rss><channel><title>T</title>"
+        + b"".join(
+            b"<item><title>Item %d</title></item>" % i for i in range(1, 6)
+        )
+        + b"</channel></rss>"
+    )
+
+    def test_truncate_keeps_first_items(self):
+        result = mb.truncate_feed_document(self.RSS, 2)
+        assert result.count(b"<item>") == 2
+        assert b"Item 3" not in result
+        assert result.endswith(b"</channel></rss>")
+
+    def test_truncate_short_feed_unchanged(self):
+        assert mb.truncate_feed_document(self.RSS, 10) == self.RSS
+
+    def test_truncate_capped_drops_partial_item(self):
+        capped = self.RSS[: self.RSS.index(b"Item 3") + 4]
+        result = mb.truncate_feed_document(capped, 10, capped=True)
+        assert b"Item 3" not in result
+        assert result.count(b"</item>") == 2
+
+    def test_truncate_atom(self):
+        atom = b"<feed>" + b"<entry><title>a</title></entry>" * 3 + b"</feed>"
+        result = mb.truncate_feed_document(atom, 1)
+        assert result == b"<feed><entry><title>a</title></entry></feed>"
+
+    def test_read_capped(self):
+        from unittest.mock import Mock
+
+        response = Mock()
+        response.iter_content.return_value = iter([b"abcd", b"efgh", b"ijkl"])
+        body, capped = mb._read_capped(response, 6)
+        assert (body, capped) == (b"abcdef", True)
+        response.close.assert_called_once()
+
+    def test_read_uncapped(self):
+        from unittest.mock import Mock
+
+        response = Mock()
+        response.iter_content.return_value = iter([b"abcd", b"", b"ef"])
+        assert mb._read_capped(response, 100) == (b"abcdef", False)
+
+    def test_parse_feed_entries_returns_plain_dicts(self):
+        from unittest.mock import patch
+
+        parsed = types.SimpleNamespace(
+            entries=[
+                {"title": "A", "link": "https://a", "description": "desc"},
+                {"title": "B"},
+                {"title": "C"},
+            ]
+        )
+        with patch.object(mb.feedparser, "parse", return_value=parsed):
+            entries = mb.parse_feed_entries(b"<rss/>", 2)
+        assert entries == [
+            {"title": "A", "link": "https://a", "summary": "desc", "published": ""},
+            {"title": "B", "link": "#", "summary": "", "published": ""},
+        ]
+
+    def test_empty_feed_is_not_logged_as_error(self):
+        from unittest.mock import patch
+
+        with (
+            patch.object(mb, "build_retry_session"),
+            patch.object(mb, "_fetch_feed_entries_uncached", return_value=[]),
+            self.assertLogs("morning-brief", level="INFO") as logs,
+        ):
+            assert mb._download_feed_entries("Feed", "https://x", 3, None) == []
+        assert all(record.levelname == "INFO" for record in logs.records)
+
+    def test_render_feed_section(self):
+        html_out = mb.render_feed_section(
+            "News", [{"title": "<b>T</b>", "link": "https://x", "summary": "<p>S</p>"}]
+        )
+        assert "&lt;b&gt;T&lt;/b&gt;" in html_out
+        assert ">S</span>" in html_out
+        assert mb.render_feed_section("News", []) == ""
+
+
+class TestSeenItemsIndex(unittest.TestCase):
+    DAY = 86400
+
+    def test_normalize_feed_link(self):
+        assert (
+            mb.normalize_feed_link("https://WWW.Example.com/story/?utm_source=x&id=3")
+            == "example.com/story?id=3"
+        )
+        assert mb.normalize_feed_link("not a url") == ""
+
+    def test_duplicates_across_feeds_keep_first(self):
+        index = mb.SeenItemsIndex("", window=0)
+        feeds = [
+            [{"title": "Levee vote passes", "link": "https://a.com/levee"}],
+            [
+                {"title": "Levee Vote Passes!", "link": "https://b.com/x"},
+                {"title": "Other", "link": "https://www.a.com/levee/?utm_medium=rss"},
+                {"title": "Fresh", "link": "https://b.com/fresh"},
+            ],
+        ]
+        result = index.filter(feeds)
+        assert [[e["title"] for e in entries] for entries in result] == [
+            ["Levee vote passes"],
+            ["Fresh"],
+        ]
+        assert index.skipped == 2
+
+    def test_items_from_earlier_day_skipped_same_day_kept(self):
+        entry = {"title": "Story", "link": "https://a.com/story"}
+        noon = dt.datetime.combine(dt.date.today(), dt.time(12))
+        now = time.mktime(noon.timetuple())
+        with tempfile.TemporaryDirectory() as td:
+            first = mb.SeenItemsIndex(td, window=3 * self.DAY, now=now - self.DAY)
+            first.filter([[entry]])
+            first.save()
+
+            rerun = mb.SeenItemsIndex(td, window=3 * self.DAY, now=now - self.DAY + 60)
+            assert rerun.filter([[entry]]) == [[entry]]
+
+            next_day = mb.SeenItemsIndex(td, window=3 * self.DAY, now=now)
+            assert next_day.filter([[entry]]) == [[]]
+
+            later = mb.SeenItemsIndex(td, window=3 * self.DAY, now=now + 5 * self.DAY)
+            assert later.filter([[entry]]) == [[entry]]
+
+    def test_generic_headlines_with_different_summaries_kept(self):
+        index = mb.SeenItemsIndex("", window=0)
+        feeds = [
+            [{"title": "Weather update", "summary": "<p>Snow in Denver.</p>"}],
+            [
+                {"title": "Weather Update", "summary": "Heat wave in Phoenix."},
+                {"title": "Weather update!", "summary": "Snow in <b>Denver</b>."},
+            ],
+        ]
+        result = index.filter(feeds)
+        assert [[e["summary"] for e in entries] for entries in result] == [
+            ["<p>Snow in Denver.</p>"],
+            ["Heat wave in Phoenix."],
+        ]
+
+    def test_day_boundary_follows_configured_offset(self):
+        entry = {"title": "Story", "link": "https://a.com/story"}
+        tz = mb.parse_utc_offset("-05:00")
+        shown = dt.datetime(2024, 3, 4, 18, tzinfo=tz).timestamp()
+        later = shown + 2 * 3600  # 20:00 at -05:00 but already the next UTC day
+        for zone, expected in ((tz, [[entry]]), (dt.timezone.utc, [[]])):
+            with tempfile.TemporaryDirectory() as td:
+                first = mb.SeenItemsIndex(td, window=self.DAY, now=shown, tz=zone)
+                first.filter([[entry]])
+                first.save()
+                rerun = mb.SeenItemsIndex(td, window=self.DAY, now=later, tz=zone)
+                assert rerun.filter([[entry]]) == expected
+
+    def test_parse_utc_offset(self):
+        assert mb.parse_utc_offset("+05:30") == dt.timezone(dt.timedelta(hours=5.5))
+        assert mb.parse_utc_offset("-0500") == dt.timezone(dt.timedelta(hours=-5))
+        assert mb.parse_utc_offset("EST") is None
+
+    def test_news_sections_render_deduped_entries(self):
+        from unittest.mock import patch
+
+        entries = {
+            "https://one/feed": [{"title": "Same", "link": "https://x.com/1"}],
+            "https://two/feed": [{"title": "Same", "link": "https://y.com/2"}],
+        }
+        with patch.object(
+            mb, "fetch_feed_entries", side_effect=lambda name, url, **kw: entries[url]
+        ):
+            html_out = mb.fetch_news_sections(
+                {"One": "https://one/feed", "Two": "https://two/feed"}, None
+            )
+        assert "One" in html_out
+        assert "Two" not in html_out
+
+
+class TestParseBatchSummaries(unittest.TestCase):
+    def test_json_array(self):
+        raw = 'Here you go:\n["First.", "Second."]'
+        assert mb.parse_batch_summaries(raw, 2) == ["First.", "Second."]
+
+    def test_numbered_lines(self):
+        raw = "1. First summary.\n2) Second summary."
+        assert mb.parse_batch_summaries(raw, 2) == [
+            "First summary.",
+            "Second summary.",
+        ]
+
+    def test_count_mismatch(self):
+        assert mb.parse_batch_summaries('["Only one."]', 2) is None
+
+    def test_garbage(self):
+        assert mb.parse_batch_summaries("no structure here", 2) is None
+
+
+class TestSummarizeBatch(unittest.TestCase):
+    def _client(self, cache=None):
+        return mb.PerplexityClient("key", cache=cache)
+
+    def test_one_request_for_several_items(self):
+        from unittest.mock import patch
+
+        client = self._client()
+        with patch.object(client, "chat", return_value='["A.", "B."]') as chat:
+            result = client.summarize_batch(["text a", "text b"])
+        assert result == ["A.", "B."]
+        chat.assert_called_once()
+
+    def test_cached_items_are_not_resent(self):
+        from unittest.mock import patch
+
+        with tempfile.TemporaryDirectory() as td:
+            cache = mb.FileCache(td)
+            client = self._client(cache)
+            with patch.object(client, "chat", return_value='["A.", "B."]'):
+                client.summarize_batch(["text a", "text b"])
+            with patch.object(client, "chat", return_value="C.") as chat:
+                result = client.summarize_batch(["text a", "text c", "text b"])
+            assert result == ["A.", "C.", "B."]
+            chat.assert_called_once()
+            assert chat.call_args[0][1] == "text c"
+
+    def test_duplicate_texts_summarized_once(self):
+        from unittest.mock import patch
+
+        client = self._client()
+        with patch.object(client, "chat", return_value="Same.") as chat:
+            result = client.summarize_batch(["dup", "dup", ""])
+        assert result == ["Same.", "Same.", ""]
+        chat.assert_called_once()
+
+    def test_unparseable_reply_falls_back_per_item(self):
+        from unittest.mock import patch
+
+        client = self._client()
+        replies = iter(["not json", "A.", "B."])
+        with patch.object(client, "chat", side_effect=lambda *a, **k: next(replies)):
+            result = client.summarize_batch(["text a", "text b"])
+        assert result == ["A.", "B."]
+
+    def test_disabled_client_returns_cached_only(self):
+        client = mb.PerplexityClient("")
+        assert client.summarize_batch(["text"]) == [""]
+
+
+class TestLLMResponseCache(unittest.TestCase):
+    PAYLOAD = {
+        "model": "sonar",
+        "messages": [{"role": "user", "content": "hi"}],
+        "max_tokens": 10,
+        "temperature": 0.5,
+    }
+
+    def test_roundtrip_and_counters(self):
+        with tempfile.TemporaryDirectory() as td:
+            cache = mb.LLMResponseCache(td)
+            assert cache.get(self.PAYLOAD) is None
+            cache.set(self.PAYLOAD, "hello")
+            assert cache.get(self.PAYLOAD) == "hello"
+            assert cache.stats == {"hits": 1, "misses": 1}
+
+    def test_key_depends_on_parameters(self):
+        changed = dict(self.PAYLOAD, temperature=0.6)
+        assert mb.LLMResponseCache.key_for(self.PAYLOAD) != (
+            mb.LLMResponseCache.key_for(changed)
+        )
+        reordered = dict(reversed(list(self.PAYLOAD.items())))
+        assert mb.LLMResponseCache.key_for(self.PAYLOAD) == (
+            mb.LLMResponseCache.key_for(reordered)
+        )
+
+    def test_ttl_expiry(self):
+        with tempfile.TemporaryDirectory() as td:
+            cache = mb.LLMResponseCache(td, ttl=-1)
+            cache.set(self.PAYLOAD, "hello")
+            assert cache.get(self.PAYLOAD) is None
+
+    def test_size_eviction(self):
+        with tempfile.TemporaryDirectory() as td:
+            cache = mb.LLMResponseCache(td, max_entries=10)
+            for i in range(3):
+                payload = dict(self.PAYLOAD, max_tokens=i)
+                cache.set(payload, f"reply {i}")
+                stamp = time.time() - 100 + i
+                os.utime(cache._path(cache.key_for(payload)), (stamp, stamp))
+            # Reading the oldest entry makes it the most recently used.
+            assert cache.get(dict(self.PAYLOAD, max_tokens=0)) == "reply 0"
+            rerun = mb.LLMResponseCache(td, max_entries=2)
+            rerun.set(dict(self.PAYLOAD, max_tokens=3), "reply 3")
+            assert len(list(cache.root.glob("*.json"))) == 2
+            assert rerun.get(dict(self.PAYLOAD, max_tokens=0)) == "reply 0"
+            assert rerun.get(dict(self.PAYLOAD, max_tokens=3)) == "reply 3"
+            assert rerun.get(dict(self.PAYLOAD, max_tokens=2)) is None
+
+    def test_prunes_once_per_instance(self):
+        from unittest.mock import patch
+
+        with tempfile.TemporaryDirectory() as td:
+            cache = mb.LLMResponseCache(td)
+            with patch.object(mb, "_evict_entries") as evict:
+                for i in range(3):
+                    cache.set(dict(self.PAYLOAD, max_tokens=i), f"reply {i}")
+            assert evict.call_count == 1
+
+    def test_bypass_skips_reads_but_writes(self):
+        with tempfile.TemporaryDirectory() as td:
+            mb.LLMResponseCache(td).set(self.PAYLOAD, "old")
+            bypassed = mb.LLMResponseCache(td, bypass=True)
+            assert bypassed.get(self.PAYLOAD) is None
+            bypassed.set(self.PAYLOAD, "new")
+            assert mb.LLMResponseCache(td).get(self.PAYLOAD) == "new"
+
+    def test_chat_served_from_cache_without_api_key(self):
+        with tempfile.TemporaryDirectory() as td:
+            cache = mb.LLMResponseCache(td)
+            client = mb.PerplexityClient("", response_cache=cache)
+            payload = {
+                "model": "sonar",
+                "messages": [
+                    {"role": "system", "content": "sys"},
+                    {"role": "user", "content": "user"},
+                ],
+                "max_tokens": 5,
+                "temperature": 0.1,
+            }
+            cache.set(payload, "cached reply")
+            assert (
+                client.chat("sys", "user", max_tokens=5, temperature=0.1)
+                == "cached reply"
+            )
+
+
 class TestFetchWeather(unittest.TestCase):
     def setUp(self):
         from unittest.mock import Mock
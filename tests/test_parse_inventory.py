@@ -16,7 +16,9 @@ from parse_inventory import (
     _write_triage_report,
     parse_inventory_lines,
     run_gh,
+    triage_prs,
 )
+from pr_store import PRStore
 
 
 class TestParseInventory(unittest.TestCase):
@@ -183,8 +185,8 @@ class TestParseInventory(unittest.TestCase):
 
     # --- run_gh ---
 
-    @patch("parse_inventory.load_gh_token_env", return_value={})
-    @patch("parse_inventory.subprocess.run")
+    @patch("gh_cache.load_gh_token_env", return_value={})
+    @patch("subprocess.run")
     def test_run_gh_success(self, mock_run, _mock_env):
         mock_result = MagicMock()
         mock_result.returncode = 0
@@ -196,8 +198,8 @@ class TestParseInventory(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertEqual(result["files"][0]["filename"], "foo.py")
 
-    @patch("parse_inventory.load_gh_token_env", return_value={})
-    @patch("parse_inventory.subprocess.run")
+    @patch("gh_cache.load_gh_token_env", return_value={})
+    @patch("subprocess.run")
     def test_run_gh_nonzero(self, mock_run, _mock_env):
         mock_result = MagicMock()
         mock_result.returncode = 1
@@ -205,8 +207,8 @@ class TestParseInventory(unittest.TestCase):
         mock_run.return_value = mock_result
         self.assertIsNone(run_gh("repoA", 123))
 
-    @patch("parse_inventory.load_gh_token_env", return_value={})
-    @patch("parse_inventory.subprocess.run")
+    @patch("gh_cache.load_gh_token_env", return_value={})
+    @patch("subprocess.run")
     def test_run_gh_invalid_json(self, mock_run, _mock_env):
         mock_result = MagicMock()
         mock_result.returncode = 0
@@ -214,8 +216,8 @@ class TestParseInventory(unittest.TestCase):
         mock_run.return_value = mock_result
         self.assertIsNone(run_gh("repoA", 123))
 
-    @patch("parse_inventory.load_gh_token_env", return_value={})
-    @patch("parse_inventory.subprocess.run")
+    @patch("gh_cache.load_gh_token_env", return_value={})
+    @patch("subprocess.run")
     def test_run_gh_returncode_not_zero(self, mock_run, _mock_env):
         mock_result = MagicMock()
         mock_result.returncode = 1
@@ -223,6 +225,23 @@ class TestParseInventory(unittest.TestCase):
         mock_run.return_value = mock_result
         self.assertIsNone(run_gh("repoA", 123))
 
+    # --- triage_prs ---
+
+    @patch("parse_inventory.run_gh", return_value=None)
+    @patch("gh_cache.run_json", return_value=None)
+    def test_triage_prs_uses_stored_field_groups(self, mock_run_json, _mock_run_gh):
+        store = PRStore()
+        updated = self._recent_iso()
+        for number, files in ((1, [{"path": "a"}]), (2, [])):
+            record = {"number": number, "updatedAt": updated, "files": files}
+            store.merge("o/r", [{**record, "mergeStateStatus": "CLEAN"}])
+        repos = {"o/r": [{"pr": str(n), "checks": None} for n in (1, 2, 3)]}
+        triage = triage_prs(store, repos)
+        self.assertEqual(triage["READY"], ["o/r#1"])
+        self.assertEqual(triage["SUPERSEDED"], ["o/r#2"])
+        # Only the unknown PR needed a lookup.
+        self.assertEqual(mock_run_json.call_count, 1)
+
     # --- _write_triage_report ---
 
     def test_write_triage_report_populated(self):
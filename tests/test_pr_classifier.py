@@ -0,0 +1,79 @@
+import random
+import sys
+import unittest
+
+sys.path.insert(0, "/".join(__file__.split("/")[:-2]))
+
+from pr_classifier import (
+    BRANCH_SIGNALS,
+    INVENTORY_CATEGORIES,
+    PR_CLASSIFIER,
+    KeywordClassifier,
+    classify_pr,
+)
+
+
+def _first_match(vocabulary, text, default=None):
+    """The keyword loop the classifier replaces."""
+    text = text.lower()
+    for label, keywords in vocabulary:
+        for keyword in keywords:
+            if keyword in text:
+                return label
+    return default
+
+
+class TestKeywordClassifier(unittest.TestCase):
+    def test_priority_beats_position(self):
+        # "ui" (UI) comes first in the text, "tls" (SECURITY) ranks higher.
+        self.assertEqual(PR_CLASSIFIER.label("Build with tls", "inventory"), "SECURITY")
+
+    def test_overlapping_and_prefix_keywords(self):
+        classifier = KeywordClassifier(
+            {"v": (("A", ("ab",)), ("B", ("abc",)), ("C", ("bcd",)))}
+        )
+        self.assertEqual(classifier.label("xabcd", "v"), "A")
+        self.assertEqual(classifier.label("xbcd", "v"), "C")
+        self.assertIsNone(classifier.label("nothing", "v"))
+
+    def test_vocabularies_are_independent(self):
+        labels = PR_CLASSIFIER.classify("renovate/lockfile")
+        self.assertEqual(labels["branch"], "renovate")
+        self.assertEqual(labels["ready"], "DEPENDENCY")
+        self.assertEqual(labels["title"], "renovate")
+
+    def test_matches_keyword_loops(self):
+        rng = random.Random(7)
+        words = [kw for _, kws in INVENTORY_CATEGORIES for kw in kws]
+        words += list(BRANCH_SIGNALS) + ["feat", "fix", "x", "-", "/", " "]
+        branch_vocab = tuple((kw.rstrip("/"), (kw,)) for kw in BRANCH_SIGNALS)
+        for _ in range(2000):
+            text = "".join(rng.choice(words) for _ in range(rng.randint(0, 6)))
+            if rng.random() < 0.3:
+                text = text.upper()
+            labels = PR_CLASSIFIER.classify(text)
+            self.assertEqual(
+                labels.get("inventory"), _first_match(INVENTORY_CATEGORIES, text), text
+            )
+            self.assertEqual(labels.get("branch"), _first_match(branch_vocab, text))
+
+    def test_classify_pr(self):
+        pr = {
+            "title": "Bolt: faster parsing",
+            "headRefName": "bolt/parse",
+            "body": "Created automatically by Jules",
+        }
+        self.assertEqual(
+            classify_pr(pr),
+            {
+                "inventory": "PERFORMANCE",
+                "ready": "PERFORMANCE/REFACTOR/UI/FEATURE",
+                "title": "bolt",
+                "branch": "bolt",
+                "body": "automation_marker",
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
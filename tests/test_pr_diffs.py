@@ -0,0 +1,138 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, "/".join(__file__.split("/")[:-2]))
+
+from pr_diffs import (
+    Diff,
+    DiffCache,
+    DiffStats,
+    diff_stats,
+    fetch_diff,
+    max_bytes_from_env,
+    read_capped,
+)
+from pr_reference import PRReference
+
+REF = PRReference.from_string("owner/repo#7")
+
+
+def _fake_gh(stdout: bytes, returncode: int = 0, stderr: bytes = b""):
+    proc = MagicMock()
+    proc.stdout = io.BytesIO(stdout)
+    proc.stderr = io.BytesIO(stderr)
+    proc.wait.return_value = returncode
+    return proc
+
+
+class TestReadCapped(unittest.TestCase):
+    def test_cap(self):
+        self.assertEqual(read_capped([b"ab", b"cd"], 4), (b"abcd", False))
+        self.assertEqual(read_capped([b"ab", b"cd", b"e"], 3), (b"abc", True))
+
+    def test_stats_from_files(self):
+        files = [{"path": "a", "additions": 3, "deletions": 1}, {"path": "b"}]
+        self.assertEqual(diff_stats(files), DiffStats(2, 3, 1))
+        self.assertEqual(str(diff_stats(files)), "2 files, +3 -1")
+
+    def test_max_bytes_from_env(self):
+        self.assertEqual(max_bytes_from_env({"GH_DIFF_MAX_BYTES": "10"}), 10)
+        self.assertGreater(max_bytes_from_env({"GH_DIFF_MAX_BYTES": "x"}), 10)
+
+
+@patch("pr_diffs.github_client.active_client", return_value=None)
+class TestFetchDiff(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = DiffCache(tmp.name)
+
+    @patch("subprocess.Popen")
+    def test_streams_list_argv_and_truncates_at_cap(self, mock_popen, _client):
+        mock_popen.return_value = proc = _fake_gh(b"x" * 100)
+        diff = fetch_diff(REF, max_bytes=10, env={})
+        self.assertEqual(diff, Diff("x" * 10, truncated=True))
+        proc.kill.assert_called()
+        argv = mock_popen.call_args.args[0]
+        self.assertEqual(argv, ["gh", "pr", "diff", "7", "-R", "owner/repo"])
+        self.assertFalse(mock_popen.call_args.kwargs.get("shell", False))
+
+    @patch("subprocess.Popen")
+    def test_failure_returns_none(self, mock_popen, _client):
+        mock_popen.return_value = _fake_gh(b"", returncode=1, stderr=b"not found")
+        self.assertIsNone(fetch_diff(REF, env={}))
+
+    @patch("subprocess.Popen")
+    def test_unchanged_head_is_served_from_cache(self, mock_popen, _client):
+        mock_popen.return_value = _fake_gh(b"diff --git a/x b/x\n")
+        first = fetch_diff(REF, "sha1", cache=self.cache, env={})
+        second = fetch_diff(REF, "sha1", cache=self.cache, env={})
+        self.assertEqual(first, second)
+        self.assertEqual(mock_popen.call_count, 1)
+
+        mock_popen.return_value = _fake_gh(b"diff --git a/y b/y\n")
+        moved = fetch_diff(REF, "sha2", cache=self.cache, env={})
+        self.assertEqual(moved.text, "diff --git a/y b/y\n")
+        self.assertEqual(mock_popen.call_count, 2)
+
+    @patch("subprocess.Popen")
+    def test_truncated_entry_is_refetched_under_a_larger_cap(self, mock_popen, _client):
+        mock_popen.side_effect = lambda *a, **k: _fake_gh(b"x" * 20)
+        fetch_diff(REF, "sha", max_bytes=5, cache=self.cache, env={})
+        self.assertEqual(
+            fetch_diff(REF, "sha", max_bytes=5, cache=self.cache, env={}),
+            Diff("xxxxx", truncated=True),
+        )
+        self.assertEqual(mock_popen.call_count, 1)
+        full = fetch_diff(REF, "sha", max_bytes=50, cache=self.cache, env={})
+        self.assertEqual(full, Diff("x" * 20))
+        self.assertEqual(mock_popen.call_count, 2)
+
+    def test_chatty_stderr_does_not_block_stdout(self, _client):
+        # More stderr than a pipe buffer holds, written before any stdout.
+        script = (
+            "import sys; sys.stderr.write('w' * 262144); sys.stderr.flush(); "
+            "sys.stdout.write('diff --git a/x b/x')"
+        )
+        real_popen = subprocess.Popen
+
+        def _popen(argv, **kwargs):
+            return real_popen([sys.executable, "-c", script], **kwargs)
+
+        with patch("subprocess.Popen", side_effect=_popen):
+            diff = fetch_diff(REF, env=None, timeout=10)
+        self.assertEqual(diff, Diff("diff --git a/x b/x"))
+
+    def test_put_prunes_entries_unused_for_max_age(self, _client):
+        self.cache.put(REF, "old", Diff("a"), 10)
+        self.cache.put(REF, "used", Diff("b"), 10)
+        week_ago = self.cache.max_age + 60
+        for sha in ("old", "used"):
+            path = self.cache._path(REF, sha)
+            os.utime(path, (path.stat().st_atime - week_ago,) * 2)
+        self.assertEqual(self.cache.get(REF, "used", 10), Diff("b"))
+
+        fresh = DiffCache(self.cache.cache_dir)
+        fresh.put(REF, "new", Diff("c"), 10)
+        self.assertIsNone(fresh.get(REF, "old", 10))
+        self.assertEqual(fresh.get(REF, "used", 10), Diff("b"))
+        self.assertEqual(fresh.get(REF, "new", 10), Diff("c"))
+
+    @patch("subprocess.Popen")
+    def test_in_process_client_streams_first(self, mock_popen, mock_client):
+        mock_client.return_value = MagicMock()
+        mock_client.return_value.stream_diff.return_value = (b"abc", False)
+        self.assertEqual(fetch_diff(REF, max_bytes=8, env={}), Diff("abc"))
+        mock_client.return_value.stream_diff.assert_called_once_with(
+            REF, 8, timeout=120
+        )
+        mock_popen.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
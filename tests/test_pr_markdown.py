@@ -0,0 +1,88 @@
+import sys
+import unittest
+
+sys.path.insert(0, "/".join(__file__.split("/")[:-2]))
+
+from pr_markdown import (
+    HEADING,
+    ITEM,
+    TABLE_ROW,
+    TABLE_RULE,
+    TEXT,
+    MarkdownIndex,
+    tokenize,
+)
+
+TRIAGE = (
+    "# PR Triage\n"
+    "\n"
+    "## SUPERSEDED\n"
+    "- o/r#1\n"
+    "### o/r#1 notes\n"
+    "- o/r#10 (not a bare ref)\n"
+    "\n"
+    "## STALE\n"
+    "## READY\n"
+    "- o/r#1\n"
+    "- o/r#2\n"
+)
+
+
+class TestTokenize(unittest.TestCase):
+    def test_kinds(self):
+        tokens = list(
+            tokenize(
+                [
+                    "## owner/repo\n",
+                    "#hashtag\n",
+                    "| a | b |\n",
+                    "| --- | :-: |\n",
+                    "- o/r#1\n",
+                    "plain\n",
+                ]
+            )
+        )
+        self.assertEqual(
+            [t.kind for t in tokens], [HEADING, TEXT, TABLE_ROW, TABLE_RULE, ITEM, TEXT]
+        )
+        self.assertEqual((tokens[0].level, tokens[0].text), (2, "owner/repo"))
+        self.assertEqual(tokens[2].cells, ("", " a ", " b ", ""))
+        self.assertEqual(tokens[4].text, "o/r#1")
+        self.assertEqual(tokens[5].line_number, 6)
+
+
+class TestMarkdownIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = MarkdownIndex.from_text(TRIAGE)
+
+    def test_sections_and_refs(self):
+        self.assertEqual(self.index.refs("SUPERSEDED"), ["o/r#1"])
+        self.assertEqual(self.index.refs("READY"), ["o/r#1", "o/r#2"])
+        self.assertEqual(self.index.refs("MISSING"), [])
+        self.assertIn("o/r#2", self.index)
+        self.assertNotIn("o/r#10", self.index)
+
+    def test_refs_before(self):
+        self.assertEqual(self.index.refs_before("READY"), {"o/r#1"})
+        self.assertEqual(self.index.refs_before("SUPERSEDED"), set())
+        self.assertEqual(self.index.refs_before("MISSING"), {"o/r#1", "o/r#2"})
+
+    def test_replace_section_keeps_other_lines(self):
+        self.index.replace_section("SUPERSEDED", ["- o/r#3"])
+        self.assertEqual(
+            self.index.text(),
+            TRIAGE.replace(
+                "- o/r#1\n### o/r#1 notes\n- o/r#10 (not a bare ref)\n", "- o/r#3\n"
+            ),
+        )
+        self.assertEqual(self.index.refs_before("READY"), {"o/r#3"})
+
+    def test_missing_section_is_inserted_before_anchor(self):
+        self.index.replace_section("DUPLICATE", ["- o/r#2"], before="READY")
+        self.assertIn("## STALE\n## DUPLICATE\n- o/r#2\n## READY\n", self.index.text())
+        self.index.replace_section("NEW", [])
+        self.assertTrue(self.index.text().endswith("- o/r#2\n## NEW\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
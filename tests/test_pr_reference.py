@@ -1,12 +1,16 @@
 import io
+import pickle
 import sys
 import unittest
+from unittest.mock import patch
 
 sys.path.insert(0, "/".join(__file__.split("/")[:-2]))
 
+import pr_reference
 from pr_reference import (
     InvalidPrReferenceError,
     PRReference,
+    clear_parse_caches,
     parse_pr_reference,
     parse_repo_name,
 )
@@ -105,5 +109,45 @@ class TestPRReference(unittest.TestCase):
             parse_pr_reference("owner", "abc", strict=True)
 
 
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        clear_parse_caches()
+        self.addCleanup(clear_parse_caches)
+
+    def test_equal_refs_are_interned(self):
+        ref = PRReference.from_string("owner/repo#42")
+        self.assertIs(PRReference.from_parts(" owner/repo ", "42"), ref)
+        self.assertIs(parse_pr_reference("owner/repo", "42"), ref)
+        self.assertIs(pickle.loads(pickle.dumps(ref)), ref)
+
+    def test_hashable_dict_key(self):
+        refs = {PRReference.from_string("owner/repo#1"): "parsed"}
+        self.assertEqual(refs[PRReference("owner", "repo", 1)], "parsed")
+        self.assertNotEqual(PRReference("owner", "repo", 2), PRReference("o", "r", 2))
+        self.assertFalse(hasattr(PRReference("owner", "repo", 1), "__dict__"))
+
+    def test_repeated_parse_is_validated_once(self):
+        with patch.object(
+            pr_reference, "_validate_component", wraps=pr_reference._validate_component
+        ) as validate:
+            for _ in range(5):
+                PRReference.from_string("owner/repo#7")
+                parse_repo_name("owner/repo")
+        self.assertEqual(validate.call_count, 3)
+
+    def test_invalid_input_is_never_cached(self):
+        for _ in range(2):
+            with self.assertRaises(InvalidPrReferenceError):
+                PRReference.from_string("owner/repo#0")
+            with self.assertRaises(InvalidPrReferenceError):
+                parse_repo_name("bad-name", strict=True)
+
+    def test_caches_are_bounded(self):
+        for number in range(1, pr_reference.PARSE_CACHE_SIZE + 50):
+            PRReference.from_parts("owner/repo", str(number))
+        info = pr_reference._intern.cache_info()
+        self.assertEqual(info.currsize, pr_reference.PARSE_CACHE_SIZE)
+
+
 if __name__ == "__main__":
     unittest.main()
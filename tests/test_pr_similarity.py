@@ -0,0 +1,88 @@
+import sys
+import unittest
+
+sys.path.insert(0, "/".join(__file__.split("/")[:-2]))
+
+from pr_similarity import (
+    MinHasher,
+    jaccard,
+    lsh_params,
+    near_duplicate_clusters,
+    pr_shingles,
+)
+
+DIFF = """diff --git a/src/app.py b/src/app.py
+--- a/src/app.py
++++ b/src/app.py
+@@ -1,3 +1,3 @@
+ import os
+-value = compute(1)
++value = compute(2)
+"""
+
+
+def _bot_pr(variant, files=40):
+    """A dependency-bump style PR: many shared edits plus one unique line."""
+    lines = [f"+pkg{i} = 1.{i}" for i in range(files)] + [f"+variant = {variant}"]
+    diff = "--- a/requirements.txt\n" + "\n".join(lines)
+    return pr_shingles(["requirements.txt"], diff)
+
+
+class TestShingles(unittest.TestCase):
+    def test_paths_and_changed_lines(self):
+        shingles = pr_shingles(["src/app.py"], DIFF)
+        self.assertIn("path:src/app.py", shingles)
+        self.assertIn("-src/app.py\0value = compute(1)", shingles)
+        self.assertIn("+src/app.py\0value = compute(2)", shingles)
+        # Context lines and headers are not shingles.
+        self.assertEqual(len(shingles), 3)
+
+    def test_whitespace_is_normalised(self):
+        a = pr_shingles([], "--- a/x\n+  foo(  1 )\n")
+        b = pr_shingles([], "--- a/x\n+foo( 1 )\n")
+        self.assertEqual(a, b)
+
+    def test_deleted_file_keeps_old_path(self):
+        diff = "--- a/gone.py\n+++ /dev/null\n-print(1)\n"
+        self.assertIn("-gone.py\0print(1)", pr_shingles([], diff))
+
+
+class TestMinHashLSH(unittest.TestCase):
+    def test_signature_estimates_jaccard(self):
+        a = {f"t{i}" for i in range(200)}
+        b = {f"t{i}" for i in range(50, 250)}
+        hasher = MinHasher(256)
+        sa, sb = hasher.signature(a), hasher.signature(b)
+        estimate = sum(x == y for x, y in zip(sa, sb)) / 256
+        self.assertAlmostEqual(estimate, jaccard(a, b), delta=0.1)
+
+    def test_lsh_params_cover_all_permutations(self):
+        for threshold in (0.5, 0.8, 0.95):
+            bands, rows = lsh_params(128, threshold)
+            self.assertEqual(bands * rows, 128)
+        # Stricter thresholds need longer bands.
+        self.assertLess(lsh_params(128, 0.5)[1], lsh_params(128, 0.95)[1])
+
+    def test_clusters_near_duplicates_only(self):
+        items = {
+            1: _bot_pr("a"),
+            2: _bot_pr("b"),
+            3: _bot_pr("c"),
+            4: pr_shingles(["src/app.py"], DIFF),
+            5: pr_shingles(["README.md"]),
+        }
+        self.assertEqual(near_duplicate_clusters(items, 0.8), [[1, 2, 3]])
+
+    def test_threshold_is_respected(self):
+        items = {1: _bot_pr("a", files=3), 2: _bot_pr("b", files=3)}
+        # Path plus 3 shared lines out of 6 distinct shingles: Jaccard 2/3.
+        self.assertEqual(near_duplicate_clusters(items, 0.5), [[1, 2]])
+        self.assertEqual(near_duplicate_clusters(items, 0.8), [])
+
+    def test_invalid_threshold(self):
+        with self.assertRaises(ValueError):
+            near_duplicate_clusters({}, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
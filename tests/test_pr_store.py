@@ -0,0 +1,218 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, "/".join(__file__.split("/")[:-2]))
+
+from pr_reference import PRReference
+from pr_store import FIELD_GROUPS, MAX_PAGES, PRStore, ensure_fields, fetch_updated_prs
+
+REPO = "owner/repo"
+
+
+def _pr(number, updated, state="OPEN"):
+    return {"number": number, "state": state, "updatedAt": updated}
+
+
+class FakeGraphQL:
+    """Serve pullRequests pages (newest first) in fixed-size chunks."""
+
+    def __init__(self, prs, page_size=2):
+        self.prs = sorted(prs, key=lambda p: p["updatedAt"], reverse=True)
+        self.page_size = page_size
+        self.calls = []
+
+    def __call__(self, cmd):
+        self.calls.append(cmd)
+        after = next((a[6:] for a in cmd if a.startswith("after=")), "0")
+        start = int(after)
+        end = start + self.page_size
+        return {
+            "data": {
+                "repository": {
+                    "pullRequests": {
+                        "nodes": [dict(p) for p in self.prs[start:end]],
+                        "pageInfo": {
+                            "hasNextPage": end < len(self.prs),
+                            "endCursor": str(end),
+                        },
+                    }
+                }
+            }
+        }
+
+
+class TestFetchUpdatedPrs(unittest.TestCase):
+    def test_first_sync_paginates_every_open_pr(self):
+        prs = [_pr(n, f"2026-01-{n:02d}") for n in range(1, 8)]
+        gh = FakeGraphQL(prs)
+        fetched = fetch_updated_prs(gh, REPO, None)
+        self.assertEqual(sorted(p["number"] for p in fetched), list(range(1, 8)))
+        self.assertEqual(len(gh.calls), 4)
+        self.assertIn("owner=owner", gh.calls[0])
+        self.assertIn("states: [OPEN]", gh.calls[0][4])
+
+    def test_incremental_sync_stops_at_watermark(self):
+        prs = [_pr(n, f"2026-01-{n:02d}") for n in range(1, 8)]
+        gh = FakeGraphQL(prs)
+        fetched = fetch_updated_prs(gh, REPO, "2026-01-05")
+        self.assertEqual([p["number"] for p in fetched], [7, 6, 5])
+        self.assertEqual(len(gh.calls), 2)
+
+    def test_failed_page_returns_none(self):
+        self.assertIsNone(fetch_updated_prs(lambda cmd: None, REPO, None))
+
+    def test_invalid_repo_is_rejected(self):
+        self.assertIsNone(fetch_updated_prs(FakeGraphQL([]), "not a repo", None))
+
+    def test_runaway_pagination_is_not_merged(self):
+        prs = [
+            _pr(n, f"2026-01-01T{n // 3600:02d}:{n // 60 % 60:02d}:{n % 60:02d}")
+            for n in range(MAX_PAGES * 2 + 1)
+        ]
+        self.assertIsNone(fetch_updated_prs(FakeGraphQL(prs), REPO, None))
+
+
+class TestPRStore(unittest.TestCase):
+    def test_merge_and_watermark(self):
+        store = PRStore()
+        self.assertIsNone(store.watermark(REPO))
+        store.merge(REPO, [_pr(1, "2026-01-01"), _pr(2, "2026-01-03")])
+        self.assertEqual(store.watermark(REPO), "2026-01-03")
+        store.merge(REPO, [_pr(2, "2026-01-04", "CLOSED")])
+        self.assertEqual([p["number"] for p in store.open_prs()], [1])
+        self.assertEqual(store.watermark(REPO), "2026-01-04")
+
+    def test_older_update_does_not_overwrite(self):
+        store = PRStore()
+        store.merge(REPO, [_pr(1, "2026-01-05", "CLOSED")])
+        store.merge(REPO, [_pr(1, "2026-01-01", "OPEN")])
+        self.assertEqual(store.open_prs(), [])
+        self.assertEqual(store.watermark(REPO), "2026-01-05")
+
+    def test_open_prs_filters_repos_and_reset(self):
+        store = PRStore()
+        store.merge(REPO, [_pr(1, "2026-01-01")])
+        store.merge("other/repo", [_pr(9, "2026-01-01")])
+        self.assertEqual([p["repo"] for p in store.open_prs([REPO])], [REPO])
+        store.reset(REPO)
+        self.assertIsNone(store.watermark(REPO))
+        self.assertEqual([p["number"] for p in store.open_prs()], [9])
+
+    def test_persists_across_connections(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "nested", "prs.sqlite3")
+            with PRStore(path) as store:
+                store.merge(REPO, [_pr(1, "2026-01-01")])
+            with PRStore(path) as store:
+                self.assertEqual(store.watermark(REPO), "2026-01-01")
+                self.assertEqual(len(store.open_prs()), 1)
+
+
+class TestFieldGroups(unittest.TestCase):
+    def setUp(self):
+        self.store = PRStore()
+        self.ref = PRReference.from_parts(REPO, "1")
+
+    def _graphql(self, node):
+        calls = []
+
+        def run(cmd):
+            calls.append(cmd)
+            return {"data": {"pr0": {"pullRequest": dict(node)}}}
+
+        return run, calls
+
+    def test_review_groups_store_distinct_keys(self):
+        # Both groups may be ensured in one query and cached for one PR.
+        reviews = set(FIELD_GROUPS["reviews"].keys)
+        context = set(FIELD_GROUPS["review_context"].keys)
+        self.assertEqual(reviews & context, {"reviewDecision"})
+
+    def test_sync_listing_fills_summary_and_merge_groups(self):
+        pr = {
+            **_pr(1, "2026-01-01"),
+            "title": "t",
+            "author": {"login": "a"},
+            "headRefName": "b",
+            "createdAt": "2026-01-01",
+            "mergeStateStatus": "CLEAN",
+        }
+        self.store.merge(REPO, [pr])
+        run, calls = self._graphql({})
+        infos = ensure_fields(self.store, [self.ref], ("summary", "merge"), run)
+        self.assertEqual(calls, [])
+        self.assertEqual(infos[self.ref]["title"], "t")
+        self.assertEqual(infos[self.ref]["mergeStateStatus"], "CLEAN")
+
+    def test_fetches_only_stale_groups_and_flattens_connections(self):
+        self.store.put_fields(REPO, 1, "merge", {"mergeStateStatus": "DIRTY"})
+        node = {
+            "updatedAt": "2026-01-02",
+            "files": {
+                "nodes": [{"path": "a.py"}],
+                "pageInfo": {"hasNextPage": False},
+            },
+        }
+        run, calls = self._graphql(node)
+        infos = ensure_fields(self.store, [self.ref], ("merge", "files"), run)
+        self.assertEqual(len(calls), 1)
+        query = next(a for a in calls[0] if a.startswith("query="))
+        self.assertIn("files(", query)
+        self.assertNotIn("mergeStateStatus", query)
+        self.assertEqual(infos[self.ref]["files"], [{"path": "a.py"}])
+        self.assertEqual(infos[self.ref]["mergeStateStatus"], "DIRTY")
+        self.assertEqual(infos[self.ref]["updatedAt"], "2026-01-02")
+        ensure_fields(self.store, [self.ref], ("merge", "files"), run)
+        self.assertEqual(len(calls), 1)
+
+    def test_freshness(self):
+        self.store.put_fields(REPO, 1, "merge", {"mergeStateStatus": "CLEAN"})
+        self.store.put_fields(REPO, 1, "files", {"files": []}, "2026-01-01")
+        self.assertIsNotNone(self.store.fields(REPO, 1, "merge"))
+        with patch("pr_store.time.time", return_value=10**12):
+            self.assertIsNone(self.store.fields(REPO, 1, "merge"))
+        self.assertIsNone(self.store.fields(REPO, 1, "merge", max_age=-1))
+        # A newer sync record invalidates groups that follow PR updates only.
+        self.store.merge(REPO, [_pr(1, "2026-01-05")])
+        self.assertIsNone(self.store.fields(REPO, 1, "files"))
+        self.assertIsNotNone(self.store.fields(REPO, 1, "merge"))
+
+    def test_unresolved_pr_maps_to_none(self):
+        infos = ensure_fields(self.store, [self.ref], ("merge",), lambda cmd: None)
+        self.assertIsNone(infos[self.ref])
+
+    def test_labels_replace_per_stage(self):
+        self.store.set_labels("triage", {f"{REPO}#1": "READY", f"{REPO}#2": "STALE"})
+        self.store.set_labels("duplicate", {f"{REPO}#1": "DUPLICATE"})
+        self.store.set_labels("triage", {f"{REPO}#3": "READY", f"{REPO}#4": "READY"})
+        self.assertEqual(
+            self.store.labelled("triage", "READY"), [f"{REPO}#4", f"{REPO}#3"]
+        )
+        self.assertEqual(self.store.labels("duplicate"), {f"{REPO}#1": "DUPLICATE"})
+
+    def test_labels_older_than_max_age_are_ignored(self):
+        self.store.set_labels("triage", {f"{REPO}#1": "READY", f"{REPO}#2": "READY"})
+        with self.store._conn:
+            self.store._conn.execute(
+                "UPDATE labels SET decided_at = '2020-01-01T00:00:00+00:00' "
+                "WHERE number = 1"
+            )
+        self.assertEqual(
+            self.store.labelled("triage", "READY", max_age=3600), [f"{REPO}#2"]
+        )
+        self.assertEqual(
+            self.store.labels("triage", max_age=3600), {f"{REPO}#2": "READY"}
+        )
+        self.assertEqual(len(self.store.labels("triage")), 2)
+
+    def test_record_does_not_move_watermark(self):
+        self.store.record(REPO, [_pr(1, "2026-01-01")])
+        self.assertIsNone(self.store.watermark(REPO))
+        self.assertEqual(len(self.store.open_prs()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,17 +5,22 @@ from unittest.mock import MagicMock, patch
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
+from pr_diffs import Diff
+import run_merges
+from pr_reference import PRReference
+from pr_store import PRStore
 from run_merges import (
     _fetch_all_pr_data_parallel,
     get_diff,
     run_gh,
+    select_queue,
 )
 
 
 class TestRunMerges(unittest.TestCase):
     def test_run_gh_success_json(self):
         with (
-            patch("run_merges.load_gh_token_env", return_value={}) as _mock_env,
+            patch("gh_cache.load_gh_token_env", return_value={}) as _mock_env,
             patch("subprocess.run") as mock_run,
         ):
             mock_result = MagicMock()
@@ -31,36 +36,33 @@ class TestRunMerges(unittest.TestCase):
             self.assertFalse(kwargs.get("shell", False))
             self.assertIsNotNone(kwargs.get("timeout"))
 
-    def test_run_gh_success_string(self):
+    def test_run_gh_failure(self):
         with (
-            patch("run_merges.load_gh_token_env", return_value={}) as _mock_env,
+            patch("gh_cache.load_gh_token_env", return_value={}) as _mock_env,
             patch("subprocess.run") as mock_run,
         ):
             mock_result = MagicMock()
-            mock_result.returncode = 0
-            mock_result.stdout = "plain text output"
+            mock_result.returncode = 1
             mock_run.return_value = mock_result
 
             result = run_gh(["gh", "test"])
-            self.assertEqual(result, "plain text output")
+            self.assertIsNone(result)
 
-    def test_run_gh_failure(self):
+    def test_run_gh_keeps_partial_graphql_results(self):
+        body = '{"data": {"pr0": null}, "errors": [{"type": "NOT_FOUND"}]}'
         with (
-            patch("run_merges.load_gh_token_env", return_value={}) as _mock_env,
+            patch("gh_cache.load_gh_token_env", return_value={}),
             patch("subprocess.run") as mock_run,
         ):
-            mock_result = MagicMock()
-            mock_result.returncode = 1
-            mock_run.return_value = mock_result
-
-            result = run_gh(["gh", "test"])
-            self.assertIsNone(result)
+            mock_run.return_value = MagicMock(returncode=1, stdout=body)
+            result = run_gh(["gh", "api", "graphql", "-f", "query=query { x }"])
+        self.assertEqual(result["data"], {"pr0": None})
 
     def test_run_gh_timeout(self):
         import subprocess
 
         with (
-            patch("run_merges.load_gh_token_env", return_value={}),
+            patch("gh_cache.load_gh_token_env", return_value={}),
             patch(
                 "subprocess.run",
                 side_effect=subprocess.TimeoutExpired(cmd=["gh", "test"], timeout=120),
@@ -71,26 +73,27 @@ class TestRunMerges(unittest.TestCase):
 
     def test_run_gh_oserror(self):
         with (
-            patch("run_merges.load_gh_token_env", return_value={}),
+            patch("gh_cache.load_gh_token_env", return_value={}),
             patch("subprocess.run", side_effect=OSError("Command not found")),
         ):
             result = run_gh(["gh", "test"])
             self.assertIsNone(result)
 
-    @patch("run_merges.run_gh")
-    def test_get_diff_success(self, mock_run_gh):
-        mock_run_gh.return_value = "diff output"
-        res = get_diff("owner/repo", "123")
-        self.assertEqual(res, "diff output")
-        mock_run_gh.assert_called_once_with(
-            ["gh", "pr", "diff", "123", "-R", "owner/repo"]
-        )
-
-    @patch("run_merges.run_gh")
-    def test_get_diff_not_string(self, mock_run_gh):
-        mock_run_gh.return_value = {"some": "json"}
-        res = get_diff("owner/repo", "123")
-        self.assertEqual(res, "")
+    @patch("run_merges.fetch_diff")
+    def test_get_diff_success(self, mock_fetch_diff):
+        mock_fetch_diff.return_value = Diff("diff output")
+        with patch("run_merges.load_gh_token_env", return_value={}):
+            res = get_diff("owner/repo", "123", "abc")
+        self.assertEqual(res, Diff("diff output"))
+        args, kwargs = mock_fetch_diff.call_args
+        self.assertEqual(args, (PRReference.from_parts("owner/repo", "123"), "abc"))
+        self.assertGreater(kwargs["max_bytes"], 0)
+
+    @patch("run_merges.fetch_diff", return_value=None)
+    def test_get_diff_failure(self, _mock_fetch_diff):
+        with patch("run_merges.load_gh_token_env", return_value={}):
+            res = get_diff("owner/repo", "123")
+        self.assertIsNone(res)
 
     @patch("run_merges.get_diff")
     @patch("run_merges.run_gh")
@@ -101,7 +104,7 @@ class TestRunMerges(unittest.TestCase):
                 "pr1": {"pullRequest": {"mergeStateStatus": "DIRTY"}},
             }
         }
-        mock_get_diff.side_effect = lambda repo, pr: "diff " + pr
+        mock_get_diff.side_effect = lambda repo, pr, sha: Diff("diff " + pr)
 
         items = [("owner/repo1", "1", "title1"), ("owner/repo2", "2", "title2")]
         result = _fetch_all_pr_data_parallel(items)
@@ -112,11 +115,11 @@ class TestRunMerges(unittest.TestCase):
         self.assertEqual(result[0][0], "owner/repo1")
         self.assertEqual(result[0][1], "1")
         self.assertEqual(result[0][3], {"mergeStateStatus": "CLEAN"})
-        self.assertEqual(result[0][4], "diff 1")
+        self.assertEqual(result[0][4], Diff("diff 1"))
 
         # PR 2 (DIRTY)
         self.assertEqual(result[1][3], {"mergeStateStatus": "DIRTY"})
-        self.assertEqual(result[1][4], "")
+        self.assertEqual(result[1][4], Diff(""))
 
         # Verify GraphQL call
         self.assertEqual(mock_run_gh.call_count, 1)
@@ -126,6 +129,22 @@ class TestRunMerges(unittest.TestCase):
         # Verify diff fetch call count
         self.assertEqual(mock_get_diff.call_count, 1)
 
+    @patch("run_merges.get_diff")
+    @patch("run_merges.run_gh")
+    def test_fetch_all_pr_data_parallel_without_diffs(
+        self, mock_run_gh, mock_get_diff
+    ):
+        mock_run_gh.return_value = {
+            "data": {"pr0": {"pullRequest": {"mergeStateStatus": "CLEAN"}}}
+        }
+
+        items = [("owner/repo1", "1", "title1")]
+        result = _fetch_all_pr_data_parallel(items, fetch_diffs=False)
+
+        self.assertEqual(result[0][3], {"mergeStateStatus": "CLEAN"})
+        self.assertEqual(result[0][4], Diff(""))
+        mock_get_diff.assert_not_called()
+
     @patch("run_merges.run_gh")
     def test_fetch_all_pr_data_parallel_graphql_failure(self, mock_run_gh):
         mock_run_gh.return_value = None
@@ -135,12 +154,40 @@ class TestRunMerges(unittest.TestCase):
 
         self.assertEqual(len(result), 1)
         self.assertIsNone(result[0][3])
-        self.assertEqual(result[0][4], "")
+        self.assertEqual(result[0][4], Diff(""))
 
     def test_fetch_all_pr_data_parallel_invalid_reference(self):
         with self.assertRaises(ValueError):
             _fetch_all_pr_data_parallel([("myrepo", "1", "title")])
 
 
+class TestSelectQueue(unittest.TestCase):
+    def setUp(self):
+        self.store = PRStore()
+        self.store.set_labels(
+            "category", {"owner/repo#1": "SECURITY", "owner/repo#2": "DEPENDENCY"}
+        )
+        with self.store._conn:
+            self.store._conn.execute(
+                "UPDATE labels SET decided_at = '2020-01-01T00:00:00+00:00' "
+                "WHERE number = 2"
+            )
+        patcher = patch(
+            "run_merges.ensure_fields",
+            side_effect=lambda store, refs, groups, run: {
+                ref: {"title": f"PR {ref.number}"} for ref in refs
+            },
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_curated_queue_without_flag(self):
+        self.assertIs(select_queue(self.store, []), run_merges.queue)
+
+    def test_flag_uses_only_recent_store_labels(self):
+        queue = select_queue(self.store, [run_merges.FROM_STORE_FLAG])
+        self.assertEqual(queue, [("owner/repo", "1", "PR 1")])
+
+
 if __name__ == "__main__":
     unittest.main()
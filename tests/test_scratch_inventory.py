@@ -5,10 +5,10 @@ import unittest
 # Ensure the project root is in the path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import json
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
-from scratch_inventory import _fetch_repo_prs, generate_markdown, get_category
+from pr_store import PRStore
+from scratch_inventory import generate_markdown, get_category, sync_inventory
 
 
 class TestScratchInventory(unittest.TestCase):
@@ -73,53 +73,61 @@ class TestScratchInventory(unittest.TestCase):
         self.assertIn("'=branch", md)
         self.assertIn("'=HYPERLINK", md)
 
-    @patch("scratch_inventory.subprocess.run")
-    def test_fetch_repo_prs_success(self, mock_run):
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = json.dumps(
-            [
-                {
-                    "number": 1,
-                    "title": "Test PR",
-                    "author": {"login": "testuser"},
-                    "headRefName": "main",
-                    "mergeStateStatus": "CLEAN",
-                    "state": "OPEN",
-                    "createdAt": "2023-01-01T00:00:00Z",
+    @patch("scratch_inventory.run_gh")
+    def test_sync_inventory_merges_updates_into_store(self, mock_run_gh):
+        def page(*nodes):
+            return {
+                "data": {
+                    "repository": {
+                        "pullRequests": {
+                            "nodes": list(nodes),
+                            "pageInfo": {"hasNextPage": False, "endCursor": None},
+                        }
+                    }
                 }
-            ]
-        )
-        mock_run.return_value = mock_result
-
-        repo = "abhimehro/test-repo"
-        prs = _fetch_repo_prs(repo)
+            }
 
-        self.assertEqual(len(prs), 1)
-        self.assertEqual(prs[0]["repo"], "test-repo")
-        self.assertEqual(prs[0]["number"], 1)
-
-        # Verify subprocess.run was called correctly
-        mock_run.assert_called_once()
-        args, kwargs = mock_run.call_args
-        self.assertIn("gh", args[0])
-        self.assertIn(repo, args[0])
-        self.assertEqual(kwargs.get("capture_output"), True)
-        self.assertEqual(kwargs.get("text"), True)
-
-    @patch("scratch_inventory.subprocess.run")
-    def test_fetch_repo_prs_failure(self, mock_run):
-        mock_result = MagicMock()
-        mock_result.returncode = 1
-        mock_result.stdout = "Error"
-        mock_result.stderr = "Command failed"
-        mock_run.return_value = mock_result
+        def pr(number, updated, state="OPEN"):
+            return {
+                "number": number,
+                "title": f"PR {number}",
+                "author": {"login": "testuser"},
+                "headRefName": "main",
+                "mergeStateStatus": "CLEAN",
+                "state": state,
+                "createdAt": "2023-01-01T00:00:00Z",
+                "updatedAt": updated,
+            }
 
         repo = "abhimehro/test-repo"
-        prs = _fetch_repo_prs(repo)
+        store = PRStore()
+        mock_run_gh.return_value = page(
+            pr(2, "2026-01-02T00:00:00Z"), pr(1, "2026-01-01T00:00:00Z")
+        )
+        prs = sync_inventory([repo], store)
+        self.assertEqual([p["number"] for p in prs], [1, 2])
+        self.assertEqual(prs[0]["repo"], "test-repo")
+        self.assertIn("states: [OPEN]", mock_run_gh.call_args[0][0][4])
 
-        self.assertEqual(prs, [])
-        mock_run.assert_called_once()
+        # Next run: PR 2 was merged, PR 3 opened; PR 1 is untouched.
+        mock_run_gh.return_value = page(
+            pr(3, "2026-01-04T00:00:00Z"), pr(2, "2026-01-03T00:00:00Z", "MERGED")
+        )
+        prs = sync_inventory([repo], store)
+        self.assertEqual([p["number"] for p in prs], [1, 3])
+        self.assertNotIn("states: [OPEN]", mock_run_gh.call_args[0][0][4])
+        self.assertEqual(store.watermark(repo), "2026-01-04T00:00:00Z")
+
+    @patch("scratch_inventory.run_gh", return_value=None)
+    def test_sync_inventory_failure_keeps_stored_prs(self, _mock_run_gh):
+        store = PRStore()
+        store.merge(
+            "abhimehro/test-repo",
+            [{"number": 1, "state": "OPEN", "updatedAt": "2026-01-01T00:00:00Z"}],
+        )
+        prs = sync_inventory(["abhimehro/test-repo"], store)
+        self.assertEqual([p["number"] for p in prs], [1])
+        self.assertEqual(store.watermark("abhimehro/test-repo"), "2026-01-01T00:00:00Z")
 
 
 if __name__ == "__main__":
@@ -9,6 +9,7 @@ from unittest.mock import patch
 sys.path.insert(0, str(__import__("pathlib").Path(__file__).resolve().parents[1]))
 
 import scratch_triage  # noqa: E402
+from pr_store import PRStore  # noqa: E402
 
 
 class TestProcessPrGroup(unittest.TestCase):
@@ -188,3 +189,22 @@ class TestGroupPRs(unittest.TestCase):
         self.assertEqual(all_prs[3].get("status_action"), "CLOSE")
 
         self.assertEqual(len(triage_md), 2)
+
+
+class TestLoadOpenPrs(unittest.TestCase):
+    @patch("gh_cache.run_json")
+    @patch("scratch_triage.repos", ["o/r"])
+    def test_merge_state_is_requeried_uncached(self, mock_run_json):
+        store = PRStore()
+        pr = {"number": 1, "title": "Fix", "updatedAt": "2026-01-01T00:00:00Z"}
+        # A synced listing records its merge state as just fetched.
+        store.merge("o/r", [{**pr, "mergeStateStatus": "BLOCKED"}])
+        mock_run_json.return_value = {
+            "data": {"pr0": {"pullRequest": {**pr, "mergeStateStatus": "CLEAN"}}}
+        }
+        with patch(
+            "scratch_triage.sync_repos", side_effect=lambda s, r, run: s.open_prs(r)
+        ):
+            all_prs = scratch_triage.load_open_prs(store)
+        self.assertEqual(all_prs[0]["mergeStateStatus"], "CLEAN")
+        self.assertEqual(mock_run_json.call_args.kwargs, {"fresh": True})
@@ -142,7 +142,8 @@ class TestEnvLoaderShellSafety(unittest.TestCase):
     @patch("subprocess.run")
     @patch("subprocess.Popen")
     def test_env_loader_does_not_shell_out(self, mock_popen, mock_run):
-        mod = _load_function_only("categorize_ready.py", {"load_gh_token_env"})
+        # The PR scripts reach it through ``gh_cache.run_json``.
+        mod = _load_function_only("gh_cache.py", {"load_gh_token_env"})
         mod.load_gh_token_env()
         self.assertFalse(
             mock_run.called,